@@ -0,0 +1,65 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class Detector:
+    """
+    One authenticity signal (AASIST, HFI or TNS).
+
+    Subclasses set `name`, list the sai_audio.features kinds they read in
+    `feature_kinds`, and implement score(). Features are computed once per
+    clip and shared by every detector, so a detector must not modify them.
+
+    Weights arrive through load_weights() as read-only memory-mapped
+    arrays (see app.adapters.weights); keep references, never copies.
+    """
+
+    name: str = ""
+    feature_kinds: Tuple[str, ...] = ()
+    weights: Dict[str, np.ndarray] = {}
+
+    def load_weights(self, weights: Dict[str, np.ndarray]) -> None:
+        self.weights = weights
+
+    def score(self, waveform: np.ndarray, features: Dict[str, np.ndarray]) -> float:
+        """
+        Confidence in [0, 1] that the 16 kHz clip is human speech.
+        """
+        raise NotImplementedError
+
+    def score_batch(
+        self,
+        waveforms: np.ndarray,
+        lengths: np.ndarray,
+        features: Dict[str, np.ndarray],
+        frame_counts: np.ndarray
+    ) -> np.ndarray:
+        """
+        Confidences for a zero-padded (batch, samples) batch from
+        sai_audio.batching.pad_batch, with (batch, frames, n) features.
+        Row i holds lengths[i] valid samples and frame_counts[i] valid
+        frames. The default scores row by row; override it to vectorize.
+        """
+        return np.array([
+            self.score(
+                waveforms[row, :lengths[row]],
+                {kind: values[row, :frame_counts[row]] for kind, values in features.items()}
+            )
+            for row in range(len(waveforms))
+        ], dtype=np.float64)
+
+    def warmup(self) -> None:
+        """
+        Called once per worker process before it takes requests: load
+        weights, build caches, run a dummy inference.
+        """
+        from sai_audio.features import compute_features
+        from sai_audio.normalize import TARGET_SAMPLE_RATE
+
+        t = np.arange(TARGET_SAMPLE_RATE, dtype=np.float32) / TARGET_SAMPLE_RATE
+        tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        self.score(tone, compute_features(tone, kinds=self.feature_kinds))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r})"
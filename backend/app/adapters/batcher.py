@@ -0,0 +1,163 @@
+"""
+Dynamic micro-batching of detector inference.
+
+Concurrent requests each hand their preprocessed waveform to the
+DetectorBatcher. The batcher collects waveforms until `max_batch_size`
+are waiting or the oldest has waited `max_wait_ms`, then runs them as one
+padded batch (run_detectors_batch) in the analysis executor and resolves
+every request with its own DetectorRun.
+
+At most one batch per executor worker is in flight. While all workers are
+busy, new requests keep queueing, so batches grow with load and the extra
+latency stays bounded by max_wait_ms plus one batch.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.adapters.registry import DetectorRun, run_detectors_batch
+from app.config import get_analysis_batch_max_size, get_analysis_batch_max_wait_ms
+from app.utils.executor import AnalysisExecutor
+from app.utils.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class _Pending(NamedTuple):
+    waveform: np.ndarray
+    future: "asyncio.Future[DetectorRun]"
+    queued_at: float
+
+
+class DetectorBatcher:
+    """
+    Coalesces single-clip detector runs into batches. Must be started and
+    used from one event loop.
+    """
+
+    def __init__(self, executor: AnalysisExecutor, max_batch_size: int, max_wait_ms: float):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+
+        self._queue: "asyncio.Queue[_Pending]" = asyncio.Queue()
+        self._slots = asyncio.Semaphore(executor.workers)
+        self._collector: Optional[asyncio.Task] = None
+        self._batches: "set[asyncio.Task]" = set()
+
+    def start(self) -> None:
+        self._collector = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self) -> None:
+        """
+        Stop collecting, let in-flight batches finish and fail requests
+        still waiting in the queue.
+        """
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+            self._collector = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Detector batcher stopped"))
+
+    async def run(self, waveform: np.ndarray) -> DetectorRun:
+        """
+        Detector results for one 16 kHz clip, computed in the next batch.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(waveform, future, time.perf_counter()))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_sec * 1000.0,
+            "queued": self._queue.qsize(),
+            "batches_in_flight": len(self._batches),
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+    async def _collect(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._next_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _next_batch(self) -> List[_Pending]:
+        batch: List[_Pending] = []
+        while not batch:
+            item = await self._queue.get()
+            if not item.future.done():
+                batch.append(item)
+
+        deadline = batch[0].queued_at + self.max_wait_sec
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            elif not self._queue.empty():
+                # Waited long enough (e.g. for a free worker): take what is queued
+                item = self._queue.get_nowait()
+            else:
+                break
+
+            # Skip requests cancelled while queued (client went away)
+            if not item.future.done():
+                batch.append(item)
+
+        return batch
+
+    async def _dispatch(self, batch: List[_Pending]) -> None:
+        try:
+            dispatched_at = time.perf_counter()
+            self.batch_size.observe(len(batch))
+            for item in batch:
+                self.queue_wait_ms.observe((dispatched_at - item.queued_at) * 1000.0)
+
+            try:
+                runs = await self.executor.run_admitted(
+                    run_detectors_batch, [item.waveform for item in batch]
+                )
+            except Exception as exc:
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                return
+
+            for item, run in zip(batch, runs):
+                if not item.future.done():
+                    item.future.set_result(run)
+        finally:
+            self._slots.release()
+
+
+def create_detector_batcher(executor: AnalysisExecutor) -> Optional[DetectorBatcher]:
+    """
+    Build the batcher from ANALYSIS_BATCH_MAX_SIZE / ANALYSIS_BATCH_MAX_WAIT_MS,
+    or None when batching is disabled (max size 1).
+    """
+    max_batch_size = get_analysis_batch_max_size()
+    if max_batch_size <= 1:
+        return None
+    return DetectorBatcher(executor, max_batch_size, get_analysis_batch_max_wait_ms())
@@ -0,0 +1,31 @@
+from typing import Dict
+
+import numpy as np
+
+from app.adapters.base import Detector
+
+# (Temporary mock values) until the detector models are connected
+MOCK_SIGNAL_CONFIDENCES = {
+    "aasist": 0.90,
+    "hfi": 0.87,
+    "tns": 0.85
+}
+
+
+class ConstantDetector(Detector):
+    """
+    Returns a fixed confidence; the behaviour before real detectors.
+    """
+
+    def __init__(self, name: str, confidence: float):
+        self.name = name
+        self.confidence = confidence
+
+    def score(self, waveform: np.ndarray, features: Dict[str, np.ndarray]) -> float:
+        return self.confidence
+
+    def score_batch(self, waveforms, lengths, features, frame_counts) -> np.ndarray:
+        return np.full(len(waveforms), self.confidence)
+
+    def warmup(self) -> None:
+        return None
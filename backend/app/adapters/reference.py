@@ -0,0 +1,111 @@
+"""
+NumPy reference detectors.
+
+These are not trained models. Each reduces one shared feature to a
+bounded statistic, so tests and benchmarks exercise the full path
+(features, concurrency, timeouts, fusion) with realistic per-signal cost
+and input-dependent output, before the real models are connected.
+
+score_batch() computes the same statistics over a padded batch, masking
+each row to its valid frames.
+"""
+from typing import Dict
+
+import numpy as np
+
+from app.adapters.base import Detector
+
+
+def _logistic(x, center: float, scale: float):
+    return np.round(1.0 / (1.0 + np.exp(-(np.asarray(x) - center) / scale)), 3)
+
+
+def _delta_mask(frame_counts: np.ndarray, n_frames: int) -> np.ndarray:
+    # (batch, n_frames - 1, 1): True where both frames of a delta are valid
+    return (np.arange(max(n_frames - 1, 0)) < (frame_counts - 1)[:, None])[:, :, None]
+
+
+class AasistReference(Detector):
+    """
+    Spectro-temporal variability: natural speech varies more from frame
+    to frame across mel bands than vocoded speech. An optional
+    "mel_band_weights" tensor (n_mels,) weights the bands.
+    """
+
+    name = "aasist"
+    feature_kinds = ("log_mel",)
+
+    def score(self, waveform: np.ndarray, features: Dict[str, np.ndarray]) -> float:
+        log_mel = features["log_mel"]
+        if len(log_mel) < 2:
+            return 0.5
+        flux = np.abs(np.diff(log_mel, axis=-2)).mean(axis=-2)
+        return float(_logistic(self._band_mean(flux), center=3.0, scale=1.5))
+
+    def score_batch(self, waveforms, lengths, features, frame_counts) -> np.ndarray:
+        log_mel = features["log_mel"]
+        mask = _delta_mask(frame_counts, log_mel.shape[-2])
+        deltas = np.maximum(frame_counts - 1, 1)[:, None]
+        flux = (np.abs(np.diff(log_mel, axis=-2)) * mask).sum(axis=-2) / deltas
+        confidence = _logistic(self._band_mean(flux), center=3.0, scale=1.5)
+        return np.where(frame_counts < 2, 0.5, confidence)
+
+    def _band_mean(self, flux: np.ndarray) -> np.ndarray:
+        band_weights = self.weights.get("mel_band_weights")
+        if band_weights is not None:
+            return np.average(flux, axis=-1, weights=band_weights)
+        return flux.mean(axis=-1)
+
+
+class HfiReference(Detector):
+    """
+    High-frequency information: share of power above 4 kHz, which many
+    vocoders under-produce.
+    """
+
+    name = "hfi"
+    feature_kinds = ("linear",)
+
+    def score(self, waveform: np.ndarray, features: Dict[str, np.ndarray]) -> float:
+        power = features["linear"]
+        split = power.shape[-1] // 2
+        high = power[..., split:].sum()
+        total = power.sum() + 1e-12
+        return float(_logistic(10 * np.log10(high / total + 1e-12), center=-30.0, scale=6.0))
+
+    def score_batch(self, waveforms, lengths, features, frame_counts) -> np.ndarray:
+        power = features["linear"]
+        split = power.shape[-1] // 2
+        valid = np.arange(power.shape[-2]) < frame_counts[:, None]
+        per_frame_total = power.sum(axis=-1, dtype=np.float64)
+        per_frame_high = power[..., split:].sum(axis=-1, dtype=np.float64)
+        high = (per_frame_high * valid).sum(axis=-1)
+        total = (per_frame_total * valid).sum(axis=-1) + 1e-12
+        return _logistic(10 * np.log10(high / total + 1e-12), center=-30.0, scale=6.0)
+
+
+class TnsReference(Detector):
+    """
+    Temporal noise shaping: variance of cepstral deltas over time.
+    """
+
+    name = "tns"
+    feature_kinds = ("lfcc",)
+
+    def score(self, waveform: np.ndarray, features: Dict[str, np.ndarray]) -> float:
+        lfcc = features["lfcc"]
+        if len(lfcc) < 2:
+            return 0.5
+        delta_std = np.diff(lfcc, axis=-2).std()
+        return float(_logistic(delta_std, center=2.0, scale=1.0))
+
+    def score_batch(self, waveforms, lengths, features, frame_counts) -> np.ndarray:
+        lfcc = features["lfcc"]
+        mask = _delta_mask(frame_counts, lfcc.shape[-2])
+        count = np.maximum(frame_counts - 1, 1) * lfcc.shape[-1]
+        deltas = np.diff(lfcc, axis=-2).astype(np.float64) * mask
+        mean = deltas.sum(axis=(-2, -1)) / count
+        centered = (deltas - mean[:, None, None]) * mask
+        delta_std = np.sqrt(np.square(centered).sum(axis=(-2, -1)) / count)
+        confidence = _logistic(delta_std, center=2.0, scale=1.0)
+        return np.where(frame_counts < 2, 0.5, confidence)
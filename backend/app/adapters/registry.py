@@ -0,0 +1,310 @@
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.adapters.base import Detector
+from app.adapters.mock import MOCK_SIGNAL_CONFIDENCES, ConstantDetector
+from app.adapters.reference import AasistReference, HfiReference, TnsReference
+from app.adapters.weights import get_weight_store
+from app.config import (
+    get_analysis_executor_kind,
+    get_analysis_workers,
+    get_detector_impl,
+    get_detector_timeout_sec,
+)
+
+DETECTOR_SIGNALS = ("aasist", "hfi", "tns")
+
+# implementation name -> signal -> factory
+_FACTORIES: Dict[str, Dict[str, Callable[[], Detector]]] = {
+    "mock": {
+        name: functools.partial(ConstantDetector, name, confidence)
+        for name, confidence in MOCK_SIGNAL_CONFIDENCES.items()
+    },
+    "reference": {
+        "aasist": AasistReference,
+        "hfi": HfiReference,
+        "tns": TnsReference,
+    },
+}
+
+
+class DetectorRun(NamedTuple):
+    signals: Dict[str, float]       # confidences of the detectors that finished
+    latency_ms: Dict[str, float]    # per detector, plus "features"
+    errors: Dict[str, str]          # detectors that failed or timed out
+
+
+class _ProcessDetectors:
+    """
+    Detectors and their thread pool for one process. Built lazily so that
+    forked analysis workers never inherit the parent's pool threads.
+    """
+
+    def __init__(self, detectors: Dict[str, Detector]):
+        self.pid = os.getpid()
+        self.detectors = detectors
+        self.timeouts = {name: get_detector_timeout_sec(name) for name in detectors}
+        self.feature_kinds = tuple(sorted({
+            kind for detector in detectors.values() for kind in detector.feature_kinds
+        }))
+        # A thread per detector for every analysis this process can run
+        # at once, plus one spare set for threads still stuck in a
+        # timed-out detector
+        self.pool = ThreadPoolExecutor(
+            max_workers=(_concurrent_analyses() + 1) * len(detectors),
+            thread_name_prefix="detector"
+        )
+
+
+class _DetectorJob:
+    """
+    One detector scoring one batch in the detector pool. Its deadline runs
+    from when a pool thread starts it, not from when it was queued.
+    """
+
+    def __init__(self, pool: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any):
+        self.submitted = time.perf_counter()
+        self.started = 0.0
+        self._running = threading.Event()
+        self.future = pool.submit(self._run, fn, *args)
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self.started = time.perf_counter()
+        self._running.set()
+        return fn(*args)
+
+    def result(self, timeout: float) -> Any:
+        """
+        The job's result; TimeoutError if it runs for longer than
+        `timeout`, or waits longer than that for a pool thread (it is then
+        cancelled).
+        """
+        if not self._running.wait(max(0.0, self.submitted + timeout - time.perf_counter())):
+            if self.future.cancel():
+                raise TimeoutError()
+        return self.future.result(timeout=max(0.0, self.started + timeout - time.perf_counter()))
+
+
+_state: Optional[_ProcessDetectors] = None
+
+
+def register_detector(impl: str, signal: str, factory: Callable[[], Detector]) -> None:
+    """
+    Make `factory` the `signal` detector of implementation `impl`
+    (selected with DETECTOR_IMPL).
+    """
+    if signal not in DETECTOR_SIGNALS:
+        raise ValueError(f"Unknown signal: {signal!r}")
+    _FACTORIES.setdefault(impl, {})[signal] = factory
+
+
+def create_detectors(impl: Optional[str] = None) -> Dict[str, Detector]:
+    impl = impl or get_detector_impl()
+    factories = _FACTORIES.get(impl)
+    if factories is None:
+        raise ValueError(f"Unknown detector implementation: {impl!r}")
+
+    missing = [signal for signal in DETECTOR_SIGNALS if signal not in factories]
+    if missing:
+        raise ValueError(f"Detector implementation {impl!r} lacks: {', '.join(missing)}")
+
+    store = get_weight_store()
+    detectors = {}
+    for signal in DETECTOR_SIGNALS:
+        detector = factories[signal]()
+        detector.load_weights(store.for_detector(signal))
+        detectors[signal] = detector
+    return detectors
+
+
+def get_detectors() -> Dict[str, Detector]:
+    return _process_detectors().detectors
+
+
+def warmup_detectors() -> None:
+    """
+    Build this process's detectors and warm each one up.
+    """
+    for detector in get_detectors().values():
+        detector.warmup()
+
+
+def run_detectors(waveform: np.ndarray) -> DetectorRun:
+    """
+    Compute the shared features once, then run every detector
+    concurrently. Each detector gets its own deadline, so latency is that
+    of the slowest detector, not the sum. Deadlines count from when each
+    detector starts, not from when it was queued. A detector that misses
+    its deadline is reported in `errors`; its thread cannot be interrupted
+    and finishes in the background.
+    """
+    return run_detectors_batch([waveform])[0]
+
+
+def run_detectors_batch(waveforms: Sequence[np.ndarray]) -> List[DetectorRun]:
+    """
+    run_detectors for several clips at once: the clips and their features
+    are zero-padded into one batch and each detector scores the whole
+    batch with score_batch(), with its deadline scaled by the batch size.
+    Returns one DetectorRun per clip, in order; latencies are those of the
+    whole batch. When a detector raises on a batch, it is retried clip by
+    clip so that only the clips it fails on report the error.
+    """
+    from sai_audio.batching import pad_batch
+    from sai_audio.features import compute_features, num_frames
+
+    state = _process_detectors()
+
+    started = time.perf_counter()
+    padded, lengths, _ = pad_batch(waveforms)
+    frame_counts = np.array([num_frames(int(n)) for n in lengths], dtype=np.int64)
+
+    # Features are computed clip by clip into padded (batch, frames, n)
+    # arrays: the FFT gains nothing from a batch axis and a padded frame
+    # tensor would fall out of cache, while detectors score the batch.
+    features: Dict[str, np.ndarray] = {}
+    for row, waveform in enumerate(waveforms):
+        if not state.feature_kinds:
+            break
+        for kind, values in compute_features(waveform, kinds=state.feature_kinds).items():
+            if kind not in features:
+                shape = (len(waveforms), int(frame_counts.max())) + values.shape[1:]
+                features[kind] = np.zeros(shape, dtype=values.dtype)
+            features[kind][row, :len(values)] = values
+    latency_ms = {"features": _ms_since(started)}
+
+    jobs = {
+        name: _DetectorJob(
+            state.pool, _timed_score_batch, detector, padded, lengths, features, frame_counts
+        )
+        for name, detector in state.detectors.items()
+    }
+
+    # Per clip: confidences and errors, filled in detector by detector
+    signals: List[Dict[str, float]] = [{} for _ in waveforms]
+    errors: List[Dict[str, str]] = [{} for _ in waveforms]
+    for name, job in jobs.items():
+        timeout = state.timeouts[name] * len(waveforms)
+        try:
+            scores, elapsed_ms = job.result(timeout)
+        except TimeoutError:
+            latency_ms[name] = round(timeout * 1000.0, 3)
+            _fail_all(errors, name, "timed out")
+            continue
+        except Exception as exc:
+            latency_ms[name] = _ms_since(job.started or job.submitted)
+            if len(waveforms) == 1:
+                _fail_all(errors, name, f"failed: {exc}")
+            else:
+                _score_rows(state, name, padded, lengths, features, frame_counts, signals, errors)
+            continue
+
+        latency_ms[name] = elapsed_ms
+        if scores.shape != (len(waveforms),):
+            _fail_all(errors, name, f"returned {scores.shape} scores for {len(waveforms)} clips")
+        else:
+            _record_scores(name, scores, range(len(waveforms)), signals, errors)
+
+    return [
+        DetectorRun(signals[row], dict(latency_ms), errors[row])
+        for row in range(len(waveforms))
+    ]
+
+
+def _score_rows(
+    state: _ProcessDetectors,
+    name: str,
+    padded: np.ndarray,
+    lengths: np.ndarray,
+    features: Dict[str, np.ndarray],
+    frame_counts: np.ndarray,
+    signals: List[Dict[str, float]],
+    errors: List[Dict[str, str]]
+) -> None:
+    # Each clip alone, unpadded, with the single-clip deadline
+    detector = state.detectors[name]
+    jobs = [
+        _DetectorJob(
+            state.pool,
+            _timed_score_batch,
+            detector,
+            padded[row:row + 1, :lengths[row]],
+            lengths[row:row + 1],
+            {kind: values[row:row + 1, :frame_counts[row]] for kind, values in features.items()},
+            frame_counts[row:row + 1]
+        )
+        for row in range(len(lengths))
+    ]
+    for row, job in enumerate(jobs):
+        try:
+            scores, _ = job.result(state.timeouts[name])
+        except TimeoutError:
+            errors[row][name] = "timed out"
+            continue
+        except Exception as exc:
+            errors[row][name] = f"failed: {exc}"
+            continue
+
+        if scores.shape != (1,):
+            errors[row][name] = f"returned {scores.shape} scores for 1 clip"
+        else:
+            _record_scores(name, scores, [row], signals, errors)
+
+
+def _record_scores(
+    name: str,
+    scores: np.ndarray,
+    rows: Sequence[int],
+    signals: List[Dict[str, float]],
+    errors: List[Dict[str, str]]
+) -> None:
+    for score, row in zip(scores, rows):
+        confidence = float(score)
+        if not 0.0 <= confidence <= 1.0:
+            errors[row][name] = "returned a confidence outside [0, 1]"
+        else:
+            signals[row][name] = confidence
+
+
+def _fail_all(errors: List[Dict[str, str]], name: str, error: str) -> None:
+    for row_errors in errors:
+        row_errors[name] = error
+
+
+def _timed_score_batch(
+    detector: Detector,
+    waveforms: np.ndarray,
+    lengths: np.ndarray,
+    features: Dict[str, np.ndarray],
+    frame_counts: np.ndarray
+):
+    started = time.perf_counter()
+    scores = np.asarray(
+        detector.score_batch(waveforms, lengths, features, frame_counts), dtype=np.float64
+    )
+    return scores, _ms_since(started)
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
+
+
+def _concurrent_analyses() -> int:
+    # Process workers each run one analysis at a time; a thread executor
+    # runs up to ANALYSIS_WORKERS in this one process
+    if get_analysis_executor_kind() == "thread":
+        return get_analysis_workers()
+    return 1
+
+
+def _process_detectors() -> _ProcessDetectors:
+    global _state
+    if _state is None or _state.pid != os.getpid():
+        _state = _ProcessDetectors(create_detectors())
+    return _state
@@ -0,0 +1,159 @@
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from app.config import get_model_weights_dir, get_model_weights_prefault
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 4096
+
+
+class WeightStore:
+    """
+    Read-only detector weights, memory-mapped from a directory laid out as
+    <root>/<detector name>/<tensor name>.npy.
+
+    The arrays are np.memmap views of the files, so the data lives in the
+    OS page cache: analysis workers forked after loading inherit the same
+    mappings, and separate uvicorn workers mapping the same files share
+    the same physical pages instead of each holding a private copy.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        arrays: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+        load_ms: float = 0.0
+    ):
+        self.root = root
+        self.arrays = arrays or {}
+        self.load_ms = load_ms
+
+    def for_detector(self, name: str) -> Dict[str, np.ndarray]:
+        return self.arrays.get(name, {})
+
+    @property
+    def mapped_bytes(self) -> int:
+        return sum(array.nbytes for array in self._all_arrays())
+
+    def paths(self) -> Iterable[str]:
+        for array in self._all_arrays():
+            if isinstance(array, np.memmap) and array.filename:
+                yield os.path.abspath(array.filename)
+
+    def resident_bytes(self) -> Optional[int]:
+        """
+        Bytes of the mapped weight files currently resident in this
+        process (Linux /proc/self/smaps), or None where unavailable.
+        """
+        return _resident_bytes(set(self.paths()))
+
+    def prefault(self) -> None:
+        """
+        Touch one byte per page so the weights are in the page cache before
+        workers fork, instead of faulting in during the first requests.
+        """
+        for array in self._all_arrays():
+            flat = array.reshape(-1).view(np.uint8)
+            int(flat[::PAGE_SIZE].sum())
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "root": self.root,
+            "tensors": sum(len(tensors) for tensors in self.arrays.values()),
+            "detectors": sorted(self.arrays),
+            "mapped_bytes": self.mapped_bytes,
+            "resident_bytes": self.resident_bytes(),
+            "load_ms": self.load_ms
+        }
+
+    def _all_arrays(self) -> Iterable[np.ndarray]:
+        for tensors in self.arrays.values():
+            yield from tensors.values()
+
+
+_store: Optional[WeightStore] = None
+
+
+def load_weight_store(root: Optional[str] = None, prefault: bool = False) -> WeightStore:
+    """
+    Map every <root>/<detector>/<tensor>.npy; an unset or missing root
+    yields an empty store.
+    """
+    started = time.perf_counter()
+    arrays: Dict[str, Dict[str, np.ndarray]] = {}
+
+    if root and os.path.isdir(root):
+        for detector in sorted(os.listdir(root)):
+            directory = os.path.join(root, detector)
+            if not os.path.isdir(directory):
+                continue
+            tensors = {
+                filename[:-4]: np.load(os.path.join(directory, filename), mmap_mode="r")
+                for filename in sorted(os.listdir(directory))
+                if filename.endswith(".npy")
+            }
+            if tensors:
+                arrays[detector] = tensors
+    elif root:
+        logger.warning("MODEL_WEIGHTS_DIR %s does not exist; no weights loaded", root)
+
+    store = WeightStore(root, arrays)
+    if prefault:
+        store.prefault()
+    store.load_ms = round((time.perf_counter() - started) * 1000.0, 3)
+    return store
+
+
+def save_weights(root: str, detector: str, tensors: Dict[str, np.ndarray]) -> None:
+    """
+    Write one detector's tensors in the layout load_weight_store maps.
+    Files are replaced atomically, so running workers keep their mapping
+    of the old file.
+    """
+    directory = os.path.join(root, detector)
+    os.makedirs(directory, exist_ok=True)
+    for name, array in tensors.items():
+        path = os.path.join(directory, f"{name}.npy")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+
+
+def get_weight_store() -> WeightStore:
+    """
+    The process-wide store; loaded on first use from MODEL_WEIGHTS_DIR if
+    the server did not load it at startup (e.g. spawned workers).
+    """
+    global _store
+    if _store is None:
+        _store = load_weight_store(get_model_weights_dir(), get_model_weights_prefault())
+    return _store
+
+
+def set_weight_store(store: WeightStore) -> None:
+    global _store
+    _store = store
+
+
+def _resident_bytes(paths) -> Optional[int]:
+    if not paths:
+        return 0
+    try:
+        with open("/proc/self/smaps", "r") as f:
+            total_kb = 0
+            in_weights = False
+            for line in f:
+                fields = line.split()
+                if "-" in fields[0] and ":" not in fields[0]:
+                    in_weights = len(fields) >= 6 and fields[5] in paths
+                elif in_weights and fields[0] == "Rss:":
+                    total_kb += int(fields[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return total_kb * 1024
@@ -0,0 +1,317 @@
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+# sai_audio lives at the repository root, next to backend/
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+import numpy as np  # noqa: E402
+
+from sai_audio.pipeline import process_audio_bytes, warmup  # noqa: E402
+from sai_audio.validate import WARN_DURATION_SEC  # noqa: E402
+from sai_audio.windows import LONG_AUDIO_MAX_SEC, open_audio_windows  # noqa: E402
+
+from app.adapters.batcher import DetectorBatcher  # noqa: E402
+from app.adapters.registry import (  # noqa: E402
+    DETECTOR_SIGNALS,
+    DetectorRun,
+    run_detectors,
+    warmup_detectors,
+)
+from app.config import get_detector_impl  # noqa: E402
+from app.fusion.fusion_engine import (  # noqa: E402
+    DECISION_LABELS,
+    FUSION_ENGINE_VERSION,
+    evaluate_fusion,
+    evaluate_fusion_batch,
+)
+from app.fusion.fusion_policy import FusionPolicy  # noqa: E402
+from app.utils.executor import AnalysisExecutor  # noqa: E402
+
+# Identifies everything that determines an analysis result; cache keys
+# include it so results from an older engine are never served.
+ANALYSIS_VERSION = f"fusion-{FUSION_ENGINE_VERSION}+{get_detector_impl()}-signals"
+
+
+def init_worker() -> None:
+    """
+    Executor worker initializer: prime sai_audio caches and load the
+    signal detectors in this process.
+    """
+    warmup()
+    warmup_detectors()
+
+
+def analysis_error_status(analysis: Dict[str, Any]) -> int:
+    """
+    HTTP status for an invalid analysis: 503 when detectors failed, 422
+    when the audio itself was rejected.
+    """
+    return 503 if analysis.get("detector_errors") else 422
+
+
+def analyze_audio_bytes(
+    audio_bytes: bytes,
+    policy: Optional[FusionPolicy] = None
+) -> Dict[str, Any]:
+    """
+    Preprocess, score and fuse one uploaded clip.
+
+    Runs inside the analysis executor, possibly in another process, so it
+    returns only plain, picklable data (no waveform). Callers pass the
+    fusion policy explicitly because a worker process does not see policy
+    swaps made in the server process.
+    """
+    return analyze_preprocessed(process_audio_bytes(audio_bytes), policy)
+
+
+def analyze_preprocessed(
+    preprocessed: Dict[str, Any],
+    policy: Optional[FusionPolicy] = None
+) -> Dict[str, Any]:
+    """
+    Score and fuse a sai_audio pipeline result (from a file or a live
+    AudioStream). Returns the same dict as analyze_audio_bytes.
+    """
+    if not preprocessed["is_valid"]:
+        return _preprocessing_failure(preprocessed)
+
+    return fuse_detector_run(preprocessed, run_detectors(preprocessed["waveform"]), policy)
+
+
+async def analyze_upload(
+    executor: AnalysisExecutor,
+    batcher: Optional[DetectorBatcher],
+    audio_bytes: bytes,
+    policy: Optional[FusionPolicy] = None
+) -> Dict[str, Any]:
+    """
+    analyze_audio_bytes for the request handlers. With a batcher, the clip
+    is preprocessed in the executor and its detector inference joins the
+    next micro-batch; the request holds one admission slot throughout.
+
+    "timings" gains "queue": time spent waiting for an executor worker or
+    a batch rather than working.
+    """
+    started = time.perf_counter()
+    if batcher is None:
+        analysis = await executor.run(analyze_audio_bytes, audio_bytes, policy)
+        return _with_queue_time(analysis, started)
+
+    with executor.admission():
+        preprocessed = await executor.run_admitted(process_audio_bytes, audio_bytes)
+        if not preprocessed["is_valid"]:
+            return _with_queue_time(_preprocessing_failure(preprocessed), started)
+        run = await batcher.run(preprocessed["waveform"])
+
+    return _with_queue_time(fuse_detector_run(preprocessed, run, policy), started)
+
+
+def fuse_detector_run(
+    preprocessed: Dict[str, Any],
+    run: DetectorRun,
+    policy: Optional[FusionPolicy] = None
+) -> Dict[str, Any]:
+    """
+    Fuse the detector results for a valid pipeline result into an analysis.
+
+    "timings" extends the pipeline's stage timings with "features",
+    "detectors" (the slowest detector; they run concurrently) and "fusion".
+    """
+    timings = {**preprocessed.get("timings", {}), **_detector_timings(run)}
+    if run.errors:
+        return {**_detector_failure(run), "timings": timings}
+
+    started = time.perf_counter()
+    signals = run.signals
+    fusion_result = evaluate_fusion(
+        aasist_confidence=signals["aasist"],
+        hfi_confidence=signals["hfi"],
+        tns_confidence=signals["tns"],
+        policy=policy
+    )
+    timings["fusion"] = _elapsed_ms(started)
+
+    return {
+        "is_valid": True,
+        "duration_sec": preprocessed["duration_sec"],
+        "warnings": preprocessed["warnings"],
+        "signals": signals,
+        "fusion": fusion_result,
+        "detector_latency_ms": run.latency_ms,
+        "timings": timings
+    }
+
+
+def analyze_long_audio_file(
+    path: str,
+    policy: Optional[FusionPolicy] = None,
+    max_duration_sec: float = LONG_AUDIO_MAX_SEC
+) -> Dict[str, Any]:
+    """
+    Windowed analysis of a recording of any length, read from `path` in
+    blocks so worker memory stays flat.
+
+    Every overlapping window with enough speech is scored on its own; the
+    overall verdict fuses the speech-weighted mean of the window signals,
+    and "timeline" keeps the per-window verdicts. Returns the same dict as
+    analyze_audio_bytes plus "timeline"; "detector_latency_ms" is summed
+    over windows. "timings" splits the time into "windows" (decoding and
+    resampling), "detectors" and "fusion".
+    """
+    started = time.perf_counter()
+    detector_ms = 0.0
+    with open(path, "rb") as f:
+        reader, err = open_audio_windows(f, max_duration_sec=max_duration_sec)
+        if err is not None:
+            return {"is_valid": False, "error": err, "warnings": []}
+
+        timeline = []
+        scored = []
+        latency_ms: Dict[str, float] = {}
+        for window in reader:
+            # Filled in below for scored windows; null for the others
+            timeline.append({
+                "start_sec": round(window.start_sec, 3),
+                "end_sec": round(window.end_sec, 3),
+                "speech_sec": round(window.speech_sec, 3),
+                "decision": None,
+                "trust_index": None
+            })
+            if window.is_valid:
+                detector_started = time.perf_counter()
+                run = run_detectors(window.waveform)
+                detector_ms += _elapsed_ms(detector_started)
+                if run.errors:
+                    return _detector_failure(run)
+                for name, ms in run.latency_ms.items():
+                    latency_ms[name] = round(latency_ms.get(name, 0.0) + ms, 3)
+                scored.append((len(timeline) - 1, window.speech_sec, run.signals))
+
+    if not scored:
+        return {
+            "is_valid": False,
+            "error": "Invalid audio after preprocessing",
+            "warnings": ["silence_only_audio"]
+        }
+
+    timings = {
+        "windows": round(_elapsed_ms(started) - detector_ms, 3),
+        "detectors": round(detector_ms, 3)
+    }
+    started = time.perf_counter()
+
+    rows, speech, signals = zip(*scored)
+    per_window = {
+        name: np.array([s[name] for s in signals]) for name in DETECTOR_SIGNALS
+    }
+    batch = evaluate_fusion_batch(
+        per_window["aasist"], per_window["hfi"], per_window["tns"], policy
+    )
+    for i, row in enumerate(rows):
+        timeline[row]["decision"] = DECISION_LABELS[batch["decision"][i]]
+        timeline[row]["trust_index"] = float(batch["trust_index"][i])
+
+    weights = np.asarray(speech)
+    overall = {
+        name: round(float(np.average(values, weights=weights)), 3)
+        for name, values in per_window.items()
+    }
+    fusion_result = evaluate_fusion(
+        aasist_confidence=overall["aasist"],
+        hfi_confidence=overall["hfi"],
+        tns_confidence=overall["tns"],
+        policy=policy
+    )
+
+    timings["fusion"] = _elapsed_ms(started)
+
+    warnings = []
+    if reader.truncated:
+        warnings.append("audio_trimmed_to_max_duration")
+    if weights.max() < WARN_DURATION_SEC:
+        warnings.append("short_audio_low_confidence")
+
+    return {
+        "is_valid": True,
+        "duration_sec": round(min(reader.info.duration_sec, max_duration_sec), 3),
+        "warnings": warnings,
+        "signals": overall,
+        "fusion": fusion_result,
+        "timeline": timeline,
+        "detector_latency_ms": latency_ms,
+        "timings": timings
+    }
+
+
+def build_voice_response(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    VoiceAnalysisResponse body for a valid analysis.
+    """
+    signals = analysis["signals"]
+    fusion_result = analysis["fusion"]
+    weights = fusion_result["weights"]
+
+    return {
+        "decision": fusion_result["decision"],
+        "scores": {
+            "authenticity_score": fusion_result["authenticity_score"],
+            "trust_index": fusion_result["trust_index"],
+            "confidence": fusion_result["confidence"]
+        },
+        "provenance": {
+            "human_probability": fusion_result["trust_index"],
+            "synthetic_probability": round(1 - fusion_result["trust_index"], 3)
+        },
+        "signals": {
+            "aasist": {"confidence": signals["aasist"], "weight": weights["aasist"]},
+            "hfi": {"confidence": signals["hfi"], "weight": weights["hfi"]},
+            "tns": {"confidence": signals["tns"], "weight": weights["tns"]}
+        },
+        "explanation": "Mock response (model not yet connected)",
+        "technical_details": {
+            "detector_latency_ms": analysis["detector_latency_ms"]
+        }
+    }
+
+
+def _preprocessing_failure(preprocessed: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "is_valid": False,
+        "error": preprocessed["error"],
+        "warnings": preprocessed["warnings"],
+        "timings": preprocessed.get("timings", {})
+    }
+
+
+def _detector_timings(run: DetectorRun) -> Dict[str, float]:
+    detectors = [ms for name, ms in run.latency_ms.items() if name != "features"]
+    return {
+        "features": run.latency_ms.get("features", 0.0),
+        "detectors": max(detectors, default=0.0)
+    }
+
+
+def _with_queue_time(analysis: Dict[str, Any], started: float) -> Dict[str, Any]:
+    timings = analysis.get("timings", {})
+    wait_ms = _elapsed_ms(started) - sum(timings.values())
+    analysis["timings"] = {**timings, "queue": round(max(0.0, wait_ms), 3)}
+    return analysis
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
+
+
+def _detector_failure(run: DetectorRun) -> Dict[str, Any]:
+    failed = ", ".join(f"{name} {reason}" for name, reason in run.errors.items())
+    return {
+        "is_valid": False,
+        "error": f"Signal detectors unavailable: {failed}",
+        "warnings": [],
+        "detector_errors": run.errors,
+        "detector_latency_ms": run.latency_ms
+    }
@@ -0,0 +1,62 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.api.auth import require_admin
+from app.fusion.fusion_policy import get_policy, reload_policy
+from app.utils.tenants import get_tenant_registry
+
+router = APIRouter(
+    prefix="/v1/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/fusion-policy")
+def read_fusion_policy() -> Dict[str, Any]:
+    return get_policy().to_dict()
+
+
+@router.post("/fusion-policy/reload")
+def reload_fusion_policy() -> Dict[str, Any]:
+    """
+    Re-read FUSION_POLICY_PATH and swap it in. Applies to this worker
+    process only; signal the others with SIGHUP.
+    """
+    try:
+        policy = reload_policy()
+    except (OSError, ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fusion policy not reloaded: {exc}"
+        )
+    return policy.to_dict()
+
+
+@router.get("/models")
+def read_model_weights(request: Request) -> Dict[str, Any]:
+    """
+    Detector weight load report for this worker; resident_bytes is
+    measured now, so it grows as pages are touched.
+    """
+    return request.app.state.model_weights.report()
+
+
+@router.get("/tenants")
+def read_tenants() -> Dict[str, Any]:
+    """
+    Per-tenant limits and analyses currently in flight on this worker.
+    """
+    return get_tenant_registry().stats()
+
+
+@router.get("/batching")
+def read_batching_stats(request: Request) -> Dict[str, Any]:
+    """
+    Detector micro-batching: batch-size and queue-wait histograms.
+    """
+    batcher = request.app.state.batcher
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
@@ -1,27 +1,83 @@
-from fastapi import Header, HTTPException, status
-from app.config import get_api_key
+from typing import AsyncIterator, Optional
 
-def verify_api_key(
-    x_api_key: str | None = Header(None, alias="x-api-key")
-):
-    expected_key = get_api_key()
+from fastapi import Depends, Header, HTTPException, status
+
+from app.utils.metrics import TENANT_REJECTS
+from app.utils.tenants import Tenant, get_tenant_registry
+
+_REJECTION_DETAILS = {
+    "rate_limited": "Rate limit exceeded",
+    "too_many_in_flight": "Too many concurrent requests",
+}
 
-    if not expected_key:
+
+def authenticate(api_key: Optional[str]) -> Tenant:
+    """
+    The tenant owning `api_key`, from the registry loaded at startup.
+    """
+    registry = get_tenant_registry()
+    if not registry.configured:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Server API key not configured"
         )
 
-    if not x_api_key:
+    if not api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing API key"
         )
 
-    if x_api_key != expected_key:
+    tenant = registry.authenticate(api_key)
+    if tenant is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key"
         )
 
-    return x_api_key
+    return tenant
+
+
+def verify_api_key(
+    x_api_key: Optional[str] = Header(None, alias="x-api-key")
+) -> Tenant:
+    return authenticate(x_api_key)
+
+
+def require_admin(tenant: Tenant = Depends(verify_api_key)) -> Tenant:
+    """
+    Admin endpoints' dependency: a valid key that belongs to an admin
+    tenant (403 for any other tenant's key).
+    """
+    if not tenant.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API key required"
+        )
+    return tenant
+
+
+async def admit_tenant(
+    x_api_key: Optional[str] = Header(None, alias="x-api-key")
+) -> AsyncIterator[Tenant]:
+    """
+    Analysis endpoints' dependency: authenticates, then holds one of the
+    tenant's in-flight slots until the request is done. Dependencies run
+    before the handler, so over-quota requests get 429 before any of the
+    upload is read.
+    """
+    tenant = authenticate(x_api_key)
+
+    rejection = tenant.try_acquire()
+    if rejection is not None:
+        TENANT_REJECTS.inc(1.0, tenant.name, rejection.reason)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=_REJECTION_DETAILS[rejection.reason],
+            headers={"Retry-After": str(rejection.retry_after)}
+        )
+
+    try:
+        yield tenant
+    finally:
+        tenant.release()
@@ -0,0 +1,67 @@
+from typing import List
+
+from fastapi import APIRouter, Request, Response
+
+from app.utils.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    gauge_lines,
+    process_rss_bytes,
+    render_histogram,
+    render_metrics,
+)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def read_metrics(request: Request) -> Response:
+    """
+    Prometheus text exposition for this worker process. Unauthenticated,
+    like /health: it carries no request content.
+    """
+    return Response(render_metrics(_state_lines(request)), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _state_lines(request: Request) -> List[str]:
+    # Collected at scrape time from the objects that already count them
+    state = request.app.state
+    lines: List[str] = []
+
+    rss = process_rss_bytes()
+    if rss is not None:
+        lines += gauge_lines(
+            "process_resident_memory_bytes", "Resident memory of this worker process", rss
+        )
+
+    cache = getattr(state, "result_cache", None)
+    if cache is not None:
+        stats = cache.stats()
+        lines += gauge_lines(
+            "analysis_cache_hits_total", "Result cache hits", stats["hits"], "counter"
+        )
+        lines += gauge_lines(
+            "analysis_cache_misses_total", "Result cache misses", stats["misses"], "counter"
+        )
+        lines += gauge_lines("analysis_cache_entries", "Result cache entries", stats["entries"])
+
+    executor = getattr(state, "executor", None)
+    if executor is not None:
+        lines += gauge_lines(
+            "analysis_executor_pending", "Admitted analysis requests", executor.pending
+        )
+        lines += gauge_lines(
+            "analysis_executor_capacity", "Analysis admission capacity", executor.capacity
+        )
+
+    batcher = getattr(state, "batcher", None)
+    if batcher is not None:
+        lines += [
+            "# HELP detector_batch_size Clips per detector batch",
+            "# TYPE detector_batch_size histogram",
+            *render_histogram("detector_batch_size", batcher.batch_size, {}),
+            "# HELP detector_batch_queue_wait_milliseconds Wait before a clip's batch ran",
+            "# TYPE detector_batch_queue_wait_milliseconds histogram",
+            *render_histogram("detector_batch_queue_wait_milliseconds", batcher.queue_wait_ms, {}),
+        ]
+
+    return lines
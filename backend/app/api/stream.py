@@ -0,0 +1,163 @@
+"""
+Live analysis over a WebSocket.
+
+Protocol:
+    connect  /v1/voice/stream?sample_rate=48000&channels=1&format=f32
+             with the API key in the x-api-key header, or ?api_key= since
+             browsers cannot set WebSocket headers (query strings end up
+             in access logs; STREAM_QUERY_API_KEY=0 turns this off). The
+             socket is accepted, then closed with 1008 for a bad key and
+             with 1013 (try again later) when over the tenant's quota or
+             the analysis capacity. An open stream holds one of its
+             tenant's in-flight slots and one analysis executor admission
+    client → binary messages of interleaved little-endian PCM
+             ("s16" or "f32"), any size
+    client → text "stop" (or {"type": "stop"}) when recording ends
+    server → {"type": "provisional", ...} roughly every
+             PROVISIONAL_INTERVAL_SEC of new audio once a valid clip has
+             been heard; same body as POST /v1/voice/analyze plus
+             duration_sec and trailing_silence_sec
+    server → {"type": "final", ...} after "stop" (or when the stream
+             buffer is full), then closes
+    server → {"type": "error", "detail": ..., "warnings": [...]} then closes
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
+
+from app.analysis import analyze_preprocessed, build_voice_response
+from app.api.auth import authenticate
+from app.config import get_stream_query_api_key_enabled
+from app.fusion.fusion_policy import get_policy
+from app.utils.executor import AnalysisExecutor, ExecutorSaturated
+from app.utils.metrics import TENANT_REJECTS, observe_analysis
+from sai_audio.stream import open_audio_stream
+
+# Seconds of new 16 kHz audio between provisional verdicts
+PROVISIONAL_INTERVAL_SEC = 1.0
+
+router = APIRouter(prefix="/v1/voice", tags=["voice"])
+
+
+@router.websocket("/stream")
+async def stream_voice(websocket: WebSocket):
+    # Accepted first: closing before accept() reaches the client as an
+    # HTTP 403, without the close code
+    await websocket.accept()
+
+    api_key = websocket.headers.get("x-api-key")
+    if not api_key and get_stream_query_api_key_enabled():
+        api_key = websocket.query_params.get("api_key")
+    try:
+        tenant = authenticate(api_key)
+    except HTTPException as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+        return
+
+    rejection = tenant.try_acquire()
+    if rejection is not None:
+        TENANT_REJECTS.inc(1.0, tenant.name, rejection.reason)
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=rejection.reason)
+        return
+
+    # The stream counts against the executor's admission limit while it
+    # is open; its analyses run in the executor's pool
+    executor = websocket.app.state.executor
+    try:
+        with executor.admission():
+            await _serve_stream(websocket, executor)
+    except ExecutorSaturated:
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER, reason="Analysis capacity exhausted"
+        )
+    finally:
+        tenant.release()
+
+
+async def _serve_stream(websocket: WebSocket, executor: AnalysisExecutor) -> None:
+    params = websocket.query_params
+    try:
+        sample_rate = int(params.get("sample_rate", ""))
+        channels = int(params.get("channels", "1"))
+    except ValueError:
+        await _send_error(websocket, "sample_rate and channels must be integers")
+        return
+
+    stream, err = open_audio_stream(sample_rate, channels, params.get("format", "s16"))
+    if err is not None:
+        await _send_error(websocket, err)
+        return
+
+    # One policy for the whole stream, even if it is swapped meanwhile
+    policy = get_policy()
+    next_provisional = PROVISIONAL_INTERVAL_SEC
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            if message.get("bytes") is not None:
+                err = await run_in_threadpool(stream.push, message["bytes"])
+                if err is not None:
+                    await _send_error(websocket, err)
+                    return
+
+                if stream.is_full:
+                    break
+
+                if stream.duration_sec >= next_provisional:
+                    next_provisional = stream.duration_sec + PROVISIONAL_INTERVAL_SEC
+                    result = await run_in_threadpool(stream.result)
+                    analysis = await executor.run_admitted(analyze_preprocessed, result, policy)
+                    if analysis["is_valid"]:
+                        body = _stream_response(analysis, result)
+                        await websocket.send_json({"type": "provisional", **body})
+
+            elif _is_stop(message.get("text")):
+                break
+
+        await run_in_threadpool(stream.finish)
+        result = await run_in_threadpool(stream.result)
+        analysis = await executor.run_admitted(analyze_preprocessed, result, policy)
+        observe_analysis(analysis)
+        if not analysis["is_valid"]:
+            await _send_error(websocket, analysis["error"], analysis["warnings"])
+            return
+
+        await websocket.send_json({"type": "final", **_stream_response(analysis, result)})
+        await websocket.close()
+    except WebSocketDisconnect:
+        return
+
+
+def _stream_response(analysis: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **build_voice_response(analysis),
+        "duration_sec": analysis["duration_sec"],
+        "trailing_silence_sec": result["trailing_silence_sec"],
+        "warnings": analysis["warnings"]
+    }
+
+
+def _is_stop(text: Optional[str]) -> bool:
+    if text is None:
+        return False
+    if text.strip() == "stop":
+        return True
+    try:
+        return json.loads(text).get("type") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+async def _send_error(
+    websocket: WebSocket,
+    detail: str,
+    warnings: Optional[List[str]] = None
+) -> None:
+    await websocket.send_json({"type": "error", "detail": detail, "warnings": warnings or []})
+    await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
@@ -0,0 +1,296 @@
+"""
+Preprocessing and fusion micro-benchmarks with a JSON baseline.
+
+Usage (from backend/):
+    python -m app.benchmark --output baseline.json
+    python -m app.benchmark --baseline baseline.json --threshold 0.2
+
+Every case is a deterministic synthetic clip (sai_audio.synthetic); the
+matrix spans 8-48 kHz, mono and stereo, 1-300 s, and speech, silence-padded
+and noise-only content. Per case, each stage runs on the previous stage's
+output:
+    decode     decode_base64_audio on the base64 WAV
+    load       load_audio_bytes on the WAV bytes, downmixed on read like
+               the pipeline does
+    normalize  normalize_audio on the loaded waveform
+    trim       trim_and_validate on the 16 kHz waveform
+    fusion     evaluate_fusion on fixed detector confidences
+    pipeline   process_audio_base64 end to end
+
+Times are the median and minimum over --repeats runs after one warmup run.
+Peak memory is the tracemalloc peak of one extra, separately traced run
+(numpy buffers included), so tracing never skews the times.
+
+With --baseline, a stage regresses when its median time or peak memory
+exceeds the baseline by more than --threshold (a fraction) and by more
+than a small absolute floor; the exit status is then 1. Baselines are
+machine-specific: record them on the machine that compares against them.
+"""
+import argparse
+import base64
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+import app.analysis  # noqa: F401  (puts sai_audio on the path)
+from app.fusion.fusion_engine import evaluate_fusion
+from sai_audio.decode import decode_base64_audio
+from sai_audio.load_audio import load_audio_bytes
+from sai_audio.normalize import normalize_audio
+from sai_audio.pipeline import process_audio_base64, warmup
+from sai_audio.synthetic import synthetic_wav_bytes
+from sai_audio.validate import trim_and_validate
+
+STAGES = ("decode", "load", "normalize", "trim", "fusion", "pipeline")
+
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.2
+
+# Differences below these never count as regressions (timer and
+# allocator noise on tiny stages)
+MIN_REGRESSION_MS = 0.05
+MIN_REGRESSION_BYTES = 64 * 1024
+
+# Detector confidences fed to evaluate_fusion: one weak signal, so the
+# penalty branches run too
+FUSION_INPUTS = (0.82, 0.35, 0.71)
+
+
+class BenchCase(NamedTuple):
+    name: str
+    sample_rate: int
+    channels: int
+    duration_sec: float
+    kind: str = "speech"
+
+
+# Kept under MAX_AUDIO_BYTES as 16-bit WAV, so every stage sees valid input
+CASES = (
+    BenchCase("speech_8k_mono_1s", 8000, 1, 1.0),
+    BenchCase("speech_16k_mono_1s", 16000, 1, 1.0),
+    BenchCase("speech_16k_mono_10s", 16000, 1, 10.0),
+    BenchCase("speech_22k_mono_10s", 22050, 1, 10.0),
+    BenchCase("speech_44k_stereo_10s", 44100, 2, 10.0),
+    BenchCase("speech_48k_mono_10s", 48000, 1, 10.0),
+    BenchCase("speech_48k_stereo_1s", 48000, 2, 1.0),
+    BenchCase("padded_16k_mono_10s", 16000, 1, 10.0, "padded"),
+    BenchCase("padded_48k_stereo_10s", 48000, 2, 10.0, "padded"),
+    BenchCase("noise_16k_mono_10s", 16000, 1, 10.0, "noise"),
+    BenchCase("noise_44k_stereo_10s", 44100, 2, 10.0, "noise"),
+    BenchCase("speech_8k_stereo_300s", 8000, 2, 300.0),
+    BenchCase("speech_16k_mono_300s", 16000, 1, 300.0),
+    BenchCase("padded_22k_mono_300s", 22050, 1, 300.0, "padded"),
+)
+
+# Subset for smoke runs and tests
+QUICK_CASES = ("speech_16k_mono_1s", "speech_48k_stereo_1s", "noise_16k_mono_10s")
+
+
+def stage_calls(case: BenchCase) -> Dict[str, Callable[[], Any]]:
+    """
+    Zero-argument callables per stage, each bound to the previous stage's
+    output for `case` (computed here, outside the timed region).
+    """
+    wav = synthetic_wav_bytes(case.sample_rate, case.duration_sec, case.channels, case.kind)
+    encoded = base64.b64encode(wav).decode("ascii")
+
+    waveform, sample_rate, err = load_audio_bytes(wav, mono=True)
+    if err is not None:
+        raise ValueError(f"{case.name}: synthetic clip failed to load: {err}")
+    normalized, normalized_rate = normalize_audio(waveform, sample_rate)
+
+    return {
+        "decode": lambda: decode_base64_audio(encoded),
+        "load": lambda: load_audio_bytes(wav, mono=True),
+        "normalize": lambda: normalize_audio(waveform, sample_rate),
+        "trim": lambda: trim_and_validate(normalized, normalized_rate),
+        "fusion": lambda: evaluate_fusion(*FUSION_INPUTS),
+        "pipeline": lambda: process_audio_base64(encoded),
+    }
+
+
+def measure(call: Callable[[], Any], repeats: int = DEFAULT_REPEATS) -> Dict[str, float]:
+    """
+    Median and minimum wall time (ms) over `repeats` runs after a warmup
+    run, and the tracemalloc peak (bytes) of one more run.
+    """
+    call()
+    times = []
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - started) * 1000.0)
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times), 4),
+        "min_ms": round(min(times), 4),
+        "peak_bytes": int(peak),
+    }
+
+
+def run_benchmarks(
+    cases: Sequence[BenchCase] = CASES,
+    stages: Sequence[str] = STAGES,
+    repeats: int = DEFAULT_REPEATS,
+    progress: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Benchmark every (case, stage) pair.
+
+    Returns:
+        {"meta": {...}, "results": {case name: {stage: measure() dict}}}
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)}")
+
+    # Deferred imports and resampling filters are not what is measured
+    warmup()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for case in cases:
+        calls = stage_calls(case)
+        results[case.name] = {}
+        for stage in stages:
+            results[case.name][stage] = measure(calls[stage], repeats)
+            if progress is not None:
+                progress(_format_row(case.name, stage, results[case.name][stage]))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "cases": {case.name: case._asdict() for case in cases},
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Regressions of `current` against `baseline` (both run_benchmarks()
+    reports). Pairs missing from either report are skipped.
+    """
+    regressions = []
+    for case_name, stages in current["results"].items():
+        for stage, now in stages.items():
+            before = baseline.get("results", {}).get(case_name, {}).get(stage)
+            if before is None:
+                continue
+
+            for metric, floor in (("median_ms", MIN_REGRESSION_MS),
+                                  ("peak_bytes", MIN_REGRESSION_BYTES)):
+                old, new = before.get(metric), now[metric]
+                if old is None:
+                    continue
+                if new > old * (1.0 + threshold) and new - old > floor:
+                    regressions.append({
+                        "case": case_name,
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "ratio": round(new / old, 3) if old else None,
+                    })
+    return regressions
+
+
+def _format_row(case_name: str, stage: str, result: Dict[str, float]) -> str:
+    return (f"  {case_name:<24} {stage:<10} "
+            f"median {result['median_ms']:>10.3f} ms  "
+            f"min {result['min_ms']:>10.3f} ms  "
+            f"peak {result['peak_bytes'] / 1024:>10.1f} KiB")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.benchmark",
+        description="Benchmark audio preprocessing stages and fusion on synthetic clips."
+    )
+    parser.add_argument("--output", "-o", help="write the JSON report here (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown or memory growth as a fraction (default 0.2)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--case", action="append", dest="cases",
+                        help="case name to run; repeatable (default: all)")
+    parser.add_argument("--stage", action="append", dest="stages",
+                        help="stage to run; repeatable (default: all)")
+    parser.add_argument("--quick", action="store_true", help="run only the short smoke cases")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print(f"{case.name:<24} {case.sample_rate:>6} Hz  {case.channels} ch  "
+                  f"{case.duration_sec:>6g} s  {case.kind}")
+        return 0
+
+    names = args.cases or (QUICK_CASES if args.quick else [case.name for case in CASES])
+    by_name = {case.name: case for case in CASES}
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        print(f"error: unknown cases: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+
+    try:
+        report = run_benchmarks(
+            [by_name[name] for name in names],
+            args.stages or STAGES,
+            args.repeats,
+            progress=print,
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(report, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+        return 0
+
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} of {args.baseline}:")
+    for r in regressions:
+        print(f"  {r['case']:<24} {r['stage']:<10} {r['metric']:<10} "
+              f"{r['baseline']:g} -> {r['current']:g} (x{r['ratio']})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 # Explicitly load .env
@@ -11,3 +12,117 @@ def get_api_key() -> str:
             "VAKYAGUARD_API_KEY is not set. Check backend/.env"
         )
     return api_key
+
+
+def get_api_keys_path() -> Optional[str]:
+    return os.getenv("API_KEYS_PATH") or None
+
+
+def get_stream_query_api_key_enabled() -> bool:
+    # Browsers cannot set WebSocket headers, but query strings get logged
+    return os.getenv("STREAM_QUERY_API_KEY", "1").lower() not in ("0", "false", "no", "")
+
+
+def get_tenant_rate_per_sec() -> float:
+    return max(0.0, get_float_env("TENANT_RATE_PER_SEC", 0.0))
+
+
+def get_tenant_burst() -> float:
+    # 0 means "same as the rate" (at least 1)
+    return max(0.0, get_float_env("TENANT_BURST", 0.0))
+
+
+def get_tenant_max_in_flight() -> int:
+    return max(0, get_int_env("TENANT_MAX_IN_FLIGHT", 0))
+
+
+def get_int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise RuntimeError(f"{name} must be an integer, got {value!r}")
+
+
+def get_analysis_executor_kind() -> str:
+    kind = os.getenv("ANALYSIS_EXECUTOR", "process").lower()
+    if kind not in ("process", "thread"):
+        raise RuntimeError(
+            f"ANALYSIS_EXECUTOR must be 'process' or 'thread', got {kind!r}"
+        )
+    return kind
+
+
+def get_analysis_workers() -> int:
+    return max(1, get_int_env("ANALYSIS_WORKERS", os.cpu_count() or 1))
+
+
+def get_analysis_queue_size() -> int:
+    return max(0, get_int_env("ANALYSIS_QUEUE_SIZE", 2 * get_analysis_workers()))
+
+
+def get_analysis_retry_after() -> int:
+    return max(1, get_int_env("ANALYSIS_RETRY_AFTER_SEC", 1))
+
+
+def get_analysis_batch_max_size() -> int:
+    return max(1, get_int_env("ANALYSIS_BATCH_MAX_SIZE", 8))
+
+
+def get_analysis_batch_max_wait_ms() -> float:
+    return max(0.0, get_float_env("ANALYSIS_BATCH_MAX_WAIT_MS", 5.0))
+
+
+def get_upload_max_bytes() -> int:
+    # Same default as sai_audio.decode.MAX_AUDIO_BYTES
+    return max(1, get_int_env("UPLOAD_MAX_BYTES", 25 * 1024 * 1024))
+
+
+def get_upload_max_duration_sec() -> float:
+    return max(1.0, get_float_env("UPLOAD_MAX_DURATION_SEC", 300.0))
+
+
+def get_long_upload_max_bytes() -> int:
+    return max(1, get_int_env("LONG_UPLOAD_MAX_BYTES", 1024 * 1024 * 1024))
+
+
+def get_long_audio_max_sec() -> int:
+    return max(1, get_int_env("LONG_AUDIO_MAX_SEC", 30 * 60))
+
+
+def get_float_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise RuntimeError(f"{name} must be a number, got {value!r}")
+
+
+def get_detector_impl() -> str:
+    return os.getenv("DETECTOR_IMPL", "mock").lower()
+
+
+def get_detector_timeout_sec(signal: str) -> float:
+    default = get_float_env("DETECTOR_TIMEOUT_SEC", 5.0)
+    return max(0.001, get_float_env(f"DETECTOR_TIMEOUT_SEC_{signal.upper()}", default))
+
+
+def get_model_weights_dir() -> Optional[str]:
+    return os.getenv("MODEL_WEIGHTS_DIR") or None
+
+
+def get_model_weights_prefault() -> bool:
+    return os.getenv("MODEL_WEIGHTS_PREFAULT", "1").lower() not in ("0", "false", "no")
+
+
+def get_server_timing_enabled() -> bool:
+    return os.getenv("SERVER_TIMING", "0").lower() not in ("0", "false", "no", "")
+
+
+def get_response_validation_enabled() -> bool:
+    # Debug mode: check response bodies against their models before sending
+    return os.getenv("RESPONSE_VALIDATION", "0").lower() not in ("0", "false", "no", "")
@@ -0,0 +1,323 @@
+"""
+Offline fusion threshold / penalty sweep.
+
+Usage (from backend/):
+    python -m app.fusion.calibrate scores.csv --output report.json \\
+        --weak-penalty 0.05,0.1,0.15 --authentic 0.6:0.9:0.01
+
+The dataset holds one row per clip: aasist, hfi, tns, label with
+label 1 = human and 0 = synthetic. `.npy` and `.parquet` inputs are
+memory-mapped directly. CSV (with a header row) is parsed on every run,
+or, with --cache-dir, parsed once into a `.npy` file in that directory
+that later runs memory-map.
+
+For every penalty combination the trust index is computed once with the
+production fusion code, then every (authentic, synthetic) threshold pair
+is scored with binary searches over the sorted human and synthetic
+scores, so the grid costs O(rows) per penalty combination instead of
+O(rows x threshold pairs).
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.fusion.fusion_engine import trust_index_batch
+from app.fusion.fusion_policy import FusionPolicy, get_policy
+
+DATASET_COLUMNS = ("aasist", "hfi", "tns", "label")
+
+# Rows fused per step: bounds temporaries to a few hundred MB at 10M rows
+CHUNK_ROWS = 1 << 20
+
+# Single-threshold grid used for ROC points and EER
+ROC_GRID = np.linspace(0.0, 1.0, 1001)
+
+
+def load_dataset(path: str, cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Return the dataset as a (rows, 4) float64 array, memory-mapped whenever
+    possible. Parsed CSVs are cached in `cache_dir` when one is given.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".npy":
+        data = np.load(path, mmap_mode="r")
+    elif ext == ".csv":
+        data = _load_csv_cached(path, cache_dir) if cache_dir else _load_csv(path)
+    elif ext in (".parquet", ".pq"):
+        data = _load_parquet(path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {ext or path!r}")
+
+    if data.ndim != 2 or data.shape[1] != len(DATASET_COLUMNS):
+        raise ValueError(f"Dataset must have columns {', '.join(DATASET_COLUMNS)}")
+    return data
+
+
+def _load_csv(path: str) -> np.ndarray:
+    with open(path, "r", encoding="utf-8") as f:
+        header = [name.strip().lower() for name in f.readline().split(",")]
+        missing = [name for name in DATASET_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+        usecols = [header.index(name) for name in DATASET_COLUMNS]
+        return np.loadtxt(f, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+
+
+def _load_csv_cached(path: str, cache_dir: str) -> np.ndarray:
+    # One cache file per source path, so same-named datasets do not collide
+    source = os.path.abspath(path)
+    digest = hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}.npy")
+
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(path):
+        data = _load_csv(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp_path, cache_path)
+
+    return np.load(cache_path, mmap_mode="r")
+
+
+def _load_parquet(path: str) -> np.ndarray:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Reading Parquet needs pyarrow; convert to CSV or .npy instead")
+
+    table = pq.read_table(path, columns=list(DATASET_COLUMNS), memory_map=True)
+    return np.column_stack([
+        table.column(name).to_numpy().astype(np.float64, copy=False)
+        for name in DATASET_COLUMNS
+    ])
+
+
+def parse_grid(spec: str) -> List[float]:
+    """
+    "0.1,0.2" -> [0.1, 0.2];  "0.3:0.9:0.05" -> 0.3, 0.35, ... 0.9 (inclusive).
+    """
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"Grid step must be positive: {spec!r}")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    return [float(part) for part in spec.split(",") if part.strip()]
+
+
+def trust_index_column(data: np.ndarray, policy: FusionPolicy) -> np.ndarray:
+    """
+    Fuse every row of `data` under `policy`, chunk by chunk.
+    """
+    trust_index = np.empty(len(data), dtype=np.float64)
+    for start in range(0, len(data), CHUNK_ROWS):
+        chunk = data[start:start + CHUNK_ROWS]
+        trust_index[start:start + len(chunk)] = trust_index_batch(
+            chunk[:, 0], chunk[:, 1], chunk[:, 2], policy
+        )
+    return trust_index
+
+
+def score_configuration(
+    human: np.ndarray,
+    synthetic: np.ndarray,
+    authentic_thresholds: Sequence[float],
+    synthetic_thresholds: Sequence[float],
+    roc_points: int = 101
+) -> Dict[str, Any]:
+    """
+    Metrics for one penalty combination. `human` and `synthetic` are the
+    sorted trust indexes of each class.
+
+    Decisions follow evaluate_fusion: AUTHENTIC if trust >= authentic
+    threshold, SYNTHETIC if trust <= synthetic threshold, else UNCERTAIN.
+    """
+    n_human, n_synthetic = len(human), len(synthetic)
+    total = n_human + n_synthetic
+
+    # Single-threshold view (trust >= t means human) for ROC and EER
+    far = (n_synthetic - np.searchsorted(synthetic, ROC_GRID, "left")) / max(n_synthetic, 1)
+    tpr = (n_human - np.searchsorted(human, ROC_GRID, "left")) / max(n_human, 1)
+    frr = 1.0 - tpr
+
+    crossing = int(np.argmin(np.abs(far - frr)))
+    roc_step = max(1, (len(ROC_GRID) - 1) // max(roc_points - 1, 1))
+
+    auth = np.asarray(authentic_thresholds, dtype=np.float64)
+    syn = np.asarray(synthetic_thresholds, dtype=np.float64)
+
+    human_authentic = n_human - np.searchsorted(human, auth, "left")
+    human_synthetic = np.searchsorted(human, syn, "right")
+    synthetic_authentic = n_synthetic - np.searchsorted(synthetic, auth, "left")
+    synthetic_synthetic = np.searchsorted(synthetic, syn, "right")
+
+    thresholds = []
+    for i, j in product(range(len(auth)), range(len(syn))):
+        if syn[j] >= auth[i]:
+            continue
+        decided = (
+            human_authentic[i] + human_synthetic[j] +
+            synthetic_authentic[i] + synthetic_synthetic[j]
+        )
+        thresholds.append({
+            "authentic_threshold": float(auth[i]),
+            "synthetic_threshold": float(syn[j]),
+            "false_accept_rate": float(synthetic_authentic[i] / max(n_synthetic, 1)),
+            "false_reject_rate": float(human_synthetic[j] / max(n_human, 1)),
+            "uncertain_rate": float((total - decided) / max(total, 1)),
+        })
+
+    return {
+        "eer": float((far[crossing] + frr[crossing]) / 2),
+        "eer_threshold": float(ROC_GRID[crossing]),
+        "roc": [
+            {"threshold": float(t), "fpr": float(f), "tpr": float(p)}
+            for t, f, p in zip(ROC_GRID[::roc_step], far[::roc_step], tpr[::roc_step])
+        ],
+        "thresholds": thresholds,
+    }
+
+
+def sweep(
+    data: np.ndarray,
+    base_policy: FusionPolicy,
+    weak_penalties: Sequence[float],
+    multiple_weak_penalties: Sequence[float],
+    disagreement_penalties: Sequence[float],
+    authentic_thresholds: Sequence[float],
+    synthetic_thresholds: Sequence[float],
+    roc_points: int = 101
+) -> Dict[str, Any]:
+    labels = np.asarray(data[:, 3])
+    is_human = labels >= 0.5
+
+    configurations = []
+    for weak, multiple, disagreement in product(
+        weak_penalties, multiple_weak_penalties, disagreement_penalties
+    ):
+        policy = base_policy.replace(
+            weak_signal_penalty=weak,
+            multiple_weak_penalty=multiple,
+            disagreement_penalty=disagreement,
+        )
+        trust_index = trust_index_column(data, policy)
+
+        human = np.sort(trust_index[is_human])
+        synthetic = np.sort(trust_index[~is_human])
+        del trust_index
+
+        result = score_configuration(
+            human, synthetic, authentic_thresholds, synthetic_thresholds, roc_points
+        )
+        configurations.append({
+            "weak_signal_penalty": weak,
+            "multiple_weak_penalty": multiple,
+            "disagreement_penalty": disagreement,
+            **result,
+        })
+
+    return {
+        "rows": int(len(data)),
+        "human_rows": int(is_human.sum()),
+        "synthetic_rows": int(len(data) - is_human.sum()),
+        "base_policy": base_policy.to_dict(),
+        "configurations": configurations,
+    }
+
+
+def _best_operating_points(report: Dict[str, Any], max_uncertain: float, top: int):
+    candidates = []
+    for config in report["configurations"]:
+        for point in config["thresholds"]:
+            if point["uncertain_rate"] <= max_uncertain:
+                cost = point["false_accept_rate"] + point["false_reject_rate"]
+                candidates.append((cost, config, point))
+    candidates.sort(key=lambda item: item[0])
+    return candidates[:top]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.fusion.calibrate",
+        description="Sweep fusion thresholds and penalties over a labeled score dataset."
+    )
+    parser.add_argument("dataset", help="CSV, .npy or Parquet file with aasist, hfi, tns, label")
+    parser.add_argument("--output", "-o", help="write the full JSON report here")
+    parser.add_argument("--cache-dir",
+                        help="cache parsed CSV datasets as .npy files in this directory")
+    parser.add_argument("--policy", help="JSON fusion policy to start from (default: built-in)")
+    parser.add_argument("--weak-penalty", help="list or start:stop:step (default: policy value)")
+    parser.add_argument("--multiple-weak-penalty")
+    parser.add_argument("--disagreement-penalty")
+    parser.add_argument("--authentic", default="0.50:0.95:0.01",
+                        help="authentic thresholds, list or start:stop:step")
+    parser.add_argument("--synthetic", default="0.20:0.70:0.01",
+                        help="synthetic thresholds, list or start:stop:step")
+    parser.add_argument("--roc-points", type=int, default=101)
+    parser.add_argument("--max-uncertain", type=float, default=0.2,
+                        help="UNCERTAIN-rate cap for the printed summary")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    try:
+        base = FusionPolicy.from_file(args.policy) if args.policy else get_policy()
+        data = load_dataset(args.dataset, args.cache_dir)
+        grids = [parse_grid(spec) for spec in (
+            args.weak_penalty or str(base.weak_signal_penalty),
+            args.multiple_weak_penalty or str(base.multiple_weak_penalty),
+            args.disagreement_penalty or str(base.disagreement_penalty),
+            args.authentic,
+            args.synthetic,
+        )]
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        report = sweep(data, base, *grids, roc_points=args.roc_points)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    report["dataset"] = os.path.abspath(args.dataset)
+    report["elapsed_sec"] = round(time.perf_counter() - started, 3)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{report['rows']} rows ({report['human_rows']} human, "
+          f"{report['synthetic_rows']} synthetic), "
+          f"{len(report['configurations'])} penalty combinations "
+          f"in {report['elapsed_sec']:.1f}s")
+
+    for config in report["configurations"]:
+        print(f"  penalties weak={config['weak_signal_penalty']} "
+              f"multiple={config['multiple_weak_penalty']} "
+              f"disagreement={config['disagreement_penalty']}: "
+              f"EER {config['eer']:.4f} at {config['eer_threshold']:.3f}")
+
+    print(f"Best operating points (UNCERTAIN <= {args.max_uncertain:.0%}):")
+    for cost, config, point in _best_operating_points(report, args.max_uncertain, args.top):
+        print(f"  authentic>={point['authentic_threshold']:.3f} "
+              f"synthetic<={point['synthetic_threshold']:.3f} "
+              f"penalties=({config['weak_signal_penalty']}, "
+              f"{config['multiple_weak_penalty']}, {config['disagreement_penalty']}): "
+              f"FAR {point['false_accept_rate']:.4f} FRR {point['false_reject_rate']:.4f} "
+              f"UNCERTAIN {point['uncertain_rate']:.4f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
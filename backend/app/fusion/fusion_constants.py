@@ -14,4 +14,22 @@ CONFIDENCE_MAX_HUMAN = 95
 CONFIDENCE_BASE_SYNTHETIC = 60
 CONFIDENCE_BASE_HUMAN = 50
 SCORE_MIN = 0
-SCORE_MAX = 100
\ No newline at end of file
+SCORE_MAX = 100
+
+
+# Locked v1 fusion engine (evaluate_fusion). The SAS_* / PENALTY_* /
+# TRUST_* values above belong to the 0-100 SAS scoring scheme; these are
+# the [0, 1] parameters the live engine uses.
+FUSION_POLICY_VERSION = "v1-default"
+FUSION_WEIGHT_AASIST = 0.40
+FUSION_WEIGHT_HFI = 0.35
+FUSION_WEIGHT_TNS = 0.25
+FUSION_WEAK_SIGNAL_THRESHOLD = 0.4
+FUSION_PENALTY_WEAK_SIGNAL = 0.15
+FUSION_PENALTY_MULTIPLE_WEAK_SIGNALS = 0.20
+FUSION_SPREAD_THRESHOLD = 0.4
+FUSION_PENALTY_SIGNAL_DISAGREEMENT = 0.10
+FUSION_THRESHOLD_AUTHENTIC = 0.75
+FUSION_THRESHOLD_SYNTHETIC = 0.45
+FUSION_CONFIDENCE_CENTER = 0.6
+FUSION_CONFIDENCE_SCALE = 1.6
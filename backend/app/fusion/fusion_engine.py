@@ -1,81 +1,102 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.fusion.fusion_policy import FusionPolicy, get_policy
+
+# Bump whenever weights, thresholds or rules change: cached results are
+# keyed by it.
+FUSION_ENGINE_VERSION = "v1"
+
+# Decision codes used by evaluate_fusion_batch
+DECISION_AUTHENTIC = 0
+DECISION_UNCERTAIN = 1
+DECISION_SYNTHETIC = 2
+DECISION_LABELS = ("AUTHENTIC", "UNCERTAIN", "SYNTHETIC")
+
+# Explanation bits used by evaluate_fusion_batch
+EXPLAIN_WEAK_SIGNAL = 1
+EXPLAIN_MULTIPLE_WEAK_SIGNALS = 2
+EXPLAIN_SIGNAL_DISAGREEMENT = 4
+
+EXPLANATION_TEXT = {
+    EXPLAIN_WEAK_SIGNAL:
+        "One or more analysis modules report weak human-likeness indicators.",
+    EXPLAIN_MULTIPLE_WEAK_SIGNALS:
+        "Multiple independent signals indicate potential synthetic characteristics.",
+    EXPLAIN_SIGNAL_DISAGREEMENT:
+        "High disagreement observed between analysis modules.",
+}
+
+DECISION_TEXT = {
+    "AUTHENTIC": "Aggregated evidence strongly supports natural human speech.",
+    "SYNTHETIC": "Aggregated evidence is consistent with synthetic speech generation.",
+    "UNCERTAIN": "Evidence is inconclusive and requires further analysis.",
+}
 
 
 def evaluate_fusion(
     aasist_confidence: float,
     hfi_confidence: float,
-    tns_confidence: float
+    tns_confidence: float,
+    policy: Optional[FusionPolicy] = None
 ) -> Dict:
     """
     Explainable decision fusion engine (locked v1)
     All inputs must be in range [0, 1]
-    """
 
-    # -------------------------------
-    # Fixed, explainable weights
-    # -------------------------------
-    weights = {
-        "aasist": 0.40,
-        "hfi": 0.35,
-        "tns": 0.25
-    }
+    Parameters come from `policy`, or the active FusionPolicy.
+    """
+    p = policy or get_policy()
 
     # -------------------------------
     # Base authenticity score
     # -------------------------------
     authenticity_score = (
-        weights["aasist"] * aasist_confidence +
-        weights["hfi"] * hfi_confidence +
-        weights["tns"] * tns_confidence
+        p.weight_aasist * aasist_confidence +
+        p.weight_hfi * hfi_confidence +
+        p.weight_tns * tns_confidence
     )
 
     trust_index = authenticity_score
     explanation: List[str] = []
 
-    scores = [aasist_confidence, hfi_confidence, tns_confidence]
-    weak_signals = sum(score < 0.4 for score in scores)
-    spread = max(scores) - min(scores)
+    weak_signals = (
+        (aasist_confidence < p.weak_signal_threshold) +
+        (hfi_confidence < p.weak_signal_threshold) +
+        (tns_confidence < p.weak_signal_threshold)
+    )
+    spread = (
+        max(aasist_confidence, hfi_confidence, tns_confidence) -
+        min(aasist_confidence, hfi_confidence, tns_confidence)
+    )
 
     if weak_signals >= 1:
-        trust_index -= 0.15
-        explanation.append(
-            "One or more analysis modules report weak human-likeness indicators."
-        )
+        trust_index -= p.weak_signal_penalty
+        explanation.append(EXPLANATION_TEXT[EXPLAIN_WEAK_SIGNAL])
 
     if weak_signals >= 2:
-        trust_index -= 0.20
-        explanation.append(
-            "Multiple independent signals indicate potential synthetic characteristics."
-        )
+        trust_index -= p.multiple_weak_penalty
+        explanation.append(EXPLANATION_TEXT[EXPLAIN_MULTIPLE_WEAK_SIGNALS])
 
-    if spread > 0.4:
-        trust_index -= 0.10
-        explanation.append(
-            "High disagreement observed between analysis modules."
-        )
+    if spread > p.spread_threshold:
+        trust_index -= p.disagreement_penalty
+        explanation.append(EXPLANATION_TEXT[EXPLAIN_SIGNAL_DISAGREEMENT])
 
     trust_index = max(0.0, min(1.0, trust_index))
 
     # -------------------------------
     # Final decision
     # -------------------------------
-    if trust_index >= 0.75:
+    if trust_index >= p.authentic_threshold:
         decision = "AUTHENTIC"
-        explanation.append(
-            "Aggregated evidence strongly supports natural human speech."
-        )
-    elif trust_index <= 0.45:
+    elif trust_index <= p.synthetic_threshold:
         decision = "SYNTHETIC"
-        explanation.append(
-            "Aggregated evidence is consistent with synthetic speech generation."
-        )
     else:
         decision = "UNCERTAIN"
-        explanation.append(
-            "Evidence is inconclusive and requires further analysis."
-        )
+    explanation.append(DECISION_TEXT[decision])
 
-    confidence = abs(trust_index - 0.6) * 1.6
+    confidence = abs(trust_index - p.confidence_center) * p.confidence_scale
     confidence = max(0.0, min(1.0, confidence))
 
     return {
@@ -83,6 +104,124 @@ def evaluate_fusion(
         "authenticity_score": round(authenticity_score, 3),
         "trust_index": round(trust_index, 3),
         "confidence": round(confidence, 3),
-        "weights": weights,
+        "weights": p.weights,
         "explanation": explanation
     }
+
+
+def evaluate_fusion_batch(
+    aasist_confidence: np.ndarray,
+    hfi_confidence: np.ndarray,
+    tns_confidence: np.ndarray,
+    policy: Optional[FusionPolicy] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized evaluate_fusion over equally shaped arrays, with the same
+    `policy` handling.
+
+    Every operation mirrors the scalar path in float64 and in the same
+    order, so element i is bit-identical to
+    evaluate_fusion(aasist[i], hfi[i], tns[i]).
+
+    Returns:
+        decision            int8 codes (DECISION_AUTHENTIC/UNCERTAIN/SYNTHETIC)
+        authenticity_score  float64, rounded to 3 decimals
+        trust_index         float64, rounded to 3 decimals
+        confidence          float64, rounded to 3 decimals
+        explanation         uint8 bitmask of EXPLAIN_* flags; the decision
+                            sentence is implied by the decision code
+    """
+    p = policy or get_policy()
+
+    authenticity_score, trust_index, one_weak, many_weak, disagreement = _fuse_arrays(
+        aasist_confidence, hfi_confidence, tns_confidence, p
+    )
+
+    decision = np.full(trust_index.shape, DECISION_UNCERTAIN, dtype=np.int8)
+    decision[trust_index >= p.authentic_threshold] = DECISION_AUTHENTIC
+    decision[trust_index <= p.synthetic_threshold] = DECISION_SYNTHETIC
+
+    confidence = np.abs(trust_index - p.confidence_center) * p.confidence_scale
+    confidence = np.minimum(1.0, np.maximum(0.0, confidence))
+
+    explanation = (
+        one_weak * np.uint8(EXPLAIN_WEAK_SIGNAL) |
+        many_weak * np.uint8(EXPLAIN_MULTIPLE_WEAK_SIGNALS) |
+        disagreement * np.uint8(EXPLAIN_SIGNAL_DISAGREEMENT)
+    ).astype(np.uint8)
+
+    return {
+        "decision": decision,
+        "authenticity_score": _round3(authenticity_score),
+        "trust_index": _round3(trust_index),
+        "confidence": _round3(confidence),
+        "explanation": explanation
+    }
+
+
+def trust_index_batch(
+    aasist_confidence: np.ndarray,
+    hfi_confidence: np.ndarray,
+    tns_confidence: np.ndarray,
+    policy: Optional[FusionPolicy] = None
+) -> np.ndarray:
+    """
+    Unrounded, clipped trust index only: what the decision thresholds
+    are compared against. Used by offline threshold calibration.
+    """
+    p = policy or get_policy()
+    return _fuse_arrays(aasist_confidence, hfi_confidence, tns_confidence, p)[1]
+
+
+def _fuse_arrays(aasist_confidence, hfi_confidence, tns_confidence, p: FusionPolicy):
+    aasist = np.asarray(aasist_confidence, dtype=np.float64)
+    hfi = np.asarray(hfi_confidence, dtype=np.float64)
+    tns = np.asarray(tns_confidence, dtype=np.float64)
+
+    authenticity_score = p.weight_aasist * aasist + p.weight_hfi * hfi + p.weight_tns * tns
+
+    weak_signals = (
+        (aasist < p.weak_signal_threshold).astype(np.int8) +
+        (hfi < p.weak_signal_threshold).astype(np.int8) +
+        (tns < p.weak_signal_threshold).astype(np.int8)
+    )
+    spread = np.maximum(np.maximum(aasist, hfi), tns) - np.minimum(np.minimum(aasist, hfi), tns)
+
+    one_weak = weak_signals >= 1
+    many_weak = weak_signals >= 2
+    disagreement = spread > p.spread_threshold
+
+    trust_index = authenticity_score.copy()
+    np.subtract(trust_index, p.weak_signal_penalty, out=trust_index, where=one_weak)
+    np.subtract(trust_index, p.multiple_weak_penalty, out=trust_index, where=many_weak)
+    np.subtract(trust_index, p.disagreement_penalty, out=trust_index, where=disagreement)
+    trust_index = np.minimum(1.0, np.maximum(0.0, trust_index))
+
+    return authenticity_score, trust_index, one_weak, many_weak, disagreement
+
+
+def explanation_from_bits(explanation: int, decision: int) -> List[str]:
+    """
+    Rebuild evaluate_fusion's explanation list from a batch result row.
+    """
+    lines = [text for bit, text in EXPLANATION_TEXT.items() if explanation & bit]
+    lines.append(DECISION_TEXT[DECISION_LABELS[decision]])
+    return lines
+
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """
+    Element-wise equivalent of Python's round(x, 3).
+
+    round() rounds the exact decimal value of x; rint(x * 1000) rounds the
+    float product, which can land on the other side of a .5 tie. Those
+    near-tie elements are redone with round() itself.
+    """
+    scaled = values * 1000.0
+    rounded = np.rint(scaled) / 1000.0
+
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(v, 3) for v in values[near_tie].tolist()]
+
+    return rounded
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from app.fusion import fusion_constants as C
+
+logger = logging.getLogger(__name__)
+
+# Numeric parameters, in constructor order
+POLICY_FIELDS = (
+    "weight_aasist",
+    "weight_hfi",
+    "weight_tns",
+    "weak_signal_threshold",
+    "weak_signal_penalty",
+    "multiple_weak_penalty",
+    "spread_threshold",
+    "disagreement_penalty",
+    "authentic_threshold",
+    "synthetic_threshold",
+    "confidence_center",
+    "confidence_scale",
+)
+
+# Every parameter lives in [0, 1] except these
+_UPPER_BOUNDS = {"confidence_scale": 10.0}
+
+
+class FusionPolicy:
+    """
+    Immutable, pre-validated parameter set for the fusion engine.
+
+    Compiled once (from fusion_constants or a JSON file) and shared by
+    evaluate_fusion and evaluate_fusion_batch; the engines read plain
+    attributes and never build dicts per call. Swapping policies replaces
+    the module-level reference, which is atomic, so in-flight calls keep
+    the policy they started with.
+    """
+
+    __slots__ = ("version", "weights") + POLICY_FIELDS
+
+    def __init__(self, version: str, *values: float):
+        if len(values) != len(POLICY_FIELDS):
+            raise TypeError(f"FusionPolicy expects {len(POLICY_FIELDS)} parameters")
+
+        object.__setattr__(self, "version", str(version))
+        for name, value in zip(POLICY_FIELDS, values):
+            value = float(value)
+            if not 0.0 <= value <= _UPPER_BOUNDS.get(name, 1.0):
+                raise ValueError(f"Fusion policy parameter {name}={value} is out of range")
+            object.__setattr__(self, name, value)
+
+        if abs(self.weight_aasist + self.weight_hfi + self.weight_tns - 1.0) > 1e-9:
+            raise ValueError("Fusion policy weights must sum to 1")
+
+        if self.synthetic_threshold >= self.authentic_threshold:
+            raise ValueError("synthetic_threshold must be below authentic_threshold")
+
+        # Shared with every result; callers must treat it as read-only
+        object.__setattr__(self, "weights", {
+            "aasist": self.weight_aasist,
+            "hfi": self.weight_hfi,
+            "tns": self.weight_tns
+        })
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("FusionPolicy is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("FusionPolicy is immutable")
+
+    def __reduce__(self):
+        # Needed to ship the policy to process-pool workers
+        return (FusionPolicy, (self.version,) + tuple(getattr(self, f) for f in POLICY_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"FusionPolicy(version={self.version!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        values: Dict[str, Any] = {"version": self.version}
+        values.update((name, getattr(self, name)) for name in POLICY_FIELDS)
+        return values
+
+    def replace(self, **changes: Any) -> "FusionPolicy":
+        return FusionPolicy.from_dict({**self.to_dict(), **changes})
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "FusionPolicy":
+        unknown = set(values) - set(POLICY_FIELDS) - {"version"}
+        if unknown:
+            raise ValueError(f"Unknown fusion policy keys: {sorted(unknown)}")
+
+        if "version" not in values:
+            raise ValueError("Fusion policy needs a 'version' (it keys cached results)")
+
+        merged = {**DEFAULT_POLICY.to_dict(), **values}
+        return cls(merged["version"], *(merged[name] for name in POLICY_FIELDS))
+
+    @classmethod
+    def from_file(cls, path: str) -> "FusionPolicy":
+        """
+        Load a JSON object of overrides, e.g.
+        {"version": "2025-06-w2", "authentic_threshold": 0.72}
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_constants(cls) -> "FusionPolicy":
+        return cls(
+            C.FUSION_POLICY_VERSION,
+            C.FUSION_WEIGHT_AASIST,
+            C.FUSION_WEIGHT_HFI,
+            C.FUSION_WEIGHT_TNS,
+            C.FUSION_WEAK_SIGNAL_THRESHOLD,
+            C.FUSION_PENALTY_WEAK_SIGNAL,
+            C.FUSION_PENALTY_MULTIPLE_WEAK_SIGNALS,
+            C.FUSION_SPREAD_THRESHOLD,
+            C.FUSION_PENALTY_SIGNAL_DISAGREEMENT,
+            C.FUSION_THRESHOLD_AUTHENTIC,
+            C.FUSION_THRESHOLD_SYNTHETIC,
+            C.FUSION_CONFIDENCE_CENTER,
+            C.FUSION_CONFIDENCE_SCALE,
+        )
+
+
+DEFAULT_POLICY = FusionPolicy.from_constants()
+
+_active_policy = DEFAULT_POLICY
+
+
+def get_policy() -> FusionPolicy:
+    return _active_policy
+
+
+def set_policy(policy: FusionPolicy) -> FusionPolicy:
+    """
+    Atomically make `policy` the active one; returns the previous policy.
+    """
+    global _active_policy
+    previous, _active_policy = _active_policy, policy
+    return previous
+
+
+def reload_policy(path: Optional[str] = None) -> FusionPolicy:
+    """
+    (Re)load the policy from `path` or FUSION_POLICY_PATH, falling back to
+    fusion_constants when neither is set. On a bad file the active policy
+    is left untouched and the error propagates.
+    """
+    path = path or os.getenv("FUSION_POLICY_PATH")
+    policy = FusionPolicy.from_file(path) if path else DEFAULT_POLICY
+
+    previous = set_policy(policy)
+    if previous.version != policy.version:
+        logger.info("Fusion policy %s -> %s", previous.version, policy.version)
+    return policy
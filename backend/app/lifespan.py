@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import signal
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from app.adapters.batcher import create_detector_batcher
+from app.adapters.weights import load_weight_store, set_weight_store
+from app.analysis import ANALYSIS_VERSION, init_worker
+from app.config import get_model_weights_dir, get_model_weights_prefault
+from app.fusion.fusion_policy import reload_policy
+from app.utils.executor import create_analysis_executor
+from app.utils.result_cache import create_result_cache
+from app.utils.tenants import load_tenant_registry, set_tenant_registry
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Shared startup/shutdown for both FastAPI apps.
+    """
+    reload_policy()
+    reload_signal = _install_policy_reload_signal()
+
+    # API keys are read once here, never per request
+    tenants = load_tenant_registry()
+    set_tenant_registry(tenants)
+    logger.info("API keys: %d tenants", len(tenants.tenants))
+
+    # Map detector weights before the analysis workers fork, so every
+    # worker shares the parent's pages
+    weights = load_weight_store(get_model_weights_dir(), get_model_weights_prefault())
+    set_weight_store(weights)
+    app.state.model_weights = weights
+    report = weights.report()
+    logger.info(
+        "Detector weights: %d tensors, %.1f MB mapped, %s resident, loaded in %.1f ms",
+        report["tensors"],
+        report["mapped_bytes"] / 1e6,
+        "n/a" if report["resident_bytes"] is None else f"{report['resident_bytes'] / 1e6:.1f} MB",
+        report["load_ms"]
+    )
+
+    executor = create_analysis_executor(initializer=init_worker)
+    await executor.start()
+    app.state.executor = executor
+    batcher = create_detector_batcher(executor)
+    if batcher is not None:
+        batcher.start()
+    app.state.batcher = batcher
+    app.state.result_cache = create_result_cache(ANALYSIS_VERSION)
+
+    yield
+
+    if batcher is not None:
+        await batcher.stop()
+    await run_in_threadpool(executor.shutdown)
+    app.state.result_cache.close()
+    if reload_signal is not None:
+        asyncio.get_running_loop().remove_signal_handler(reload_signal)
+
+
+def _reload_policy_on_signal() -> None:
+    try:
+        reload_policy()
+    except Exception:
+        logger.exception("Fusion policy reload failed; keeping the active policy")
+
+
+def _install_policy_reload_signal():
+    """
+    SIGHUP re-reads FUSION_POLICY_PATH without a restart. Send it to each
+    worker process (the uvicorn supervisor treats SIGHUP as "restart").
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return None
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload_policy_on_signal)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not the main thread (e.g. under TestClient) or unsupported loop
+        return None
+    return signal.SIGHUP
@@ -0,0 +1,588 @@
+"""
+HTTP load generator for the analyze endpoints.
+
+Usage (from backend/, against a running uvicorn):
+    python -m app.loadtest --endpoint /analyze --concurrency 16 --duration 30
+    python -m app.loadtest --endpoint /v1/voice/analyze --api-key "$VAKYAGUARD_API_KEY" \\
+        --mode open --rate 80 --mix 2:0.6,6@48000:0.3,10:0.1 \\
+        --server-pid "$(pgrep -of uvicorn)" --output run.json
+
+Modes:
+    closed  --concurrency clients, each sending its next request as soon
+            as the previous response arrives (measures capacity)
+    open    requests start on a fixed (or --arrival poisson) schedule of
+            --rate per second regardless of how the server keeps up, over
+            at most --connections keep-alive connections. Latency counts
+            from the scheduled start, so queueing inside the generator is
+            included rather than hidden (no coordinated omission).
+
+Clips are deterministic synthetic speech (sai_audio.synthetic) drawn from
+the --mix of `seconds[@sample_rate]:weight` entries. Every request's
+clip differs in its last samples, so the server's content-addressed
+result cache never answers; pass --cache-hits to send identical clips.
+
+The report covers throughput (overall and per server core), p50/p95/p99
+latency, status counts with error and 429 rates, and a per-second
+timeline with the server's resident memory: summed over --server-pid and
+its descendants (executor workers included) when given, otherwise the
+process_resident_memory_bytes gauge of the worker answering /metrics.
+
+The HTTP/1.1 client is built on asyncio streams only, so the generator
+needs nothing beyond the backend's own dependencies.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import struct
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import app.analysis  # noqa: F401  (puts sai_audio on the path)
+from app.utils.metrics import process_rss_bytes
+from sai_audio.synthetic import synthetic_wav_bytes
+
+MODES = ("closed", "open")
+ARRIVALS = ("constant", "poisson")
+
+DEFAULT_MIX = "3:1"
+DEFAULT_SAMPLE_RATE = 16000
+
+# Status 0 marks a request that got no HTTP response (connect, reset, timeout)
+TRANSPORT_ERROR = 0
+
+# Bytes of each clip overwritten per request to defeat the result cache
+_UNIQUE_TAIL = 8
+
+_BOUNDARY = "loadtest-boundary-7d1f3a"
+
+
+class ClipSpec(NamedTuple):
+    duration_sec: float
+    sample_rate: int
+    weight: float
+
+
+class Sample(NamedTuple):
+    started: float      # scheduled start, seconds since the run began
+    latency: float      # seconds
+    status: int
+
+
+def parse_mix(spec: str, default_sample_rate: int = DEFAULT_SAMPLE_RATE) -> List[ClipSpec]:
+    """
+    Parse "2:0.6,6@48000:0.3" into ClipSpecs; a missing weight means 1.
+    """
+    clips = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        clip, _, weight = part.partition(":")
+        seconds, _, rate = clip.partition("@")
+        clips.append(ClipSpec(
+            float(seconds), int(rate) if rate else default_sample_rate, float(weight or 1)
+        ))
+
+    if not clips or any(c.duration_sec <= 0 or c.sample_rate <= 0 or c.weight < 0 for c in clips):
+        raise ValueError(f"Invalid clip mix: {spec!r}")
+    if sum(c.weight for c in clips) <= 0:
+        raise ValueError("Clip mix weights must not all be zero")
+    return clips
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile (0 < q <= 100) of already sorted values.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+class _Clip:
+    """
+    A multipart request for one synthetic clip, kept as parts so a
+    per-request tail can be swapped in without copying the audio.
+    """
+
+    def __init__(self, spec: ClipSpec, host: str, path: str, api_key: Optional[str]):
+        self.spec = spec
+        wav = synthetic_wav_bytes(spec.sample_rate, spec.duration_sec)
+        filename = f"clip_{spec.duration_sec:g}s_{spec.sample_rate}.wav"
+
+        prefix = (
+            f"--{_BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: audio/wav\r\n\r\n"
+        ).encode("latin-1")
+        suffix = f"\r\n--{_BOUNDARY}--\r\n".encode("latin-1")
+
+        headers = [
+            f"POST {path} HTTP/1.1",
+            f"Host: {host}",
+            f"Content-Type: multipart/form-data; boundary={_BOUNDARY}",
+            f"Content-Length: {len(prefix) + len(wav) + len(suffix)}",
+        ]
+        if api_key:
+            headers.append(f"x-api-key: {api_key}")
+
+        self.head = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + prefix
+        self.audio = memoryview(wav)[:-_UNIQUE_TAIL]
+        self.tail = wav[-_UNIQUE_TAIL:]
+        self.suffix = suffix
+
+    def parts(self, unique_id: Optional[int]) -> Tuple[bytes, memoryview, bytes, bytes]:
+        tail = self.tail if unique_id is None else struct.pack("<Q", unique_id)
+        return self.head, self.audio, tail, self.suffix
+
+
+class _Connection:
+    """
+    One keep-alive HTTP/1.1 connection; reconnects after errors or
+    "Connection: close".
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, parts: Sequence[bytes]) -> Tuple[int, bytes]:
+        try:
+            return await asyncio.wait_for(self._exchange(parts), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _exchange(self, parts: Sequence[bytes]) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        for part in parts:
+            self._writer.write(part)
+        await self._writer.drain()
+
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split(None, 2)[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        else:
+            body = await self._reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body
+
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                # Trailers end with an empty line
+                while await self._reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readexactly(2)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class LoadTest:
+    """
+    One load run against `url` + `path`; run() returns the report dict.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        path: str,
+        mix: Sequence[ClipSpec],
+        mode: str = "closed",
+        concurrency: int = 8,
+        rate: float = 10.0,
+        arrival: str = "constant",
+        connections: Optional[int] = None,
+        duration_sec: float = 10.0,
+        warmup_sec: float = 0.0,
+        timeout_sec: float = 30.0,
+        api_key: Optional[str] = None,
+        cache_hits: bool = False,
+        server_pid: Optional[int] = None,
+        server_cores: Optional[int] = None,
+        sample_interval_sec: float = 1.0,
+        seed: int = 0
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode!r}")
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process: {arrival!r}")
+        if concurrency < 1 or rate <= 0 or duration_sec <= 0:
+            raise ValueError("concurrency, rate and duration must be positive")
+
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError("Only plain http:// URLs are supported")
+
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = path
+        self.mode = mode
+        self.concurrency = concurrency
+        self.rate = rate
+        self.arrival = arrival
+        self.connections = connections or concurrency
+        self.duration_sec = duration_sec
+        self.warmup_sec = warmup_sec
+        self.timeout_sec = timeout_sec
+        self.cache_hits = cache_hits
+        self.server_pid = server_pid
+        self.server_cores = server_cores or os.cpu_count() or 1
+        self.sample_interval_sec = sample_interval_sec
+
+        netloc = parts.netloc
+        self._clips = [_Clip(spec, netloc, path, api_key) for spec in mix]
+        self._weights = [spec.weight for spec in mix]
+        self._random = random.Random(seed)
+
+        self._samples: List[Sample] = []
+        self._rss: List[Tuple[float, Optional[int]]] = []
+        self._dropped = 0
+        self._sent = 0
+        self._t0 = 0.0
+
+    async def run(self) -> Dict[str, Any]:
+        self._t0 = time.perf_counter()
+        sampler = asyncio.get_running_loop().create_task(self._sample_rss())
+        try:
+            if self.mode == "closed":
+                await self._run_closed()
+            else:
+                await self._run_open()
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+        return self.report(time.perf_counter() - self._t0)
+
+    async def _run_closed(self) -> None:
+        deadline = self._t0 + self.duration_sec
+
+        async def client():
+            connection = _Connection(self.host, self.port, self.timeout_sec)
+            try:
+                while time.perf_counter() < deadline:
+                    await self._send(connection, time.perf_counter())
+            finally:
+                connection.close()
+
+        await asyncio.gather(*(client() for _ in range(self.concurrency)))
+
+    async def _run_open(self) -> None:
+        pool: "asyncio.Queue[_Connection]" = asyncio.Queue()
+        for _ in range(self.connections):
+            pool.put_nowait(_Connection(self.host, self.port, self.timeout_sec))
+
+        # Arrivals beyond this many outstanding are dropped, not queued
+        # without bound, and reported
+        max_outstanding = self.connections * 16
+        tasks: "set[asyncio.Task]" = set()
+
+        async def one(scheduled: float):
+            connection = await pool.get()
+            try:
+                await self._send(connection, scheduled)
+            finally:
+                pool.put_nowait(connection)
+
+        loop = asyncio.get_running_loop()
+        scheduled = self._t0
+        try:
+            while True:
+                gap = 1.0 / self.rate
+                if self.arrival == "poisson":
+                    gap = self._random.expovariate(self.rate)
+                scheduled += gap
+                if scheduled >= self._t0 + self.duration_sec:
+                    break
+
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                if len(tasks) >= max_outstanding:
+                    self._dropped += 1
+                    continue
+                task = loop.create_task(one(scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            while not pool.empty():
+                pool.get_nowait().close()
+
+    async def _send(self, connection: _Connection, scheduled: float) -> None:
+        clip = self._random.choices(self._clips, self._weights)[0]
+        self._sent += 1
+        parts = clip.parts(None if self.cache_hits else self._sent)
+
+        try:
+            status, _ = await connection.request(parts)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                asyncio.TimeoutError, ValueError, IndexError):
+            status = TRANSPORT_ERROR
+
+        self._samples.append(Sample(
+            scheduled - self._t0, time.perf_counter() - scheduled, status
+        ))
+
+    async def _sample_rss(self) -> None:
+        while True:
+            self._rss.append((time.perf_counter() - self._t0, await self._server_rss()))
+            await asyncio.sleep(self.sample_interval_sec)
+
+    async def _server_rss(self) -> Optional[int]:
+        if self.server_pid is not None:
+            return process_tree_rss(self.server_pid)
+
+        connection = _Connection(self.host, self.port, self.timeout_sec)
+        request = f"GET /metrics HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1")
+        try:
+            status, body = await connection.request([request])
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            return None
+        finally:
+            connection.close()
+
+        if status != 200:
+            return None
+        for line in body.decode("utf-8", "replace").splitlines():
+            if line.startswith("process_resident_memory_bytes "):
+                return int(float(line.split()[1]))
+        return None
+
+    def report(self, elapsed_sec: float) -> Dict[str, Any]:
+        measured = [s for s in self._samples if s.started >= self.warmup_sec]
+        window = max(1e-9, min(elapsed_sec, self.duration_sec) - self.warmup_sec)
+        latencies = sorted(s.latency for s in measured)
+
+        statuses: Dict[str, int] = {}
+        for s in measured:
+            statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+
+        total = len(measured)
+        ok = sum(1 for s in measured if 200 <= s.status < 300)
+        rate_limited = statuses.get("429", 0)
+        rss_values = [rss for _, rss in self._rss if rss is not None]
+
+        return {
+            "target": f"http://{self.host}:{self.port}{self.path}",
+            "mode": self.mode,
+            "concurrency": self.concurrency if self.mode == "closed" else None,
+            "rate": self.rate if self.mode == "open" else None,
+            "arrival": self.arrival if self.mode == "open" else None,
+            "duration_sec": self.duration_sec,
+            "warmup_sec": self.warmup_sec,
+            "mix": [clip.spec._asdict() for clip in self._clips],
+            "requests": total,
+            "ok": ok,
+            "dropped": self._dropped,
+            "throughput_rps": round(total / window, 3),
+            "ok_throughput_rps": round(ok / window, 3),
+            "server_cores": self.server_cores,
+            "ok_rps_per_core": round(ok / window / self.server_cores, 3),
+            "latency_ms": {
+                name: None if value is None else round(value * 1000.0, 3)
+                for name, value in (
+                    ("p50", percentile(latencies, 50)),
+                    ("p95", percentile(latencies, 95)),
+                    ("p99", percentile(latencies, 99)),
+                    ("max", latencies[-1] if latencies else None),
+                )
+            },
+            "statuses": dict(sorted(statuses.items())),
+            "error_rate": round((total - ok) / total, 4) if total else None,
+            "rate_limited_rate": round(rate_limited / total, 4) if total else None,
+            "server_rss_bytes": {
+                "min": min(rss_values, default=None),
+                "max": max(rss_values, default=None),
+                "last": rss_values[-1] if rss_values else None,
+            },
+            "timeline": self._timeline(),
+        }
+
+    def _timeline(self) -> List[Dict[str, Any]]:
+        step = self.sample_interval_sec
+        buckets: Dict[int, List[Sample]] = {}
+        for s in self._samples:
+            buckets.setdefault(int((s.started + s.latency) // step), []).append(s)
+        rss_by_bucket = {int(t // step): rss for t, rss in self._rss}
+
+        rows = []
+        for i in range(max([*buckets, *rss_by_bucket], default=-1) + 1):
+            done = buckets.get(i, [])
+            latencies = sorted(s.latency for s in done)
+            p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+            rows.append({
+                "t_sec": round(i * step, 3),
+                "completed_rps": round(len(done) / step, 3),
+                "errors": sum(1 for s in done if not 200 <= s.status < 300),
+                "rate_limited": sum(1 for s in done if s.status == 429),
+                "p50_ms": None if p50 is None else round(p50 * 1000.0, 3),
+                "p99_ms": None if p99 is None else round(p99 * 1000.0, 3),
+                "server_rss_bytes": rss_by_bucket.get(i),
+            })
+        return rows
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Summed resident memory of `pid` and all its descendants, from /proc.
+    None when `pid` cannot be read.
+    """
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(f.read().rsplit(b")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = None
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        rss = process_rss_bytes(current)
+        if rss is not None:
+            total = (total or 0) + rss
+        elif current == pid:
+            return None
+        stack.extend(children.get(current, []))
+    return total
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _format_mib(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / (1 << 20):.1f}"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.loadtest",
+        description="Drive an analyze endpoint with synthetic clips and report latency and throughput."
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="server base URL")
+    parser.add_argument("--endpoint", default="/analyze",
+                        help="path to POST to, e.g. /analyze or /v1/voice/analyze")
+    parser.add_argument("--api-key", default=os.getenv("VAKYAGUARD_API_KEY"),
+                        help="x-api-key header value (default: $VAKYAGUARD_API_KEY)")
+    parser.add_argument("--mode", choices=MODES, default="closed")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed-loop clients")
+    parser.add_argument("--rate", type=float, default=10.0, help="open-loop requests per second")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="constant")
+    parser.add_argument("--connections", type=int,
+                        help="open-loop connection pool size (default: --concurrency)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--warmup", type=float, default=0.0,
+                        help="leading seconds left out of the summary")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="clips as seconds[@sample_rate]:weight, comma-separated")
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_SAMPLE_RATE,
+                        help="sample rate of mix entries without @rate")
+    parser.add_argument("--cache-hits", action="store_true",
+                        help="send identical clips instead of cache-busting ones")
+    parser.add_argument("--server-pid", type=int,
+                        help="uvicorn pid whose process tree RSS is sampled")
+    parser.add_argument("--server-cores", type=int,
+                        help="cores available to the server (default: this machine's)")
+    parser.add_argument("--interval", type=float, default=1.0, help="timeline step in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    try:
+        test = LoadTest(
+            args.url,
+            args.endpoint,
+            parse_mix(args.mix, args.sample_rate),
+            mode=args.mode,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            arrival=args.arrival,
+            connections=args.connections,
+            duration_sec=args.duration,
+            warmup_sec=args.warmup,
+            timeout_sec=args.timeout,
+            api_key=args.api_key,
+            cache_hits=args.cache_hits,
+            server_pid=args.server_pid,
+            server_cores=args.server_cores,
+            sample_interval_sec=args.interval,
+            seed=args.seed,
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    report = asyncio.run(test.run())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print("   t   done/s  errors   429   p50 ms   p99 ms  RSS MiB")
+    for row in report["timeline"]:
+        print(f"{row['t_sec']:>4g} {row['completed_rps']:>8.1f} {row['errors']:>7} "
+              f"{row['rate_limited']:>5} {_format_ms(row['p50_ms']):>8} "
+              f"{_format_ms(row['p99_ms']):>8} {_format_mib(row['server_rss_bytes']):>8}")
+
+    latency = report["latency_ms"]
+    rss = report["server_rss_bytes"]
+    print(f"{report['requests']} requests to {report['target']} ({report['mode']} loop), "
+          f"{report['dropped']} dropped")
+    print(f"throughput {report['throughput_rps']:.1f} req/s, "
+          f"{report['ok_throughput_rps']:.1f} ok req/s, "
+          f"{report['ok_rps_per_core']:.2f} ok req/s per core ({report['server_cores']} cores)")
+    print(f"latency p50 {_format_ms(latency['p50'])} ms, p95 {_format_ms(latency['p95'])} ms, "
+          f"p99 {_format_ms(latency['p99'])} ms, max {_format_ms(latency['max'])} ms")
+    print(f"statuses {report['statuses']}, error rate {report['error_rate']}, "
+          f"429 rate {report['rate_limited_rate']}")
+    print(f"server RSS {_format_mib(rss['min'])}-{_format_mib(rss['max'])} MiB, "
+          f"last {_format_mib(rss['last'])} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
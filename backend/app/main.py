@@ -1,13 +1,44 @@
-from fastapi import FastAPI, UploadFile, File, Header, HTTPException
-from app.fusion.fusion_engine import evaluate_fusion
-from app.schemas.voice_response import VoiceAnalysisResponse
-from app.config import get_api_key
+import os
+
+from fastapi import Depends, FastAPI, HTTPException, Request
+from app.analysis import (
+    analysis_error_status,
+    analyze_long_audio_file,
+    analyze_upload,
+    build_voice_response,
+)
+from app.api.admin import router as admin_router
+from app.api.auth import admit_tenant
+from app.api.metrics import router as metrics_router
+from app.api.stream import router as stream_router
+from app.fusion.fusion_policy import get_policy
+from app.lifespan import lifespan
+from app.schemas.voice_response import LongVoiceAnalysisResponse, VoiceAnalysisResponse
+from app.config import (
+    get_long_audio_max_sec,
+    get_long_upload_max_bytes,
+    get_upload_max_bytes,
+    get_upload_max_duration_sec,
+)
+from app.utils.executor import ExecutorSaturated, executor_saturated_handler
+from app.utils.metrics import MetricsMiddleware, observe_analysis, stage_timer
+from app.utils.responses import encode_body, json_response
+from app.utils.result_cache import content_digest
+from app.utils.tenants import Tenant
+from app.utils.uploads import AUDIO_UPLOAD_OPENAPI, receive_audio_upload
+from starlette.concurrency import run_in_threadpool
 
 app = FastAPI(
     title="VakyaGuard API",
     version="1.0.0",
-    description="Voice Authenticity & Provenance Intelligence System"
+    description="Voice Authenticity & Provenance Intelligence System",
+    lifespan=lifespan
 )
+app.add_exception_handler(ExecutorSaturated, executor_saturated_handler)
+app.add_middleware(MetricsMiddleware)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+app.include_router(stream_router)
 
 
 @app.get("/health")
@@ -15,41 +46,91 @@ def health_check():
     return {"status": "ok"}
 
 
-@app.post("/v1/voice/analyze", response_model=VoiceAnalysisResponse)
+@app.post(
+    "/v1/voice/analyze",
+    response_model=VoiceAnalysisResponse,
+    openapi_extra=AUDIO_UPLOAD_OPENAPI
+)
 async def analyze_voice(
-    file: UploadFile = File(...),  # 🔥 THIS IS THE KEY LINE
-    x_api_key: str = Header(..., alias="x-api-key")
+    request: Request,
+    # 🔐 API key and tenant quotas, checked before any of the body is read
+    tenant: Tenant = Depends(admit_tenant)
 ):
-    # 🔐 API key verification
-    if x_api_key != get_api_key():
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
-    # (Temporary mock values)
-    aasist_confidence = 0.90
-    hfi_confidence = 0.87
-    tns_confidence = 0.85
-
-    fusion_result = evaluate_fusion(
-        aasist_confidence=aasist_confidence,
-        hfi_confidence=hfi_confidence,
-        tns_confidence=tns_confidence
+    upload = await receive_audio_upload(
+        request, get_upload_max_bytes(), get_upload_max_duration_sec()
     )
+    content = upload.content
+
+    # One policy for the whole request, even if it is swapped meanwhile
+    policy = get_policy()
+
+    # Replayed clips are answered from the content-addressed cache
+    cache = request.app.state.result_cache
+    with stage_timer("cache"):
+        digest = await run_in_threadpool(content_digest, content)
+        cache_key = cache.key("voice", digest, policy.version)
+        cached = await cache.get_async(cache_key)
+    if cached is not None:
+        return json_response(cached)
+
+    # Preprocessing + scoring run in the analysis executor, never on the loop
+    analysis = await analyze_upload(
+        request.app.state.executor, request.app.state.batcher, content, policy
+    )
+    observe_analysis(analysis)
+    if not analysis["is_valid"]:
+        raise HTTPException(status_code=analysis_error_status(analysis), detail=analysis["error"])
+
+    # Encoded once; the cache keeps the bytes for replays
+    body = encode_body(build_voice_response(analysis), VoiceAnalysisResponse)
+    await cache.put_async(cache_key, body)
+    return json_response(body)
+
+
+@app.post(
+    "/v1/voice/analyze-long",
+    response_model=LongVoiceAnalysisResponse,
+    openapi_extra=AUDIO_UPLOAD_OPENAPI
+)
+async def analyze_voice_long(
+    request: Request,
+    tenant: Tenant = Depends(admit_tenant)
+):
+    """
+    Sliding-window analysis for recordings longer than the 10 s clip
+    limit: one verdict plus a per-window timeline.
+    """
+    policy = get_policy()
+    max_duration_sec = get_long_audio_max_sec()
+
+    # The upload goes to disk so the worker can read it block by block;
+    # its length is capped by max_duration_sec, not rejected
+    upload = await receive_audio_upload(request, get_long_upload_max_bytes(), spool=True)
+    path, digest = upload.path, upload.digest
+    try:
+        cache = request.app.state.result_cache
+        with stage_timer("cache"):
+            cache_key = cache.key("voice-long", digest, f"{policy.version}:{max_duration_sec}")
+            cached = await cache.get_async(cache_key)
+        if cached is not None:
+            return json_response(cached)
+
+        analysis = await request.app.state.executor.run(
+            analyze_long_audio_file, path, policy, max_duration_sec
+        )
+    finally:
+        os.unlink(path)
+
+    observe_analysis(analysis)
+
+    if not analysis["is_valid"]:
+        raise HTTPException(status_code=analysis_error_status(analysis), detail=analysis["error"])
 
-    return {
-        "decision": fusion_result["decision"],
-        "scores": {
-            "authenticity_score": fusion_result["authenticity_score"],
-            "trust_index": fusion_result["trust_index"],
-            "confidence": fusion_result["confidence"]
-        },
-        "provenance": {
-            "human_probability": fusion_result["trust_index"],
-            "synthetic_probability": round(1 - fusion_result["trust_index"], 3)
-        },
-        "signals": {
-            "aasist": {"confidence": aasist_confidence, "weight": 0.40},
-            "hfi": {"confidence": hfi_confidence, "weight": 0.35},
-            "tns": {"confidence": tns_confidence, "weight": 0.25}
-        },
-        "explanation": "Mock response (model not yet connected)"
-    }
+    body = encode_body({
+        **build_voice_response(analysis),
+        "duration_sec": analysis["duration_sec"],
+        "warnings": analysis["warnings"],
+        "timeline": analysis["timeline"]
+    }, LongVoiceAnalysisResponse)
+    await cache.put_async(cache_key, body)
+    return json_response(body)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import Dict, List, Literal, Optional
 
 
 class SignalContribution(BaseModel):
@@ -24,9 +24,29 @@ class SignalsBlock(BaseModel):
     tns: SignalContribution
 
 
+class TechnicalDetails(BaseModel):
+    # Wall time per detector, plus "features" for the shared feature step
+    detector_latency_ms: Dict[str, float]
+
+
 class VoiceAnalysisResponse(BaseModel):
     decision: Literal["AUTHENTIC", "SYNTHETIC", "UNCERTAIN"]
     scores: ScoreBlock
     provenance: ProvenanceBlock
     signals: SignalsBlock
     explanation: str
+    technical_details: Optional[TechnicalDetails] = None
+
+
+class TimelineSegment(BaseModel):
+    start_sec: float
+    end_sec: float
+    speech_sec: float
+    decision: Optional[Literal["AUTHENTIC", "SYNTHETIC", "UNCERTAIN"]] = None
+    trust_index: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+
+class LongVoiceAnalysisResponse(VoiceAnalysisResponse):
+    duration_sec: float
+    warnings: List[str]
+    timeline: List[TimelineSegment]
@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.config import (
+    get_analysis_executor_kind,
+    get_analysis_queue_size,
+    get_analysis_retry_after,
+    get_analysis_workers,
+)
+
+
+# Pool jobs started under the current admission() (see run_admitted)
+_admitted_jobs: "contextvars.ContextVar[Optional[List[Future]]]" = contextvars.ContextVar(
+    "admitted_jobs", default=None
+)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Analysis capacity exhausted")
+        self.retry_after = retry_after
+
+
+class AnalysisExecutor:
+    """
+    Runs CPU-bound analysis jobs off the event loop.
+
+    At most `workers + queue_size` jobs are admitted at a time; anything
+    beyond that is refused immediately with ExecutorSaturated instead of
+    queueing without bound. A request's slot is held until its pool jobs
+    are done, even if the request is cancelled first (a client disconnect
+    does not stop a job that is already running). Admission is only
+    touched from the event loop thread, so the counter needs no lock.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        workers: int,
+        queue_size: int,
+        retry_after: int,
+        initializer: Optional[Callable[[], None]] = None
+    ):
+        self.kind = kind
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.retry_after = retry_after
+        self.pending = 0
+        self._initializer = initializer
+        self._pool = self._create_pool()
+
+    def _create_pool(self) -> Executor:
+        if self.kind == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="analysis"
+            )
+
+        # fork lets workers inherit everything loaded before the pool starts
+        mp_context = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("fork")
+
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=self._initializer
+        )
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.capacity
+
+    @contextmanager
+    def admission(self) -> Iterator[None]:
+        """
+        Hold one admission slot for a request that runs several jobs
+        (see run_admitted), refusing it if the executor is saturated.
+        """
+        if self.saturated:
+            raise ExecutorSaturated(self.retry_after)
+
+        self.pending += 1
+        jobs: List[Future] = []
+        token = _admitted_jobs.set(jobs)
+        try:
+            yield
+        finally:
+            _admitted_jobs.reset(token)
+            self._release_after([job for job in jobs if not job.done()])
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self.admission():
+            return await self.run_admitted(fn, *args)
+
+    async def run_admitted(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a job without an admission check, for work already admitted
+        through admission() or batched on behalf of admitted requests.
+        """
+        job = self._pool.submit(fn, *args)
+        jobs = _admitted_jobs.get()
+        if jobs is not None:
+            jobs.append(job)
+        return await asyncio.wrap_future(job)
+
+    def _release_after(self, jobs: List[Future]) -> None:
+        """
+        Give back one admission slot now, or once `jobs` (still queued or
+        running in the pool) are all done.
+        """
+        if not jobs:
+            self.pending -= 1
+            return
+
+        loop = asyncio.get_running_loop()
+        remaining = [len(jobs)]
+
+        def job_done() -> None:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                self.pending -= 1
+
+        def on_done(_: Future) -> None:
+            # Called on a pool thread (or here, if already cancelled)
+            try:
+                loop.call_soon_threadsafe(job_done)
+            except RuntimeError:
+                pass  # the loop is closed; nothing left to admit
+
+        for job in jobs:
+            job.add_done_callback(on_done)
+
+    async def start(self) -> None:
+        """
+        Bring workers up before the first request. Process workers run the
+        initializer as they spawn; a thread pool shares one interpreter, so
+        the initializer runs once.
+        """
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            if self._initializer is not None:
+                await loop.run_in_executor(self._pool, self._initializer)
+            return
+
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _noop) for _ in range(self.workers)
+        ))
+
+    def shutdown(self) -> None:
+        """
+        Cancel queued jobs and wait for running ones; blocking, so async
+        callers run it in the thread pool.
+        """
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _noop() -> None:
+    return None
+
+
+def create_analysis_executor(
+    initializer: Optional[Callable[[], None]] = None
+) -> AnalysisExecutor:
+    """
+    Build the executor from ANALYSIS_EXECUTOR / ANALYSIS_WORKERS /
+    ANALYSIS_QUEUE_SIZE / ANALYSIS_RETRY_AFTER_SEC.
+    """
+    return AnalysisExecutor(
+        kind=get_analysis_executor_kind(),
+        workers=get_analysis_workers(),
+        queue_size=get_analysis_queue_size(),
+        retry_after=get_analysis_retry_after(),
+        initializer=initializer
+    )
+
+
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Analysis capacity exhausted, retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
@@ -0,0 +1,347 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Each uvicorn worker keeps its own counters and histograms; analysis
+executor workers report stage timings back in their result dicts (the
+"timings" key) so everything is recorded in the server process.
+
+Request-scoped stage timings live in a context variable set by
+MetricsMiddleware: handlers call stage_timer()/record_stages(), and the
+middleware adds the time from the last stage to the response start as
+"serialize" and, when enabled, a Server-Timing header.
+"""
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from app.config import get_server_timing_enabled
+
+# Seconds; spans sub-millisecond stages up to whole long-audio requests
+LATENCY_BUCKETS_SEC = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+
+# Reject reasons by response status
+REJECT_REASONS = {
+    400: "bad_request",
+    401: "unauthorized",
+    413: "too_large",
+    422: "invalid_audio",
+    429: "rate_limited",
+    503: "unavailable",
+}
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with Prometheus semantics: a value lands in
+    the first bucket whose upper bound is >= the value, and snapshot()
+    reports cumulative counts per bound plus a "+Inf" total.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(sorted(bounds))
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        slot = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[slot] += 1
+            self._sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate, interpolating linearly inside the bucket like PromQL's
+        histogram_quantile. None before the first observation.
+        """
+        with self._lock:
+            counts = list(self._counts)
+        total = sum(counts)
+        if total == 0:
+            return None
+
+        rank = q * total
+        running = 0
+        for i, count in enumerate(counts[:-1]):
+            if count and running + count >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - running) / count
+            running += count
+        return self.bounds[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        buckets = {}
+        running = 0
+        for bound, count in zip(self.bounds, counts):
+            running += count
+            buckets[f"{bound:g}"] = running
+        buckets["+Inf"] = running + counts[-1]
+
+        snapshot: Dict[str, Any] = {
+            "buckets": buckets, "count": buckets["+Inf"], "sum": round(total, 6)
+        }
+        for q in (0.5, 0.95, 0.99):
+            estimate = self.quantile(q)
+            snapshot[f"p{round(q * 100)}"] = None if estimate is None else round(estimate, 6)
+        return snapshot
+
+
+class Counter:
+    """
+    Monotonic counter, optionally split by label values.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = _header(self.name, self.documentation, "counter")
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_labels(zip(self.label_names, label_values))} {value:g}")
+        return lines
+
+
+class HistogramFamily:
+    """
+    One Histogram per combination of label values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        bounds: Sequence[float],
+        label_names: Sequence[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.bounds = tuple(bounds)
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *label_values: str) -> Histogram:
+        child = self._children.get(label_values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(label_values, Histogram(self.bounds))
+        return child
+
+    def observe(self, value: float, *label_values: str) -> None:
+        self.labels(*label_values).observe(value)
+
+    def render(self) -> List[str]:
+        lines = _header(self.name, self.documentation, "histogram")
+        for label_values, child in sorted(self._children.items()):
+            lines.extend(render_histogram(
+                self.name, child, dict(zip(self.label_names, label_values))
+            ))
+        return lines
+
+
+STAGE_SECONDS = HistogramFamily(
+    "analysis_stage_seconds",
+    "Time spent per request stage",
+    LATENCY_BUCKETS_SEC,
+    ("stage",)
+)
+REQUEST_SECONDS = HistogramFamily(
+    "http_request_duration_seconds",
+    "Time to the response start, per route and status",
+    LATENCY_BUCKETS_SEC,
+    ("route", "status")
+)
+BYTES_IN = Counter("http_request_bytes_total", "Request body bytes received")
+AUDIO_SECONDS = Counter("analysis_audio_seconds_total", "Seconds of audio analyzed")
+REJECTS = Counter("analysis_rejects_total", "Requests refused, by reason", ("reason",))
+TENANT_REJECTS = Counter(
+    "tenant_rejects_total", "Requests refused by tenant quotas", ("tenant", "reason")
+)
+
+METRICS = (STAGE_SECONDS, REQUEST_SECONDS, BYTES_IN, AUDIO_SECONDS, REJECTS, TENANT_REJECTS)
+
+
+class RequestTimings:
+    """
+    Stage durations (ms) of one request, in the order they were recorded.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last_mark: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, ms: float) -> None:
+        self.stages[stage] = round(self.stages.get(stage, 0.0) + ms, 3)
+        self.last_mark = time.perf_counter()
+
+
+_request_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def record_stages(timings: Mapping[str, float]) -> None:
+    """
+    Record stage durations in milliseconds, e.g. a pipeline result's
+    "timings", in the histograms and the current request's timings.
+    """
+    current = _request_timings.get()
+    for stage, ms in timings.items():
+        STAGE_SECONDS.observe(ms / 1000.0, stage)
+        if current is not None:
+            current.add(stage, ms)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stages({stage: (time.perf_counter() - started) * 1000.0})
+
+
+def observe_analysis(analysis: Dict[str, Any]) -> None:
+    """
+    Record an analysis result's stage timings and, when valid, its audio
+    seconds.
+    """
+    record_stages(analysis.get("timings", {}))
+    if analysis.get("is_valid"):
+        AUDIO_SECONDS.inc(analysis["duration_sec"])
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: counts request bytes, times each request to its
+    response start, counts refusals by reason and, with SERVER_TIMING=1,
+    adds a Server-Timing header listing the request's stages.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                BYTES_IN.inc(len(message.get("body", b"")))
+            return message
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                self._finish(scope, message, timings)
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, timed_send)
+        finally:
+            _request_timings.reset(token)
+
+    def _finish(self, scope, message, timings: RequestTimings) -> None:
+        now = time.perf_counter()
+        if timings.last_mark is not None:
+            record_stages({"serialize": (now - timings.last_mark) * 1000.0})
+            timings.last_mark = None
+
+        status = message["status"]
+        route = scope.get("route")
+        REQUEST_SECONDS.observe(
+            now - timings.started,
+            getattr(route, "path", "unmatched"),
+            str(status)
+        )
+        if status in REJECT_REASONS:
+            REJECTS.inc(1.0, REJECT_REASONS[status])
+
+        if get_server_timing_enabled():
+            entries = [f"{stage};dur={ms:.3f}" for stage, ms in timings.stages.items()]
+            entries.append(f"total;dur={(now - timings.started) * 1000.0:.3f}")
+            message.setdefault("headers", [])
+            message["headers"] = list(message["headers"]) + [
+                (b"server-timing", ", ".join(entries).encode("latin-1"))
+            ]
+
+
+def process_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """
+    Resident set size of `pid` (default: this process) from /proc, or None
+    where /proc is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def render_histogram(name: str, histogram: Histogram, labels: Dict[str, str]) -> List[str]:
+    snapshot = histogram.snapshot()
+    lines = [
+        f"{name}_bucket{_labels([*labels.items(), ('le', bound)])} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(labels.items())} {snapshot['sum']:g}")
+    lines.append(f"{name}_count{_labels(labels.items())} {snapshot['count']}")
+    return lines
+
+
+def render_metrics(extra: Sequence[str] = ()) -> str:
+    """
+    Prometheus text exposition of every registered metric plus `extra`
+    pre-rendered lines.
+    """
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
+
+
+def gauge_lines(name: str, documentation: str, value: float, kind: str = "gauge") -> List[str]:
+    return _header(name, documentation, kind) + [f"{name} {value:g}"]
+
+
+def _header(name: str, documentation: str, kind: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+def _labels(pairs) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
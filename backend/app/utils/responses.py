@@ -0,0 +1,80 @@
+"""
+JSON responses without FastAPI's response_model round trip.
+
+Handlers build response bodies as plain dicts, encode them once with
+encode_body() and return json_response(). A returned Response skips
+FastAPI's response_model validation and jsonable_encoder pass; the models
+stay on the routes for the OpenAPI schema. Bodies are encoded by orjson
+when it is installed and by the stdlib json module otherwise.
+
+RESPONSE_VALIDATION=1 is a debug mode that first validates each body
+against its model, through a TypeAdapter compiled once per model.
+
+The result cache stores encoded bodies, so cache hits are answered with
+the stored bytes as they are.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.config import get_response_validation_enabled
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is the fallback
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+JSONBody = Union[bytes, Dict[str, Any]]
+
+
+def dumps(body: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, byte-for-byte what starlette's JSONResponse
+    renders for the same plain data (NumPy scalars are accepted too).
+    """
+    if orjson is not None:
+        return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        body,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_numpy_default,
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def encode_body(body: Dict[str, Any], model: Optional[Any] = None) -> bytes:
+    """
+    Encode a response body, validating it against `model` first when
+    RESPONSE_VALIDATION is on.
+    """
+    if model is not None and get_response_validation_enabled():
+        get_type_adapter(model).validate_python(body)
+    return dumps(body)
+
+
+def json_response(body: JSONBody, status_code: int = 200) -> Response:
+    """
+    Response for an encoded body, or a dict (e.g. a cache entry written
+    before bodies were cached encoded).
+    """
+    if not isinstance(body, (bytes, bytearray)):
+        body = dumps(body)
+    return Response(content=bytes(body), status_code=status_code, media_type=JSON_MEDIA_TYPE)
+
+
+def _numpy_default(value: Any) -> Any:
+    # NumPy scalars and arrays (orjson handles these natively)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_int_env
+
+# Encoded JSON response bodies (what the endpoints store), or plain dicts
+CachedValue = Union[bytes, Dict[str, Any]]
+
+
+def content_digest(data: bytes) -> str:
+    """BLAKE2b-256 of the uploaded bytes."""
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of analysis responses.
+
+    Keys combine a namespace (one per endpoint), the analysis version, an
+    optional variant (the fusion policy version) and the BLAKE2b digest of
+    the upload, so bumping either version makes older entries unreachable.
+
+    Entries live in an in-memory LRU bounded by `max_entries` (0 turns it
+    off) and `ttl_sec`. With `sqlite_path` set, they are also written to a
+    SQLite file (WAL mode) that survives restarts and is shared by all
+    uvicorn workers on the host; memory misses fall through to it. Every
+    PURGE_INTERVAL_SEC a write also deletes expired rows and the oldest
+    rows beyond `sqlite_max_rows`. Bytes values are stored as they are, so
+    a hit costs no decoding or re-encoding.
+
+    Request handlers use get_async/put_async: memory lookups stay on the
+    event loop, SQLite queries (which may wait on another worker's lock)
+    run in the thread pool. The memory and SQLite tiers have separate
+    locks, so a slow query never holds up a memory hit.
+    """
+
+    PURGE_INTERVAL_SEC = 60.0
+
+    def __init__(
+        self,
+        version: str,
+        max_entries: int = 1024,
+        ttl_sec: float = 3600.0,
+        sqlite_path: Optional[str] = None,
+        sqlite_max_rows: int = 100_000
+    ):
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.sqlite_max_rows = sqlite_max_rows
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[str, Tuple[float, CachedValue]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._next_purge = 0.0
+        if sqlite_path:
+            self._db = self._open_db(sqlite_path)
+            self._next_purge = time.time() + self.PURGE_INTERVAL_SEC
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self._db is not None
+
+    def key(self, namespace: str, digest: str, variant: str = "") -> str:
+        return f"{namespace}:{self.version}:{variant}:{digest}"
+
+    def get(self, key: str) -> Optional[CachedValue]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is None and self._db is not None:
+            value = self._db_get(key, now)
+        return self._count(value)
+
+    def put(self, key: str, value: CachedValue) -> None:
+        entry = (time.time() + self.ttl_sec, value)
+        self._remember(key, entry)
+        if self._db is not None:
+            self._db_put(key, entry)
+
+    async def get_async(self, key: str) -> Optional[CachedValue]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is None and self._db is not None:
+            value = await run_in_threadpool(self._db_get, key, now)
+        return self._count(value)
+
+    async def put_async(self, key: str, value: CachedValue) -> None:
+        entry = (time.time() + self.ttl_sec, value)
+        self._remember(key, entry)
+        if self._db is not None:
+            await run_in_threadpool(self._db_put, key, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "persistent": self._db is not None
+            }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _memory_get(self, key: str, now: float) -> Optional[CachedValue]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _count(self, value: Optional[CachedValue]) -> Optional[CachedValue]:
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _remember(self, key: str, entry: Tuple[float, CachedValue]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ---------------------------------------------------------------
+    # SQLite tier
+    # ---------------------------------------------------------------
+    @staticmethod
+    def _open_db(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+        db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+        return db
+
+    def _db_get(self, key: str, now: float) -> Optional[CachedValue]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at = row
+        # BLOBs are encoded bodies; TEXT is a JSON-encoded dict
+        if not isinstance(value, bytes):
+            value = json.loads(value)
+        self._remember(key, (expires_at, value))
+        return value
+
+    def _db_put(self, key: str, entry: Tuple[float, CachedValue]) -> None:
+        expires_at, value = entry
+        now = time.time()
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value if isinstance(value, bytes) else json.dumps(value), expires_at)
+            )
+            if now >= self._next_purge:
+                self._next_purge = now + self.PURGE_INTERVAL_SEC
+                self._purge(now)
+
+    def _purge(self, now: float) -> None:
+        # Expired rows, then the soonest-expiring (oldest) rows over the cap
+        self._db.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (max(0, self.sqlite_max_rows),)
+        )
+
+
+def create_result_cache(version: str) -> ResultCache:
+    """
+    Build the cache from RESULT_CACHE_MAX_ENTRIES (0 turns the memory
+    tier off), RESULT_CACHE_TTL_SEC, RESULT_CACHE_SQLITE_PATH and
+    RESULT_CACHE_SQLITE_MAX_ROWS.
+    """
+    return ResultCache(
+        version=version,
+        max_entries=max(0, get_int_env("RESULT_CACHE_MAX_ENTRIES", 1024)),
+        ttl_sec=max(1, get_int_env("RESULT_CACHE_TTL_SEC", 3600)),
+        sqlite_path=os.getenv("RESULT_CACHE_SQLITE_PATH") or None,
+        sqlite_max_rows=max(1, get_int_env("RESULT_CACHE_SQLITE_MAX_ROWS", 100_000))
+    )
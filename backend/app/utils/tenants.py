@@ -0,0 +1,243 @@
+"""
+API keys, tenants and per-tenant admission limits.
+
+The registry is loaded once at startup (see lifespan) from API_KEYS_PATH,
+a JSON file of tenants:
+
+    {
+      "tenants": {
+        "acme":   {"keys": ["..."], "rate_per_sec": 5, "burst": 10, "max_in_flight": 4},
+        "globex": {"key_sha256": ["<hex digest>"], "max_in_flight": 2},
+        "ops":    {"keys": ["..."], "admin": true}
+      }
+    }
+
+or, without a file, from VAKYAGUARD_API_KEY as the single "default"
+tenant. Limits a tenant leaves out come from TENANT_RATE_PER_SEC,
+TENANT_BURST and TENANT_MAX_IN_FLIGHT; 0 means unlimited.
+
+Only admin tenants may call /v1/admin: those marked "admin": true in the
+file, or the single tenant of VAKYAGUARD_API_KEY.
+
+Keys are looked up by their SHA-256 digest and confirmed with
+hmac.compare_digest, so the time taken never depends on how much of a
+presented key matches a real one.
+"""
+import hashlib
+import hmac
+import json
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.config import (
+    get_api_key,
+    get_api_keys_path,
+    get_tenant_burst,
+    get_tenant_max_in_flight,
+    get_tenant_rate_per_sec,
+)
+
+DEFAULT_TENANT = "default"
+
+# Digest bytes used to file keys; the rest is only ever compared in
+# constant time
+_PREFIX_BYTES = 4
+
+
+class Rejection(NamedTuple):
+    reason: str          # "rate_limited" or "too_many_in_flight"
+    retry_after: int     # whole seconds, for the Retry-After header
+
+
+class TokenBucket:
+    """
+    `rate_per_sec` tokens refill continuously up to `burst`; each request
+    takes one.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """
+        Take a token: 0.0 on success, otherwise the seconds until one is
+        available (nothing is taken).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_sec)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate_per_sec
+
+
+class Tenant:
+    """
+    One customer: a request-rate bucket and a cap on analyses in flight.
+    Admin tenants may also use the /v1/admin endpoints.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_sec: float = 0.0,
+        burst: Optional[float] = None,
+        max_in_flight: int = 0,
+        admin: bool = False
+    ):
+        if rate_per_sec < 0 or max_in_flight < 0 or (burst is not None and burst < 1):
+            raise ValueError(f"Tenant {name!r} has invalid limits")
+
+        self.name = name
+        self.rate_per_sec = float(rate_per_sec)
+        self.burst = float(burst if burst is not None else max(1.0, self.rate_per_sec))
+        self.max_in_flight = int(max_in_flight)
+        self.admin = bool(admin)
+        self.in_flight = 0
+        self._bucket = TokenBucket(self.rate_per_sec, self.burst) if self.rate_per_sec else None
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> Optional[Rejection]:
+        """
+        Admit one request (call release() when it is done), or say why not.
+        A request refused for concurrency does not use up a token.
+        """
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return Rejection("too_many_in_flight", 1)
+
+            if self._bucket is not None:
+                wait = self._bucket.take()
+                if wait > 0:
+                    return Rejection("rate_limited", max(1, math.ceil(wait)))
+
+            self.in_flight += 1
+            return None
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate_per_sec": self.rate_per_sec,
+            "burst": self.burst,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+        }
+
+
+class TenantRegistry:
+    """
+    Maps API keys (by SHA-256 digest) to tenants. Keys are filed under a
+    short digest prefix and the full digest is compared in constant time.
+    """
+
+    def __init__(self, tenants: Iterable[Tenant] = (), key_digests: Optional[Dict[bytes, str]] = None):
+        self.tenants = {tenant.name: tenant for tenant in tenants}
+        self._by_prefix: Dict[bytes, List[Tuple[bytes, str]]] = {}
+        for digest, name in (key_digests or {}).items():
+            if name not in self.tenants:
+                raise ValueError(f"Key refers to unknown tenant {name!r}")
+            self._by_prefix.setdefault(digest[:_PREFIX_BYTES], []).append((digest, name))
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._by_prefix)
+
+    def authenticate(self, api_key: Optional[str]) -> Optional[Tenant]:
+        if not api_key:
+            return None
+        digest = key_digest(api_key)
+        for stored, name in self._by_prefix.get(digest[:_PREFIX_BYTES], ()):
+            if hmac.compare_digest(stored, digest):
+                return self.tenants[name]
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: tenant.stats() for name, tenant in self.tenants.items()}
+
+
+def key_digest(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode("utf-8")).digest()
+
+
+def load_tenant_registry(path: Optional[str] = None) -> TenantRegistry:
+    """
+    Build the registry from API_KEYS_PATH (or `path`), else from
+    VAKYAGUARD_API_KEY. With neither set the registry is empty and every
+    key is refused.
+    """
+    path = path or get_api_keys_path()
+    defaults = {
+        "rate_per_sec": get_tenant_rate_per_sec(),
+        "burst": get_tenant_burst(),
+        "max_in_flight": get_tenant_max_in_flight(),
+    }
+
+    if not path:
+        try:
+            api_key = get_api_key()
+        except RuntimeError:
+            return TenantRegistry()
+        tenant = _tenant(DEFAULT_TENANT, {"admin": True}, defaults)
+        return TenantRegistry([tenant], {key_digest(api_key): tenant.name})
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("tenants"), dict):
+        raise ValueError("API key file must be an object with a \"tenants\" object")
+
+    tenants = []
+    digests: Dict[bytes, str] = {}
+    for name, spec in data["tenants"].items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"Tenant {name!r} must be an object")
+        tenants.append(_tenant(name, spec, defaults))
+
+        for digest in [key_digest(key) for key in spec.get("keys", [])] + [
+            bytes.fromhex(hex_digest) for hex_digest in spec.get("key_sha256", [])
+        ]:
+            if digests.setdefault(digest, name) != name:
+                raise ValueError(f"API key shared by tenants {digests[digest]!r} and {name!r}")
+
+    return TenantRegistry(tenants, digests)
+
+
+def _tenant(name: str, spec: Dict[str, Any], defaults: Dict[str, Any]) -> Tenant:
+    rate = float(spec.get("rate_per_sec", defaults["rate_per_sec"]))
+    burst = spec.get("burst", defaults["burst"] or None)
+    return Tenant(
+        name,
+        rate_per_sec=rate,
+        burst=None if burst is None else float(burst),
+        max_in_flight=int(spec.get("max_in_flight", defaults["max_in_flight"])),
+        admin=spec.get("admin", False) is True,
+    )
+
+
+_registry: Optional[TenantRegistry] = None
+
+
+def get_tenant_registry() -> TenantRegistry:
+    """
+    The process-wide registry; loaded on first use if the server did not
+    load it at startup.
+    """
+    global _registry
+    if _registry is None:
+        _registry = load_tenant_registry()
+    return _registry
+
+
+def set_tenant_registry(registry: TenantRegistry) -> None:
+    global _registry
+    _registry = registry
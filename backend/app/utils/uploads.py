@@ -0,0 +1,293 @@
+import hashlib
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.metrics import record_stages
+from sai_audio.load_audio import HEADER_PROBE_BYTES, AudioInfo, probe_audio_header
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# Bytes written per step when spooling an upload to disk
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Multipart framing (boundaries, part headers, small form fields) allowed
+# on top of the file's own byte cap
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+# Request body of the upload endpoints, which read it themselves
+AUDIO_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+class ReceivedUpload(NamedTuple):
+    filename: Optional[str]
+    content_type: Optional[str]
+    size: int
+    info: AudioInfo                 # from the header probe
+    content: Optional[bytearray]    # in-memory uploads
+    path: Optional[str]             # spooled uploads; the caller deletes the file
+    digest: Optional[str]           # spooled uploads, same as content_digest
+
+
+async def receive_audio_upload(
+    request: Request,
+    max_bytes: int,
+    max_duration_sec: Optional[float] = None,
+    spool: bool = False,
+    field: str = "file",
+    content_type_prefix: Optional[str] = None
+) -> ReceivedUpload:
+    """
+    Read the audio file part of a multipart/form-data request chunk by
+    chunk, rejecting it as early as possible:
+
+    - a Content-Length beyond the byte cap fails before any body is read;
+    - the body stops being read once the file passes `max_bytes`;
+    - the container header is probed from the first HEADER_PROBE_BYTES of
+      the file, so unsupported formats, unusable headers and files longer
+      than `max_duration_sec` fail while the rest is still in flight.
+
+    Handlers take the Request instead of an UploadFile parameter because
+    FastAPI reads the whole body before calling the handler. The file is
+    kept in memory, or with spool=True written to a temporary file and
+    hashed on the way. Other form fields are ignored.
+
+    Raises:
+        HTTPException 400 (not a multipart upload or wrong file type),
+        413 (too large) or 422 (missing file or rejected audio header)
+    """
+    started = time.perf_counter()
+    too_large = HTTPException(
+        status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit"
+    )
+    body_cap = max_bytes + MULTIPART_OVERHEAD_BYTES
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+        if declared > body_cap:
+            raise too_large
+
+    media_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if media_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    part = _FilePart(field)
+    parser = MultipartParser(boundary, part.callbacks())
+    sink = _SpoolSink() if spool else _MemorySink()
+    head = bytearray()
+    info: Optional[AudioInfo] = None
+    received = 0
+
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_cap:
+                raise too_large
+            try:
+                parser.write(chunk)
+            except MultipartParseError:
+                raise HTTPException(status_code=400, detail="Malformed multipart body")
+
+            if part.headers_done and content_type_prefix is not None:
+                if not (part.content_type or "").startswith(content_type_prefix):
+                    raise HTTPException(
+                        status_code=400, detail="Invalid file type. Audio expected."
+                    )
+
+            for data in part.take_data():
+                if sink.size + len(data) > max_bytes:
+                    raise too_large
+                if len(head) < HEADER_PROBE_BYTES:
+                    head += data[:HEADER_PROBE_BYTES - len(head)]
+                await sink.write(data)
+
+            if info is None and (len(head) >= HEADER_PROBE_BYTES or part.done):
+                info = await _probe_header(bytes(head), max_duration_sec)
+
+        parser.finalize()
+        if not part.done:
+            raise HTTPException(status_code=422, detail=f"Missing upload field '{field}'")
+        if info is None:
+            info = await _probe_header(bytes(head), max_duration_sec)
+
+        digest = await sink.finish()
+    except BaseException:
+        sink.discard()
+        raise
+
+    record_stages({"upload": (time.perf_counter() - started) * 1000.0})
+    return ReceivedUpload(
+        filename=part.filename,
+        content_type=part.content_type,
+        size=sink.size,
+        info=info,
+        content=getattr(sink, "content", None),
+        path=getattr(sink, "path", None),
+        digest=digest
+    )
+
+
+async def _probe_header(head: bytes, max_duration_sec: Optional[float]) -> AudioInfo:
+    info, err = await run_in_threadpool(probe_audio_header, head)
+    if err is not None:
+        raise HTTPException(status_code=422, detail=err)
+    if max_duration_sec is not None and info.duration_sec > max_duration_sec:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Audio exceeds the maximum duration of {max_duration_sec:g} seconds"
+        )
+    return info
+
+
+class _FilePart:
+    """
+    python-multipart callbacks that pick out the first part named `field`
+    carrying a filename and queue its data for the reader.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.headers_done = False
+        self.done = False
+
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._active = False
+        self._data: List[bytes] = []
+
+    def callbacks(self) -> Dict[str, Callable]:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def take_data(self) -> List[bytes]:
+        data, self._data = self._data, []
+        return data
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = params.get(b"name", b"").decode("latin-1")
+        if self.headers_done or name != self.field or b"filename" not in params:
+            return
+
+        self._active = True
+        self.headers_done = True
+        self.filename = params[b"filename"].decode("utf-8", "replace")
+        content_type = self._headers.get(b"content-type")
+        self.content_type = content_type.decode("latin-1") if content_type else None
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._active:
+            self._data.append(bytes(data[start:end]))
+
+    def _on_part_end(self) -> None:
+        if self._active:
+            self._active = False
+            self.done = True
+
+
+class _MemorySink:
+    def __init__(self):
+        self.content = bytearray()
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    async def write(self, data: bytes) -> None:
+        self.content += data
+
+    async def finish(self) -> Optional[str]:
+        return None
+
+    def discard(self) -> None:
+        self.content = bytearray()
+
+
+class _SpoolSink:
+    """
+    Temporary file written and hashed COPY_CHUNK_SIZE at a time in the
+    threadpool, so disk writes never block the event loop.
+    """
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp()
+        self.size = 0
+        self._file = os.fdopen(fd, "wb")
+        self._digest = hashlib.blake2b(digest_size=32)
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+
+    async def write(self, data: bytes) -> None:
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        self.size += len(data)
+        if self._pending_bytes >= COPY_CHUNK_SIZE:
+            await run_in_threadpool(self._flush)
+
+    async def finish(self) -> str:
+        await run_in_threadpool(self._flush)
+        self._file.close()
+        return self._digest.hexdigest()
+
+    def discard(self) -> None:
+        self._file.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _flush(self) -> None:
+        for data in self._pending:
+            self._digest.update(data)
+            self._file.write(data)
+        self._pending = []
+        self._pending_bytes = 0
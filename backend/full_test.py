@@ -13,6 +13,8 @@ from io import BytesIO
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from wav_samples import make_test_wav
+
 def test_server_startup():
     """Test if the server can start successfully"""
     print("🚀 Testing server startup...")
@@ -23,9 +25,10 @@ def test_server_startup():
         app = main.app
         print(f"✅ FastAPI app created: {app.title}")
         
-        # Test that we can create a test client
+        # Test that we can create a test client (entering it runs the lifespan)
         from fastapi.testclient import TestClient
         client = TestClient(app)
+        client.__enter__()
         
         # Test health endpoint
         response = client.get("/")
@@ -48,9 +51,8 @@ def test_analyze_endpoint(client):
     print("\n🧪 Testing /analyze endpoint...")
     
     try:
-        # Create a mock audio file
-        mock_audio_content = b"mock audio data for testing"
-        files = {"file": ("test_audio.wav", BytesIO(mock_audio_content), "audio/wav")}
+        # Create a test audio file
+        files = {"file": ("test_audio.wav", BytesIO(make_test_wav()), "audio/wav")}
         
         # Test the analyze endpoint
         response = client.post("/analyze", files=files)
@@ -77,9 +79,8 @@ def test_v1_analyze_endpoint(client):
     print("\n🧪 Testing /v1/voice/analyze endpoint...")
     
     try:
-        # Create a mock audio file
-        mock_audio_content = b"mock audio data for testing"
-        files = {"file": ("test_audio.wav", BytesIO(mock_audio_content), "audio/wav")}
+        # Create a test audio file
+        files = {"file": ("test_audio.wav", BytesIO(make_test_wav()), "audio/wav")}
         
         # Test the v1 analyze endpoint
         response = client.post("/v1/voice/analyze", files=files)
@@ -123,6 +124,7 @@ def main():
     print(f"   /v1/voice/analyze endpoint: {'✅ PASS' if v1_analyze_ok else '❌ FAIL'}")
     
     all_passed = client and analyze_ok and v1_analyze_ok
+    client.__exit__(None, None, None)
     
     if all_passed:
         print("\n🎉 All tests PASSED!")
@@ -0,0 +1,145 @@
+"""
+Tests for batched detector scoring and the micro-batching scheduler
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.analysis  # noqa: E402,F401  (puts sai_audio on the path)
+from app.adapters import registry  # noqa: E402
+from app.adapters.base import Detector  # noqa: E402
+from app.adapters.batcher import DetectorBatcher  # noqa: E402
+from app.utils.executor import AnalysisExecutor  # noqa: E402
+
+
+def clips():
+    rng = np.random.default_rng(7)
+    out = []
+    for seconds, freq in ((0.8, 180), (2.0, 220), (3.3, 440), (1.25, 900)):
+        t = np.arange(int(seconds * 16000)) / 16000
+        voice = 0.3 * np.sin(2 * np.pi * freq * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+        out.append((voice + 0.01 * rng.standard_normal(len(t))).astype(np.float32))
+    return out
+
+
+def use_detectors(monkeypatch, impl):
+    monkeypatch.setenv("DETECTOR_IMPL", impl)
+    monkeypatch.setattr(registry, "_state", None)
+
+
+def test_batched_scores_match_single_clip_scores(monkeypatch):
+    use_detectors(monkeypatch, "reference")
+    waveforms = clips()
+
+    batched = registry.run_detectors_batch(waveforms)
+    assert len(batched) == len(waveforms)
+    for waveform, run in zip(waveforms, batched):
+        single = registry.run_detectors(waveform)
+        assert not run.errors
+        for name in registry.DETECTOR_SIGNALS:
+            assert run.signals[name] == single.signals[name]
+
+
+class LengthDetector(Detector):
+    feature_kinds = ("linear",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def score(self, waveform, features):
+        # Sees only its own clip and frames, not the padding
+        assert len(features["linear"]) == 1 + len(waveform) // 160
+        return len(waveform) / 160000
+
+
+def register_for_test(monkeypatch, impl, detector_class):
+    monkeypatch.setitem(registry._FACTORIES, impl, {
+        name: (lambda n=name: detector_class(n)) for name in registry.DETECTOR_SIGNALS
+    })
+
+
+def test_default_score_batch_scores_each_clip_unpadded(monkeypatch):
+    register_for_test(monkeypatch, "length", LengthDetector)
+    use_detectors(monkeypatch, "length")
+
+    waveforms = clips()
+    runs = registry.run_detectors_batch(waveforms)
+    for waveform, run in zip(waveforms, runs):
+        assert not run.errors
+        assert run.signals["hfi"] == len(waveform) / 160000
+
+
+class PickyDetector(LengthDetector):
+    # hfi fails on clips shorter than a second; each clip takes 0.1 s
+    def score(self, waveform, features):
+        time.sleep(0.1)
+        if self.name == "hfi" and len(waveform) < 16000:
+            raise ValueError("clip too short")
+        return super().score(waveform, features)
+
+
+def test_batch_failures_are_attributed_per_clip(monkeypatch):
+    register_for_test(monkeypatch, "picky", PickyDetector)
+    use_detectors(monkeypatch, "picky")
+    # Four clips take 0.4 s, more than one clip's deadline
+    monkeypatch.setenv("DETECTOR_TIMEOUT_SEC", "0.25")
+
+    waveforms = clips()
+    runs = registry.run_detectors_batch(waveforms)
+
+    assert [run.errors for run in runs] == [{"hfi": "failed: clip too short"}, {}, {}, {}]
+    assert set(runs[0].signals) == {"aasist", "tns"}
+    for waveform, run in zip(waveforms[1:], runs[1:]):
+        assert run.signals["hfi"] == len(waveform) / 160000
+
+
+def test_batcher_coalesces_concurrent_requests(monkeypatch):
+    use_detectors(monkeypatch, "reference")
+    waveforms = clips() * 3
+    expected = [registry.run_detectors(w).signals for w in waveforms]
+
+    async def scenario():
+        executor = AnalysisExecutor("thread", workers=1, queue_size=0, retry_after=1)
+        batcher = DetectorBatcher(executor, max_batch_size=8, max_wait_ms=50)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.run(w) for w in waveforms)), batcher.stats()
+        finally:
+            await batcher.stop()
+            executor.shutdown()
+
+    runs, stats = asyncio.run(scenario())
+
+    assert [run.signals for run in runs] == expected
+    assert stats["batch_size"]["count"] == 2          # 12 requests -> 8 + 4
+    assert stats["batch_size"]["sum"] == len(waveforms)
+    assert stats["queue_wait_ms"]["count"] == len(waveforms)
+    assert stats["queued"] == 0
+
+
+def test_batcher_fails_requests_when_detectors_raise(monkeypatch):
+    def broken(*args):
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr("app.adapters.batcher.run_detectors_batch", broken)
+
+    async def scenario():
+        executor = AnalysisExecutor("thread", workers=1, queue_size=0, retry_after=1)
+        batcher = DetectorBatcher(executor, max_batch_size=4, max_wait_ms=1)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.run(clips()[0]), batcher.run(clips()[1]), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+            executor.shutdown()
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
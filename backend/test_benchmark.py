@@ -0,0 +1,66 @@
+"""
+Tests for the preprocessing benchmark harness
+"""
+import json
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import benchmark
+
+
+def quick_report():
+    cases = [case for case in benchmark.CASES if case.name in benchmark.QUICK_CASES[:1]]
+    return benchmark.run_benchmarks(cases, repeats=1)
+
+
+def test_report_covers_every_stage():
+    report = quick_report()
+    results = report["results"]["speech_16k_mono_1s"]
+    assert set(results) == set(benchmark.STAGES)
+    for result in results.values():
+        assert 0 < result["min_ms"] <= result["median_ms"]
+        assert result["peak_bytes"] >= 0
+
+    # Decoding a 1 s 16-bit clip allocates at least its 32 KB of bytes
+    assert results["decode"]["peak_bytes"] >= 32000
+    json.dumps(report)
+
+
+def test_cases_fit_the_pipeline():
+    for case in benchmark.CASES:
+        wav_bytes = 44 + int(case.duration_sec * case.sample_rate) * case.channels * 2
+        assert wav_bytes <= 25 * 1024 * 1024, case.name
+
+
+def test_compare_flags_only_real_regressions():
+    def report(median_ms, peak_bytes):
+        return {"results": {"c": {"load": {"median_ms": median_ms, "peak_bytes": peak_bytes}}}}
+
+    baseline = report(10.0, 1_000_000)
+    assert benchmark.compare(report(11.0, 1_100_000), baseline, 0.2) == []
+    # Relative change above threshold but below the absolute noise floor
+    assert benchmark.compare(report(0.02, 10), report(0.01, 5), 0.2) == []
+
+    regressions = benchmark.compare(report(13.0, 2_000_000), baseline, 0.2)
+    assert [(r["metric"], r["ratio"]) for r in regressions] == [
+        ("median_ms", 1.3), ("peak_bytes", 2.0)
+    ]
+    # Cases absent from the baseline are skipped
+    assert benchmark.compare(report(13.0, 2_000_000), {"results": {}}, 0.2) == []
+
+
+def test_cli_exit_status(tmp_path):
+    output = tmp_path / "baseline.json"
+    args = ["--case", "speech_16k_mono_1s", "--stage", "pipeline", "--repeats", "1"]
+    assert benchmark.main(args + ["--output", str(output)]) == 0
+    assert benchmark.main(args + ["--baseline", str(output), "--threshold", "10"]) == 0
+
+    baseline = json.loads(output.read_text())
+    baseline["results"]["speech_16k_mono_1s"]["pipeline"]["peak_bytes"] = 1
+    output.write_text(json.dumps(baseline))
+    assert benchmark.main(args + ["--baseline", str(output), "--threshold", "10"]) == 1
+
+    assert benchmark.main(["--case", "nope"]) == 2
@@ -0,0 +1,72 @@
+"""
+Tests for the offline fusion calibration sweep
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.fusion import calibrate
+from app.fusion.fusion_engine import evaluate_fusion
+from app.fusion.fusion_policy import DEFAULT_POLICY
+
+
+def labeled_scores(rows=3000):
+    rng = np.random.default_rng(11)
+    label = rng.integers(0, 2, rows).astype(np.float64)
+    centre = np.where(label == 1, 0.75, 0.4)[:, None]
+    scores = np.clip(centre + rng.normal(0, 0.15, (rows, 3)), 0, 1)
+    return np.column_stack([scores, label])
+
+
+def test_parse_grid():
+    assert calibrate.parse_grid("0.1,0.25") == [0.1, 0.25]
+    assert calibrate.parse_grid("0.3:0.5:0.1") == [0.3, 0.4, 0.5]
+
+
+def test_sweep_matches_scalar_engine():
+    data = labeled_scores()
+    report = calibrate.sweep(data, DEFAULT_POLICY, [0.05, 0.1], [0.1], [0.05], [0.7, 0.75], [0.45])
+    assert len(report["configurations"]) == 2
+
+    for config in report["configurations"]:
+        policy = DEFAULT_POLICY.replace(
+            weak_signal_penalty=config["weak_signal_penalty"],
+            multiple_weak_penalty=config["multiple_weak_penalty"],
+            disagreement_penalty=config["disagreement_penalty"],
+        )
+        for point in config["thresholds"]:
+            p = policy.replace(
+                authentic_threshold=point["authentic_threshold"],
+                synthetic_threshold=point["synthetic_threshold"],
+            )
+            decisions = np.array([evaluate_fusion(a, h, t, p)["decision"] for a, h, t, _ in data.tolist()])
+            human = data[:, 3] == 1
+
+            assert point["false_accept_rate"] == np.mean(decisions[~human] == "AUTHENTIC")
+            assert point["false_reject_rate"] == np.mean(decisions[human] == "SYNTHETIC")
+            assert point["uncertain_rate"] == np.mean(decisions == "UNCERTAIN")
+
+        assert 0.0 <= config["eer"] <= 0.5
+
+
+def test_csv_is_cached_as_npy_only_in_the_cache_dir(tmp_path):
+    data = labeled_scores(50)
+    dataset_dir = tmp_path / "dataset"
+    dataset_dir.mkdir()
+    path = dataset_dir / "scores.csv"
+    np.savetxt(path, data, delimiter=",", header="aasist,hfi,tns,label", comments="")
+
+    loaded = calibrate.load_dataset(str(path))
+    np.testing.assert_array_equal(loaded, data)
+    assert os.listdir(dataset_dir) == ["scores.csv"]
+
+    cache_dir = tmp_path / "cache"
+    loaded = calibrate.load_dataset(str(path), str(cache_dir))
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, data)
+    assert os.listdir(dataset_dir) == ["scores.csv"]
+    assert [name.endswith(".npy") for name in os.listdir(cache_dir)] == [True]
@@ -0,0 +1,115 @@
+"""
+Tests for the detector registry and concurrent detector execution
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.adapters import registry  # noqa: E402
+from app.adapters.base import Detector  # noqa: E402
+from app.analysis import analyze_preprocessed  # noqa: E402
+
+
+class SleepyDetector(Detector):
+    feature_kinds = ("log_mel",)
+
+    def __init__(self, name, delay, confidence=0.8):
+        self.name = name
+        self.delay = delay
+        self.confidence = confidence
+
+    def score(self, waveform, features):
+        time.sleep(self.delay)
+        return self.confidence
+
+
+def tone(seconds=2.0):
+    t = np.arange(int(seconds * 16000)) / 16000
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def register_sleepy(monkeypatch, delays):
+    # Registered for this test only
+    monkeypatch.setitem(registry._FACTORIES, "sleepy", {
+        name: (lambda n=name, d=delay: SleepyDetector(n, d)) for name, delay in delays.items()
+    })
+
+
+def use_detectors(monkeypatch, impl, **timeouts):
+    for name, seconds in timeouts.items():
+        monkeypatch.setenv(f"DETECTOR_TIMEOUT_SEC_{name.upper()}", str(seconds))
+    monkeypatch.setenv("DETECTOR_IMPL", impl)
+    monkeypatch.setattr(registry, "_state", None)
+
+
+def test_reference_detectors_score_in_range(monkeypatch):
+    use_detectors(monkeypatch, "reference")
+    registry.warmup_detectors()
+
+    run = registry.run_detectors(tone())
+    assert not run.errors
+    assert set(run.signals) == set(registry.DETECTOR_SIGNALS)
+    assert all(0.0 <= value <= 1.0 for value in run.signals.values())
+    assert set(run.latency_ms) == {"features", *registry.DETECTOR_SIGNALS}
+
+
+def test_detectors_run_concurrently_with_timeouts(monkeypatch):
+    register_sleepy(monkeypatch, {"aasist": 0.3, "hfi": 0.3, "tns": 2.0})
+    use_detectors(monkeypatch, "sleepy", tns=0.5)
+
+    started = time.perf_counter()
+    run = registry.run_detectors(tone())
+    elapsed = time.perf_counter() - started
+
+    # Two 0.3 s detectors in parallel, and tns cut off at its 0.5 s deadline
+    assert elapsed < 0.9
+    assert run.errors == {"tns": "timed out"}
+    assert set(run.signals) == {"aasist", "hfi"}
+    assert run.latency_ms["aasist"] >= 300
+
+    preprocessed = {"is_valid": True, "waveform": tone(), "duration_sec": 2.0, "warnings": []}
+    analysis = analyze_preprocessed(preprocessed)
+    assert not analysis["is_valid"]
+    assert analysis["detector_errors"] == {"tns": "timed out"}
+
+
+def test_deadline_starts_when_the_detector_starts():
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        first = registry._DetectorJob(pool, time.sleep, 0.3)
+        queued = registry._DetectorJob(pool, time.sleep, 0.3)
+        first.result(0.5)
+        # Finishes 0.6 s after it was queued, 0.3 s after it started
+        queued.result(0.5)
+
+        release = threading.Event()
+        stuck = registry._DetectorJob(pool, release.wait, 5)
+        never_started = registry._DetectorJob(pool, time.sleep, 0)
+        try:
+            with pytest.raises(TimeoutError):
+                never_started.result(0.1)
+            assert never_started.future.cancelled()
+        finally:
+            release.set()
+            stuck.result(1)
+    finally:
+        pool.shutdown()
+
+
+def test_concurrent_analyses_do_not_time_each_other_out(monkeypatch):
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "4")
+    register_sleepy(monkeypatch, {name: 0.3 for name in registry.DETECTOR_SIGNALS})
+    use_detectors(monkeypatch, "sleepy", aasist=0.6, hfi=0.6, tns=0.6)
+
+    with ThreadPoolExecutor(max_workers=4) as analyses:
+        runs = list(analyses.map(lambda _: registry.run_detectors(tone()), range(4)))
+    assert all(not run.errors for run in runs)
@@ -0,0 +1,119 @@
+"""
+Tests for the bounded analysis executor
+"""
+import asyncio
+import io
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.executor import AnalysisExecutor, ExecutorSaturated
+
+
+def test_executor_refuses_work_beyond_capacity():
+    release = threading.Event()
+
+    async def scenario():
+        executor = AnalysisExecutor("thread", workers=1, queue_size=1, retry_after=3)
+        try:
+            running = asyncio.ensure_future(executor.run(release.wait, 5))
+            queued = asyncio.ensure_future(executor.run(sum, [1, 2]))
+            await asyncio.sleep(0)
+            assert executor.saturated
+
+            with pytest.raises(ExecutorSaturated) as excinfo:
+                await executor.run(sum, [3, 4])
+            assert excinfo.value.retry_after == 3
+
+            release.set()
+            assert await running is True
+            assert await queued == 3
+            assert executor.pending == 0
+        finally:
+            release.set()
+            executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_keeps_its_slot_until_the_job_ends():
+    release = threading.Event()
+
+    async def scenario():
+        executor = AnalysisExecutor("thread", workers=1, queue_size=0, retry_after=1)
+        try:
+            request = asyncio.ensure_future(executor.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            request.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await request
+
+            # The job is still running, so the executor is still full
+            assert executor.pending == 1
+            with pytest.raises(ExecutorSaturated):
+                await executor.run(sum, [1, 2])
+
+            release.set()
+            for _ in range(100):
+                if executor.pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert executor.pending == 0
+            assert await executor.run(sum, [1, 2]) == 3
+        finally:
+            release.set()
+            executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_saturated_endpoint_returns_503_with_retry_after(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+    monkeypatch.setenv("ANALYSIS_QUEUE_SIZE", "0")
+    monkeypatch.setenv("ANALYSIS_RETRY_AFTER_SEC", "2")
+
+    # A valid header, so the upload passes the early checks and reaches the executor
+    wav = io.BytesIO()
+    sf.write(wav, np.zeros(16000, dtype=np.float32), 16000, format="WAV")
+
+    with TestClient(main.app) as client:
+        main.app.state.executor.pending = main.app.state.executor.capacity
+        files = {"file": ("clip.wav", wav.getvalue(), "audio/wav")}
+        response = client.post("/analyze", files=files)
+        main.app.state.executor.pending = 0
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+        assert client.get("/health").status_code == 200
+
+
+def test_trace_report_uses_the_fused_scores(monkeypatch):
+    from fastapi.testclient import TestClient
+    from wav_samples import make_test_wav
+    from app.analysis import analyze_audio_bytes
+    import main
+
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+
+    wav = make_test_wav()
+    fusion = analyze_audio_bytes(wav)["fusion"]
+    with TestClient(main.app) as client:
+        report = client.post("/analyze", files={"file": ("a.wav", wav, "audio/wav")}).json()
+
+    assert report["scores"] == {
+        "authenticity_score": fusion["authenticity_score"],
+        "confidence": fusion["confidence"]
+    }
+    assert report["decision"] == ("BONAFIDE" if fusion["authenticity_score"] > 0.6 else "SPOOF")
@@ -0,0 +1,42 @@
+"""
+Tests for the decision fusion engine
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.fusion.fusion_engine import (
+    DECISION_LABELS,
+    evaluate_fusion,
+    evaluate_fusion_batch,
+    explanation_from_bits,
+)
+
+
+def fusion_inputs():
+    rng = np.random.default_rng(7)
+    random = rng.random((3, 20000))
+
+    # Grid points hit the 0.4 / 0.75 / 0.45 boundaries and .0005 rounding ties
+    grid = np.round(np.arange(0, 1.0001, 0.0125), 4)
+    a, h, t = np.meshgrid(grid, grid, grid[::4], indexing="ij")
+    gridded = np.stack([a.ravel(), h.ravel(), t.ravel()])
+
+    return np.concatenate([random, gridded], axis=1)
+
+
+def test_batch_is_bit_identical_to_scalar():
+    aasist, hfi, tns = fusion_inputs()
+    batch = evaluate_fusion_batch(aasist, hfi, tns)
+
+    for i in range(aasist.size):
+        scalar = evaluate_fusion(float(aasist[i]), float(hfi[i]), float(tns[i]))
+
+        assert DECISION_LABELS[batch["decision"][i]] == scalar["decision"]
+        for field in ("authenticity_score", "trust_index", "confidence"):
+            assert batch[field][i].item().hex() == float(scalar[field]).hex(), (i, field)
+        assert explanation_from_bits(batch["explanation"][i], batch["decision"][i]) == scalar["explanation"]
@@ -0,0 +1,113 @@
+"""
+Tests for the compiled, swappable fusion policy
+"""
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.fusion.fusion_engine import DECISION_LABELS, evaluate_fusion, evaluate_fusion_batch
+from app.fusion.fusion_policy import (
+    DEFAULT_POLICY,
+    FusionPolicy,
+    get_policy,
+    reload_policy,
+    set_policy,
+)
+
+
+def test_policy_is_frozen_and_picklable():
+    with pytest.raises(AttributeError):
+        DEFAULT_POLICY.authentic_threshold = 0.5
+    assert not hasattr(DEFAULT_POLICY, "__dict__")
+
+    restored = pickle.loads(pickle.dumps(DEFAULT_POLICY))
+    assert restored.to_dict() == DEFAULT_POLICY.to_dict()
+
+
+def test_invalid_policies_are_rejected():
+    with pytest.raises(ValueError):
+        DEFAULT_POLICY.replace(version="bad", weight_aasist=0.9)
+    with pytest.raises(ValueError):
+        DEFAULT_POLICY.replace(version="bad", synthetic_threshold=0.8)
+    with pytest.raises(ValueError):
+        FusionPolicy.from_dict({"authentic_threshold": 0.7})
+
+
+def test_swapped_policy_drives_scalar_and_batch_paths(tmp_path, monkeypatch):
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"version": "strict", "authentic_threshold": 0.95}))
+    monkeypatch.setenv("FUSION_POLICY_PATH", str(path))
+
+    assert evaluate_fusion(0.9, 0.87, 0.85)["decision"] == "AUTHENTIC"
+    try:
+        reload_policy()
+        assert get_policy().version == "strict"
+
+        scalar = evaluate_fusion(0.9, 0.87, 0.85)
+        batch = evaluate_fusion_batch(np.array([0.9]), np.array([0.87]), np.array([0.85]))
+        assert scalar["decision"] == DECISION_LABELS[batch["decision"][0]] == "UNCERTAIN"
+    finally:
+        set_policy(DEFAULT_POLICY)
+
+
+def test_admin_endpoint_reloads_policy(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    monkeypatch.setenv("VAKYAGUARD_API_KEY", "test-key")
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"version": "week-2"}))
+
+    try:
+        with TestClient(app) as client:
+            headers = {"x-api-key": "test-key"}
+            assert client.get("/v1/admin/fusion-policy", headers=headers).json()["version"] == "v1-default"
+
+            monkeypatch.setenv("FUSION_POLICY_PATH", str(path))
+            response = client.post("/v1/admin/fusion-policy/reload", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["version"] == "week-2"
+
+            path.write_text("{not json")
+            assert client.post("/v1/admin/fusion-policy/reload", headers=headers).status_code == 400
+            assert get_policy().version == "week-2"
+
+            assert client.post("/v1/admin/fusion-policy/reload").status_code == 401
+    finally:
+        set_policy(DEFAULT_POLICY)
+
+
+def test_trace_endpoint_follows_a_swapped_policy(monkeypatch):
+    from fastapi.testclient import TestClient
+    from wav_samples import make_test_wav
+    import main
+
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+
+    wav = {"file": ("clip.wav", make_test_wav(), "audio/wav")}
+    swapped = DEFAULT_POLICY.replace(
+        version="aasist-heavy", weight_aasist=0.8, weight_hfi=0.1, weight_tns=0.1
+    )
+    try:
+        with TestClient(main.app) as client:
+            before = client.post("/analyze", files=wav).json()
+            set_policy(swapped)
+            after = client.post("/analyze", files=wav).json()
+            cache = main.app.state.result_cache.stats()
+    finally:
+        set_policy(DEFAULT_POLICY)
+
+    # Not served from the entry cached under the old policy
+    assert cache["hits"] == 0
+    assert after["scores"] != before["scores"]
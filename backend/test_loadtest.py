@@ -0,0 +1,125 @@
+"""
+Tests for the HTTP load generator, against a stub asyncio server
+"""
+import asyncio
+import hashlib
+import os
+import sys
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import loadtest
+
+
+async def start_stub(bodies, chunked=False):
+    """
+    Keep-alive HTTP server answering every second POST with 429.
+    """
+    count = 0
+
+    async def handle(reader, writer):
+        nonlocal count
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                body = await reader.readexactly(length)
+                bodies.append(hashlib.sha256(body).hexdigest())
+
+                count += 1
+                status = b"200 OK" if count % 2 else b"429 Too Many Requests"
+                if chunked:
+                    writer.write(b"HTTP/1.1 " + status + b"\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                 b"2\r\n{}\r\n0\r\n\r\n")
+                else:
+                    writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def run_against_stub(chunked=False, **kwargs):
+    async def scenario():
+        bodies = []
+        server, port = await start_stub(bodies, chunked)
+        async with server:
+            test = loadtest.LoadTest(
+                f"http://127.0.0.1:{port}",
+                "/analyze",
+                loadtest.parse_mix("1:1"),
+                server_pid=os.getpid(),
+                sample_interval_sec=0.1,
+                **kwargs
+            )
+            return await test.run(), bodies
+
+    return asyncio.run(scenario())
+
+
+def test_parse_mix_and_percentile():
+    assert loadtest.parse_mix("2:0.6, 6@48000:0.3,10") == [
+        loadtest.ClipSpec(2.0, 16000, 0.6),
+        loadtest.ClipSpec(6.0, 48000, 0.3),
+        loadtest.ClipSpec(10.0, 16000, 1.0),
+    ]
+    with pytest.raises(ValueError):
+        loadtest.parse_mix("0:1")
+
+    values = list(range(1, 101))
+    assert loadtest.percentile(values, 50) == 50
+    assert loadtest.percentile(values, 99) == 99
+    assert loadtest.percentile([], 50) is None
+
+
+def test_closed_loop_reports_statuses_and_rss():
+    report, bodies = run_against_stub(mode="closed", concurrency=2, duration_sec=0.3)
+
+    assert report["requests"] == len(bodies) > 0
+    assert set(report["statuses"]) <= {"200", "429"}
+    assert abs(report["rate_limited_rate"] - 0.5) <= 0.05
+    assert report["error_rate"] == report["rate_limited_rate"]
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+    assert report["server_rss_bytes"]["max"] > 0
+    assert report["timeline"] and report["timeline"][0]["server_rss_bytes"] > 0
+
+    # Every request carried a distinct clip, so no cache could answer
+    assert len(set(bodies)) == len(bodies)
+
+
+def test_open_loop_follows_the_schedule():
+    report, bodies = run_against_stub(
+        chunked=True, mode="open", rate=50, duration_sec=0.4, cache_hits=True
+    )
+
+    # 0.4 s at 50 req/s on a constant schedule
+    assert 18 <= report["requests"] <= 20
+    assert report["dropped"] == 0
+    assert len(set(bodies)) == 1
+
+
+def test_unreachable_server_counts_transport_errors():
+    async def scenario():
+        server = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+
+        test = loadtest.LoadTest(
+            f"http://127.0.0.1:{port}", "/analyze", loadtest.parse_mix("1"),
+            mode="open", rate=20, duration_sec=0.2, sample_interval_sec=0.1
+        )
+        return await test.run()
+
+    report = asyncio.run(scenario())
+    assert report["statuses"] == {str(loadtest.TRANSPORT_ERROR): report["requests"]}
+    assert report["error_rate"] == 1.0
+    assert report["server_rss_bytes"]["max"] is None
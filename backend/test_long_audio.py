@@ -0,0 +1,90 @@
+"""
+Tests for sliding-window analysis of long recordings
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.analysis import analyze_long_audio_file  # noqa: E402
+
+
+def write_wav(sections, sample_rate=48000):
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    with sf.SoundFile(path, "w", sample_rate, 1, subtype="PCM_16") as f:
+        for seconds, is_tone in sections:
+            t = np.arange(int(seconds * sample_rate)) / sample_rate
+            f.write(0.3 * np.sin(2 * np.pi * 220 * t) if is_tone else np.zeros_like(t))
+    return path
+
+
+def test_long_audio_timeline():
+    path = write_wav([(30, True), (10, False), (20, True)])
+    try:
+        analysis = analyze_long_audio_file(path)
+    finally:
+        os.unlink(path)
+
+    assert analysis["is_valid"]
+    assert analysis["duration_sec"] == 60.0
+    assert analysis["fusion"]["decision"] in ("AUTHENTIC", "UNCERTAIN", "SYNTHETIC")
+
+    timeline = analysis["timeline"]
+    assert timeline[-1]["end_sec"] == 60.0
+    silent = [seg for seg in timeline if seg["decision"] is None]
+    assert silent and all(30 <= seg["start_sec"] and seg["end_sec"] <= 42 for seg in silent)
+
+
+def test_long_audio_rejects_silence_and_truncates():
+    path = write_wav([(8, False)])
+    try:
+        assert analyze_long_audio_file(path)["warnings"] == ["silence_only_audio"]
+    finally:
+        os.unlink(path)
+
+    path = write_wav([(20, True)])
+    try:
+        analysis = analyze_long_audio_file(path, max_duration_sec=10)
+    finally:
+        os.unlink(path)
+    assert analysis["duration_sec"] == 10
+    assert "audio_trimmed_to_max_duration" in analysis["warnings"]
+
+
+def test_long_audio_endpoint_body_matches_schema(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.schemas.voice_response import LongVoiceAnalysisResponse
+    from app.utils.responses import dumps
+
+    monkeypatch.setattr("app.utils.tenants._registry", None)
+    monkeypatch.setenv("VAKYAGUARD_API_KEY", "test-key")
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+
+    path = write_wav([(12, True), (10, False), (12, True)], sample_rate=16000)
+    try:
+        with open(path, "rb") as f:
+            wav = f.read()
+    finally:
+        os.unlink(path)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/v1/voice/analyze-long",
+            files={"file": ("long.wav", wav, "audio/wav")},
+            headers={"x-api-key": "test-key"}
+        )
+
+    assert response.status_code == 200
+    # Byte for byte what response_model serialization would have sent,
+    # unscored windows included
+    model = LongVoiceAnalysisResponse.model_validate_json(response.content)
+    assert response.content == dumps(model.model_dump())
+    assert any(seg["decision"] is None for seg in response.json()["timeline"])
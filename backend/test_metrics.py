@@ -0,0 +1,84 @@
+"""
+Tests for stage timings, Prometheus metrics and Server-Timing
+"""
+import io
+import os
+import sys
+
+import numpy as np
+import soundfile as sf
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.metrics import Counter, Histogram, HistogramFamily, render_metrics  # noqa: E402
+
+
+def make_wav(duration_sec=2.0, freq=220):
+    t = np.arange(int(duration_sec * 16000)) / 16000
+    buf = io.BytesIO()
+    sf.write(buf, 0.3 * np.sin(2 * np.pi * freq * t), 16000, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram((1, 2, 4, 8))
+    assert histogram.quantile(0.5) is None
+
+    for value in (0.5, 1.5, 1.5, 3, 3, 3, 3, 6, 6, 20):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 3.0     # rank 5 of 10, 2nd of 4 in (2, 4]
+    assert histogram.quantile(0.99) == 8      # +Inf bucket clamps to the last bound
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "2": 3, "4": 7, "8": 9, "+Inf": 10}
+    assert snapshot["p50"] == 3.0
+
+
+def test_prometheus_text_format():
+    counter = Counter("demo_total", "Demo counter", ("reason",))
+    counter.inc(2, 'say "hi"')
+    family = HistogramFamily("demo_seconds", "Demo histogram", (0.1, 1), ("stage",))
+    family.observe(0.05, "load")
+
+    lines = counter.render() + family.render()
+    assert lines[:2] == ["# HELP demo_total Demo counter", "# TYPE demo_total counter"]
+    assert 'demo_total{reason="say \\"hi\\""} 2' in lines
+    assert 'demo_seconds_bucket{stage="load",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="load",le="+Inf"} 1' in lines
+    assert 'demo_seconds_count{stage="load"} 1' in lines
+    assert render_metrics().endswith("\n")
+
+
+def test_endpoints_report_stages_and_metrics(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setenv("SERVER_TIMING", "1")
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+
+    with TestClient(main.app) as client:
+        files = {"file": ("clip.wav", make_wav(freq=310), "audio/wav")}
+        first = client.post("/analyze", files=files)
+        assert first.status_code == 200
+        stages = [entry.split(";")[0] for entry in first.headers["Server-Timing"].split(", ")]
+        for stage in ("upload", "cache", "load", "normalize", "trim", "features",
+                      "detectors", "fusion", "queue", "serialize", "total"):
+            assert stage in stages
+
+        assert client.post("/analyze", files=files).status_code == 200
+        rejected = client.post("/analyze", files={"file": ("a.txt", b"hello", "text/plain")})
+        assert rejected.status_code == 400
+
+        metrics = client.get("/metrics")
+        assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = metrics.text
+
+    assert 'analysis_stage_seconds_count{stage="load"}' in text
+    assert 'http_request_duration_seconds_count{route="/analyze",status="200"}' in text
+    assert 'analysis_rejects_total{reason="bad_request"}' in text
+    assert "analysis_audio_seconds_total" in text
+    assert "analysis_cache_hits_total 1" in text
+    assert "http_request_bytes_total" in text
+    if sys.platform.startswith("linux"):
+        assert "process_resident_memory_bytes " in text
@@ -0,0 +1,84 @@
+"""
+Tests for response encoding without the response_model round trip
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from starlette.responses import JSONResponse
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.utils.responses as responses
+from app.schemas.voice_response import VoiceAnalysisResponse
+from app.utils.responses import dumps, encode_body, json_response
+
+BODY = {
+    "decision": "AUTHENTIC",
+    "scores": {"authenticity_score": 0.877, "trust_index": 0.877, "confidence": 0.443},
+    "provenance": {"human_probability": 0.877, "synthetic_probability": 0.123},
+    "signals": {
+        "aasist": {"confidence": 0.9, "weight": 0.4},
+        "hfi": {"confidence": 0.87, "weight": 0.35},
+        "tns": {"confidence": 0.85, "weight": 0.25}
+    },
+    "explanation": "Réponse fictive ✓",
+    "technical_details": {"detector_latency_ms": {"features": 0.173, "aasist": 0.017}}
+}
+
+
+@pytest.mark.parametrize("backend", ["default", "stdlib"])
+def test_encoding_matches_starlette(backend, monkeypatch):
+    if backend == "stdlib":
+        monkeypatch.setattr(responses, "orjson", None)
+
+    assert dumps(BODY) == JSONResponse(BODY).body
+    assert dumps({"n": np.float32(0.5), "v": np.arange(3)}) == b'{"n":0.5,"v":[0,1,2]}'
+
+    response = json_response(dumps(BODY))
+    assert response.body == dumps(BODY)
+    assert response.headers["content-type"] == "application/json"
+    # Dicts (cache entries from before bodies were cached encoded) still work
+    assert json_response(BODY).body == response.body
+
+
+def test_validation_only_in_debug_mode(monkeypatch):
+    bad = {**BODY, "decision": "MAYBE"}
+
+    monkeypatch.setenv("RESPONSE_VALIDATION", "0")
+    assert encode_body(bad, VoiceAnalysisResponse) == dumps(bad)
+
+    monkeypatch.setenv("RESPONSE_VALIDATION", "1")
+    assert encode_body(BODY, VoiceAnalysisResponse) == dumps(BODY)
+    with pytest.raises(ValidationError):
+        encode_body(bad, VoiceAnalysisResponse)
+
+
+def test_cache_hit_reuses_encoded_body(monkeypatch):
+    from fastapi.testclient import TestClient
+    from wav_samples import make_test_wav
+    import app.main as vakyaguard
+
+    monkeypatch.setattr("app.utils.tenants._registry", None)
+    monkeypatch.setenv("VAKYAGUARD_API_KEY", "test-key")
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+
+    encoded = []
+    monkeypatch.setattr(
+        vakyaguard, "encode_body", lambda body, model=None: encoded.append(body) or dumps(body)
+    )
+
+    wav = {"file": ("clip.wav", make_test_wav(), "audio/wav")}
+    headers = {"x-api-key": "test-key"}
+    with TestClient(vakyaguard.app) as client:
+        first = client.post("/v1/voice/analyze", files=wav, headers=headers)
+        second = client.post("/v1/voice/analyze", files=wav, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert len(encoded) == 1
+    VoiceAnalysisResponse.model_validate_json(first.content)
@@ -0,0 +1,123 @@
+"""
+Tests for the content-addressed analysis result cache
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.result_cache import ResultCache, content_digest
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    import app.utils.result_cache as result_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+
+    cache = ResultCache("v1", max_entries=2, ttl_sec=10)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.put("c", {"n": 3})          # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == {"n": 3}
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+
+def test_sqlite_tier_survives_restart_and_versions_invalidate(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    digest = content_digest(b"clip")
+
+    first = ResultCache("fusion-v1", sqlite_path=path)
+    first.put(first.key("voice", digest), {"decision": "AUTHENTIC"})
+    first.put(first.key("voice-long", digest), b'{"decision":"SYNTHETIC"}')
+    first.close()
+
+    restarted = ResultCache("fusion-v1", sqlite_path=path)
+    assert restarted.get(restarted.key("voice", digest)) == {"decision": "AUTHENTIC"}
+    # Encoded bodies come back as the same bytes
+    assert restarted.get(restarted.key("voice-long", digest)) == b'{"decision":"SYNTHETIC"}'
+
+    upgraded = ResultCache("fusion-v2", sqlite_path=path)
+    assert upgraded.get(upgraded.key("voice", digest)) is None
+
+
+def test_sqlite_tier_is_purged_and_capped(tmp_path, monkeypatch):
+    import app.utils.result_cache as result_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "results.sqlite")
+
+    # No memory tier: the SQLite tier still works on its own
+    cache = ResultCache("v1", max_entries=0, ttl_sec=100, sqlite_path=path, sqlite_max_rows=3)
+    assert cache.enabled
+    for i in range(5):
+        cache.put(f"old-{i}", b"{}")
+    assert cache.get("old-0") == b"{}" and cache.stats()["entries"] == 0
+
+    now[0] += 100  # the old rows expire
+    for i in range(4):
+        now[0] += 1
+        cache.put(f"new-{i}", b"{}")
+    now[0] += ResultCache.PURGE_INTERVAL_SEC
+    cache.put("last", b"{}")
+
+    keys = {row[0] for row in sqlite3.connect(path).execute("SELECT key FROM results")}
+    assert keys == {"new-2", "new-3", "last"}
+
+
+def test_async_access_matches_sync(tmp_path):
+    cache = ResultCache("v1", sqlite_path=str(tmp_path / "results.sqlite"))
+
+    async def round_trip():
+        await cache.put_async("k", b'{"n":1}')
+        return await cache.get_async("k"), await cache.get_async("missing")
+
+    assert asyncio.run(round_trip()) == (b'{"n":1}', None)
+    restarted = ResultCache("v1", sqlite_path=str(tmp_path / "results.sqlite"))
+    assert restarted.get("k") == b'{"n":1}'
+
+
+def test_replayed_upload_is_served_from_cache(monkeypatch):
+    from fastapi.testclient import TestClient
+    from wav_samples import make_test_wav
+    import main
+
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+
+    # A slow first analysis, so its processing time differs from the hit's
+    analyze_upload = main.analyze_upload
+
+    async def slow_analyze_upload(*args):
+        await asyncio.sleep(0.2)
+        return await analyze_upload(*args)
+
+    monkeypatch.setattr(main, "analyze_upload", slow_analyze_upload)
+
+    def processing_time(report):
+        summary, timing = report["summary"].split("\n\nProcessing Time: ")
+        return summary, float(timing.split("s\n")[0])
+
+    wav = make_test_wav()
+    with TestClient(main.app) as client:
+        first = client.post("/analyze", files={"file": ("a.wav", wav, "audio/wav")})
+        second = client.post("/analyze", files={"file": ("b.wav", wav, "audio/wav")})
+
+        assert first.status_code == second.status_code == 200
+        assert main.app.state.result_cache.stats()["hits"] == 1
+
+    first, second = first.json(), second.json()
+    first_summary, first_time = processing_time(first)
+    second_summary, second_time = processing_time(second)
+    assert first_summary == second_summary
+    assert first_time >= 0.2 > second_time
+    assert {**first, "summary": ""} == {**second, "summary": ""}
@@ -7,6 +7,8 @@ import requests
 import json
 from io import BytesIO
 
+from wav_samples import make_test_wav
+
 def test_health_endpoint():
     """Test the health endpoints"""
     print("🏥 Testing health endpoints...")
@@ -35,8 +37,8 @@ def test_analyze_endpoints():
     """Test the analyze endpoints with mock file upload"""
     print("\n🎵 Testing analyze endpoints...")
     
-    # Create a mock audio file
-    mock_audio_content = b"This is mock audio data for testing the upload functionality"
+    # Create a test audio file
+    mock_audio_content = make_test_wav()
     files = {"file": ("test_audio.wav", BytesIO(mock_audio_content), "audio/wav")}
     
     endpoints = [
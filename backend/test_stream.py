@@ -0,0 +1,99 @@
+"""
+Tests for the WebSocket streaming analysis endpoint
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("VAKYAGUARD_API_KEY", "test-key")
+
+from app.main import app  # noqa: E402
+
+API_KEY = os.environ["VAKYAGUARD_API_KEY"]
+
+
+def pcm_tone(duration_sec, sample_rate=48000):
+    t = np.arange(int(duration_sec * sample_rate)) / sample_rate
+    return (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2").tobytes()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_stream_sends_provisional_then_final(client):
+    url = f"/v1/voice/stream?sample_rate=48000&api_key={API_KEY}"
+    pcm = pcm_tone(3.0)
+    frame = 48000 // 50 * 2  # 20 ms of s16 mono
+
+    with client.websocket_connect(url) as ws:
+        for i in range(0, len(pcm), frame):
+            ws.send_bytes(pcm[i:i + frame])
+        ws.send_text("stop")
+
+        messages = []
+        while True:
+            message = ws.receive_json()
+            messages.append(message)
+            if message["type"] != "provisional":
+                break
+
+    assert [m["type"] for m in messages[:-1]] == ["provisional"] * (len(messages) - 1)
+    assert len(messages) >= 2
+    final = messages[-1]
+    assert final["type"] == "final"
+    assert final["decision"] in ("AUTHENTIC", "UNCERTAIN", "SYNTHETIC")
+    assert abs(final["duration_sec"] - 3.0) < 0.1
+
+
+def test_stream_rejects_bad_parameters_and_silence(client):
+    with client.websocket_connect(f"/v1/voice/stream?sample_rate=4000&api_key={API_KEY}") as ws:
+        assert ws.receive_json()["detail"] == "Unsupported sample rate"
+
+    with client.websocket_connect(f"/v1/voice/stream?sample_rate=16000&api_key={API_KEY}") as ws:
+        ws.send_bytes(b"\x00\x00" * 32000)
+        ws.send_text('{"type": "stop"}')
+        message = ws.receive_json()
+        assert message["type"] == "error"
+        assert message["warnings"] == ["silence_only_audio"]
+
+
+def test_stream_closes_with_codes_after_accepting(client, monkeypatch):
+    # Closed after accept(), so clients see the close code, not an HTTP 403
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/v1/voice/stream?sample_rate=16000&api_key=wrong") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+    monkeypatch.setenv("STREAM_QUERY_API_KEY", "0")
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"/v1/voice/stream?sample_rate=16000&api_key={API_KEY}") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+    headers = {"x-api-key": API_KEY}
+    with client.websocket_connect("/v1/voice/stream?sample_rate=4000", headers=headers) as ws:
+        assert ws.receive_json()["detail"] == "Unsupported sample rate"
+
+
+def test_stream_is_refused_when_the_executor_is_saturated(client):
+    executor = app.state.executor
+    executor.pending = executor.capacity
+    try:
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect(f"/v1/voice/stream?sample_rate=16000&api_key={API_KEY}") as ws:
+                ws.receive_json()
+        assert exc.value.code == 1013
+    finally:
+        executor.pending = 0
@@ -0,0 +1,177 @@
+"""
+Tests for per-tenant API keys, rate limits and in-flight quotas
+"""
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.tenants import (
+    Tenant,
+    TokenBucket,
+    load_tenant_registry,
+)
+
+
+def write_keys(tmp_path, tenants):
+    path = tmp_path / "api_keys.json"
+    path.write_text(json.dumps({"tenants": tenants}))
+    return str(path)
+
+
+def test_token_bucket_refills_at_rate(monkeypatch):
+    import app.utils.tenants as tenants
+
+    now = [100.0]
+    monkeypatch.setattr(tenants.time, "monotonic", lambda: now[0])
+
+    bucket = TokenBucket(rate_per_sec=2.0, burst=2.0)
+    assert bucket.take() == 0.0 and bucket.take() == 0.0
+    assert bucket.take() == pytest.approx(0.5)
+
+    now[0] += 0.5
+    assert bucket.take() == 0.0
+    # Never more than the burst, however long it sat idle
+    now[0] += 10
+    assert [bucket.take() > 0 for _ in range(3)] == [False, False, True]
+
+
+def test_in_flight_cap_does_not_spend_tokens():
+    tenant = Tenant("acme", rate_per_sec=0.001, burst=2, max_in_flight=1)
+
+    assert tenant.try_acquire() is None
+    assert tenant.try_acquire().reason == "too_many_in_flight"
+    tenant.release()
+
+    # Only one token was used, so the burst still admits one more
+    assert tenant.try_acquire() is None
+    tenant.release()
+    rejection = tenant.try_acquire()
+    assert rejection.reason == "rate_limited" and rejection.retry_after >= 1
+    assert tenant.in_flight == 0
+
+
+def test_registry_from_file_and_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("TENANT_MAX_IN_FLIGHT", "3")
+    path = write_keys(tmp_path, {
+        "acme": {"keys": ["acme-1", "acme-2"], "rate_per_sec": 5},
+        "globex": {"key_sha256": [hashlib.sha256(b"globex-key").hexdigest()]},
+    })
+    registry = load_tenant_registry(path)
+
+    assert registry.authenticate("acme-2").name == "acme"
+    assert registry.authenticate("globex-key").name == "globex"
+    assert registry.authenticate("acme-3") is None
+    assert registry.authenticate("") is None
+    assert registry.tenants["acme"].stats() == {
+        "rate_per_sec": 5.0, "burst": 5.0, "max_in_flight": 3, "in_flight": 0
+    }
+
+    shared = write_keys(tmp_path, {"a": {"keys": ["k"]}, "b": {"keys": ["k"]}})
+    with pytest.raises(ValueError):
+        load_tenant_registry(shared)
+
+    monkeypatch.setenv("VAKYAGUARD_API_KEY", "env-key")
+    assert load_tenant_registry().authenticate("env-key").name == "default"
+    monkeypatch.delenv("VAKYAGUARD_API_KEY")
+    assert not load_tenant_registry().configured
+
+
+def test_quota_rejects_before_reading_the_body(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from wav_samples import make_test_wav
+    from app.main import app
+
+    # The app loads its own registry at startup; restored afterwards
+    monkeypatch.setattr("app.utils.tenants._registry", None)
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+    monkeypatch.setenv("API_KEYS_PATH", write_keys(tmp_path, {
+        "noisy": {"keys": ["noisy-key"], "rate_per_sec": 0.01, "burst": 1},
+        "quiet": {"keys": ["quiet-key"]},
+        "ops": {"keys": ["ops-key"], "admin": True},
+    }))
+
+    wav = {"file": ("clip.wav", make_test_wav(), "audio/wav")}
+    with TestClient(app) as client:
+        first = client.post("/v1/voice/analyze", files=wav, headers={"x-api-key": "noisy-key"})
+        assert first.status_code == 200
+
+        # Not even a valid upload: refused on the quota, not the body
+        second = client.post(
+            "/v1/voice/analyze",
+            files={"file": ("a.txt", b"hello", "text/plain")},
+            headers={"x-api-key": "noisy-key"}
+        )
+        assert second.status_code == 429
+        assert int(second.headers["Retry-After"]) >= 1
+
+        # Other tenants are unaffected
+        other = client.post("/v1/voice/analyze", files=wav, headers={"x-api-key": "quiet-key"})
+        assert other.status_code == 200
+
+        assert client.post("/v1/voice/analyze", files=wav).status_code == 401
+        bad_key = client.post("/v1/voice/analyze", files=wav, headers={"x-api-key": "nope"})
+        assert bad_key.status_code == 401
+
+        stats = client.get("/v1/admin/tenants", headers={"x-api-key": "ops-key"}).json()
+        assert stats["noisy"]["in_flight"] == stats["quiet"]["in_flight"] == 0
+        assert 'tenant_rejects_total{tenant="noisy",reason="rate_limited"}' in (
+            client.get("/metrics").text
+        )
+
+
+def test_stream_holds_an_in_flight_slot(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+    from app.main import app
+
+    # The app loads its own registry at startup; restored afterwards
+    monkeypatch.setattr("app.utils.tenants._registry", None)
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+    monkeypatch.setenv("API_KEYS_PATH", write_keys(tmp_path, {
+        "solo": {"keys": ["solo-key"], "max_in_flight": 1},
+    }))
+
+    url = "/v1/voice/stream?sample_rate=16000&api_key=solo-key"
+    with TestClient(app) as client:
+        with client.websocket_connect(url):
+            with pytest.raises(WebSocketDisconnect) as exc:
+                with client.websocket_connect(url) as second:
+                    second.receive_json()
+            assert exc.value.code == 1013
+
+        with client.websocket_connect(url) as ws:
+            ws.send_text("stop")
+            assert ws.receive_json()["type"] == "error"
+
+
+def test_admin_routes_need_an_admin_tenant(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.fusion.fusion_policy import get_policy
+    from app.main import app
+
+    monkeypatch.setattr("app.utils.tenants._registry", None)
+    monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+    monkeypatch.setenv("ANALYSIS_WORKERS", "1")
+    monkeypatch.setenv("API_KEYS_PATH", write_keys(tmp_path, {
+        "acme": {"keys": ["acme-key"]},
+        "ops": {"keys": ["ops-key"], "admin": True},
+    }))
+
+    version = get_policy().version
+    with TestClient(app) as client:
+        tenant = {"x-api-key": "acme-key"}
+        assert client.get("/v1/admin/tenants", headers=tenant).status_code == 403
+        assert client.get("/v1/admin/fusion-policy", headers=tenant).status_code == 403
+        assert client.post("/v1/admin/fusion-policy/reload", headers=tenant).status_code == 403
+        assert get_policy().version == version
+
+        tenants = client.get("/v1/admin/tenants", headers={"x-api-key": "ops-key"}).json()
+        assert set(tenants) == {"acme", "ops"}
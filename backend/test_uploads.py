@@ -0,0 +1,150 @@
+"""
+Tests for the bounded streaming upload reader
+"""
+import asyncio
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi import HTTPException
+from starlette.requests import Request
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.analysis  # noqa: E402,F401  (puts sai_audio on the path)
+from app.utils.result_cache import content_digest  # noqa: E402
+from app.utils.uploads import receive_audio_upload  # noqa: E402
+
+BOUNDARY = "upload-test-boundary"
+CHUNK = 16 * 1024
+
+
+def make_wav(duration_sec):
+    t = np.arange(int(duration_sec * 16000)) / 16000
+    buf = io.BytesIO()
+    sf.write(buf, 0.3 * np.sin(2 * np.pi * 220 * t), 16000, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def multipart_body(content, name="file", content_type="audio/wav"):
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="note"\r\n\r\nhello\r\n'
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{name}"; filename="clip.wav"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def receive(body, content_length=True, **kwargs):
+    """
+    Run receive_audio_upload over `body` sent in CHUNK-sized messages.
+    Returns (upload or HTTPException, number of chunks the reader pulled).
+    """
+    chunks = [body[i:i + CHUNK] for i in range(0, len(body), CHUNK)] or [b""]
+    pulled = 0
+
+    async def receive_message():
+        nonlocal pulled
+        pulled += 1
+        return {
+            "type": "http.request",
+            "body": chunks[pulled - 1],
+            "more_body": pulled < len(chunks),
+        }
+
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    request = Request({"type": "http", "method": "POST", "headers": headers}, receive_message)
+
+    async def run():
+        try:
+            return await receive_audio_upload(request, **kwargs)
+        except HTTPException as exc:
+            return exc
+
+    return asyncio.run(run()), pulled
+
+
+def test_valid_upload_is_kept_in_memory_or_spooled():
+    wav = make_wav(3.0)
+    body = multipart_body(wav)
+
+    upload, _ = receive(body, max_bytes=len(wav), max_duration_sec=10)
+    assert bytes(upload.content) == wav
+    assert upload.filename == "clip.wav" and upload.content_type == "audio/wav"
+    assert upload.info.duration_sec == 3.0
+
+    upload, _ = receive(body, max_bytes=len(wav), spool=True)
+    try:
+        with open(upload.path, "rb") as f:
+            assert f.read() == wav
+        assert upload.digest == content_digest(wav)
+    finally:
+        os.unlink(upload.path)
+
+
+def test_declared_length_over_the_cap_is_refused_before_reading():
+    wav = make_wav(3.0)
+    result, pulled = receive(multipart_body(wav), max_bytes=len(wav) // 2)
+    assert result.status_code == 413
+    assert pulled == 0
+
+
+@pytest.mark.parametrize("spool", [False, True])
+def test_body_beyond_the_cap_stops_reading(spool):
+    wav = make_wav(20.0)
+    result, pulled = receive(
+        multipart_body(wav), content_length=False, max_bytes=100_000, spool=spool
+    )
+    assert result.status_code == 413
+    assert pulled * CHUNK < 100_000 + 2 * CHUNK
+
+
+def test_bad_header_is_rejected_from_the_first_chunks():
+    garbage = b"<html>" + os.urandom(1_000_000)
+    result, pulled = receive(multipart_body(garbage), max_bytes=2_000_000)
+    assert result.status_code == 422
+    assert result.detail == "Unsupported or corrupted audio format"
+    assert pulled * CHUNK < 100_000
+
+    long_wav = make_wav(120.0)
+    result, pulled = receive(
+        multipart_body(long_wav), max_bytes=len(long_wav), max_duration_sec=60
+    )
+    assert result.status_code == 422
+    assert "maximum duration" in result.detail
+    assert pulled * CHUNK < 100_000
+
+
+def test_wrong_file_type_or_missing_field_is_rejected():
+    wav = make_wav(2.0)
+    result, _ = receive(
+        multipart_body(wav, content_type="text/plain"),
+        max_bytes=len(wav),
+        content_type_prefix="audio/"
+    )
+    assert result.status_code == 400
+
+    result, _ = receive(multipart_body(wav, name="audio"), max_bytes=len(wav))
+    assert result.status_code == 422
+
+
+def test_endpoint_rejects_oversized_upload(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setenv("UPLOAD_MAX_BYTES", "50000")
+
+    with TestClient(main.app) as client:
+        files = {"file": ("clip.wav", make_wav(5.0), "audio/wav")}
+        response = client.post("/analyze", files=files)
+        assert response.status_code == 413
+
+        files = {"file": ("clip.wav", make_wav(1.5), "audio/wav")}
+        assert client.post("/analyze", files=files).status_code == 200
@@ -0,0 +1,53 @@
+"""
+Tests for memory-mapped detector weights
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.adapters import registry, weights  # noqa: E402
+
+
+def test_weights_are_memory_mapped_and_reported(tmp_path):
+    band_weights = np.linspace(1.0, 2.0, 80, dtype=np.float32)
+    weights.save_weights(str(tmp_path), "aasist", {"mel_band_weights": band_weights})
+    weights.save_weights(str(tmp_path), "hfi", {"proj": np.ones((256, 1024), dtype=np.float32)})
+
+    store = weights.load_weight_store(str(tmp_path), prefault=True)
+    tensor = store.for_detector("aasist")["mel_band_weights"]
+    assert isinstance(tensor, np.memmap)
+    assert not tensor.flags.writeable
+    np.testing.assert_array_equal(tensor, band_weights)
+
+    report = store.report()
+    assert report["tensors"] == 2
+    assert report["detectors"] == ["aasist", "hfi"]
+    assert report["mapped_bytes"] == band_weights.nbytes + 256 * 1024 * 4
+    if report["resident_bytes"] is not None:
+        # prefault touched every page of the 1 MiB tensor
+        assert report["resident_bytes"] >= 256 * 1024 * 4
+
+
+def test_detectors_receive_mapped_weights(tmp_path, monkeypatch):
+    weights.save_weights(str(tmp_path), "aasist", {"mel_band_weights": np.ones(80, np.float32)})
+    monkeypatch.setenv("DETECTOR_IMPL", "reference")
+    monkeypatch.setattr(weights, "_store", weights.load_weight_store(str(tmp_path)))
+    monkeypatch.setattr(registry, "_state", None)
+
+    detectors = registry.get_detectors()
+    assert isinstance(detectors["aasist"].weights["mel_band_weights"], np.memmap)
+    assert detectors["hfi"].weights == {}
+
+    t = np.arange(32000) / 16000
+    run = registry.run_detectors((0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32))
+    assert not run.errors
+
+
+def test_missing_directory_gives_empty_store(tmp_path):
+    store = weights.load_weight_store(str(tmp_path / "missing"))
+    assert store.report()["tensors"] == 0
+    assert store.resident_bytes() == 0
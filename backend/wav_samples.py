@@ -0,0 +1,22 @@
+"""
+Test audio shared by the test suite and the integration scripts
+"""
+import math
+import struct
+import wave
+from io import BytesIO
+
+
+def make_test_wav(duration_sec=3.0, sample_rate=16000):
+    """Build a short 16-bit mono sine-tone WAV with the standard library"""
+    frames = b"".join(
+        struct.pack("<h", int(9000 * math.sin(2 * math.pi * 220 * i / sample_rate)))
+        for i in range(int(duration_sec * sample_rate))
+    )
+    buf = BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return buf.getvalue()
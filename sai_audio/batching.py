@@ -0,0 +1,67 @@
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sai_audio.validate import MAX_DURATION_SEC
+
+# Upper edges of the length buckets. Padding to the edge rather than to the
+# longest clip keeps batch shapes to a small fixed set for the models.
+BUCKET_EDGES_SEC = (2.0, 4.0, 6.0, 8.0, MAX_DURATION_SEC)
+
+
+class PaddedBatch(NamedTuple):
+    indices: List[int]      # positions of the rows in the caller's sequence
+    waveforms: np.ndarray   # (batch, samples) float32, C-contiguous, zero padded
+    lengths: np.ndarray     # (batch,) int64 valid samples per row
+    mask: np.ndarray        # (batch, samples) bool, True on valid samples
+
+
+def pad_batch(
+    waveforms: Sequence[np.ndarray],
+    length: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack 1-D waveforms into one zero-padded float32 array.
+
+    Returns:
+        padded (batch, length), lengths (batch,), mask (batch, length)
+    """
+    lengths = np.fromiter((len(w) for w in waveforms), dtype=np.int64, count=len(waveforms))
+    width = int(lengths.max(initial=0)) if length is None else max(length, int(lengths.max(initial=0)))
+
+    padded = np.zeros((len(waveforms), width), dtype=np.float32)
+    for row, waveform in enumerate(waveforms):
+        padded[row, :len(waveform)] = waveform
+
+    mask = np.arange(width) < lengths[:, None]
+    return padded, lengths, mask
+
+
+def bucket_waveforms(
+    waveforms: Sequence[np.ndarray],
+    sample_rate: int,
+    edges_sec: Sequence[float] = BUCKET_EDGES_SEC
+) -> List[PaddedBatch]:
+    """
+    Group waveforms by length and pad each group to its bucket edge.
+    Clips longer than the last edge go to the last bucket, padded to the
+    longest of them.
+
+    Returns:
+        one PaddedBatch per non-empty bucket, shortest bucket first
+    """
+    edges = [int(edge * sample_rate) for edge in edges_sec]
+    buckets: List[List[int]] = [[] for _ in edges]
+
+    for index, waveform in enumerate(waveforms):
+        slot = int(np.searchsorted(edges, len(waveform)))
+        buckets[min(slot, len(edges) - 1)].append(index)
+
+    batches = []
+    for edge, indices in zip(edges, buckets):
+        if not indices:
+            continue
+        padded, lengths, mask = pad_batch([waveforms[i] for i in indices], edge)
+        batches.append(PaddedBatch(indices, padded, lengths, mask))
+
+    return batches
@@ -1,27 +1,206 @@
-import base64
-from typing import Optional, Tuple
+import binascii
+from typing import BinaryIO, Optional, Tuple, Union
 
-def decode_base64_audio(audio_base64: str) -> Tuple[Optional[bytes], Optional[str]]:
+MIN_AUDIO_BYTES = 1024
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
+# Encoded characters decoded per step; must stay a multiple of 4.
+DECODE_CHUNK_SIZE = 256 * 1024
+
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"
+_PAD = ord("=")
+
+Base64Input = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+
+def decode_base64_audio(
+    audio_base64: Base64Input,
+    max_bytes: int = MAX_AUDIO_BYTES
+) -> Tuple[Optional[memoryview], Optional[str]]:
     """
     Decode base64-encoded audio safely.
 
+    Accepts a str, a bytes-like object or a binary file-like object. The
+    input is decoded chunk by chunk into a single buffer, and inputs whose
+    encoded length already implies more than `max_bytes` are rejected
+    before any decoding happens.
+
     Returns:
-        (audio_bytes, error_message)
+        (audio_bytes, error_message), where audio_bytes is a read-only
+        view of the decoded buffer (no copy is made)
     """
 
-    if audio_base64 is None or not isinstance(audio_base64, str):
+    if audio_base64 is None:
         return None, "Audio input must be a base64 string"
 
-    audio_base64 = audio_base64.strip()
-    if not audio_base64:
+    if isinstance(audio_base64, (str, bytes, bytearray, memoryview)):
+        audio_bytes, err = _decode_buffer(audio_base64, max_bytes)
+    elif hasattr(audio_base64, "read"):
+        audio_bytes, err = _decode_stream(audio_base64, max_bytes)
+    else:
+        return None, "Audio input must be a base64 string"
+
+    if err is not None or audio_bytes is None:
+        return None, err
+
+    if len(audio_bytes) < MIN_AUDIO_BYTES:
+        return None, "Decoded audio data too small to be valid"
+
+    return memoryview(audio_bytes).toreadonly(), None
+
+
+def _is_space(ch) -> bool:
+    if isinstance(ch, int):
+        return ch in _ASCII_WHITESPACE
+    return ch.isspace()
+
+
+def _is_pad(ch) -> bool:
+    return ch == _PAD or ch == "="
+
+
+def _decode_buffer(
+    data: Union[str, bytes, bytearray, memoryview],
+    max_bytes: int
+) -> Tuple[Optional[bytearray], Optional[str]]:
+    if not isinstance(data, str):
+        # Slicing a memoryview is zero-copy, slicing bytes is not
+        try:
+            data = memoryview(data)
+            if not data.c_contiguous:
+                return None, "Invalid base64 encoding"
+            if data.format != "B" or data.ndim != 1:
+                data = data.cast("B")
+        except (BufferError, TypeError):
+            return None, "Invalid base64 encoding"
+
+    # Locate the payload without building a stripped copy
+    start, end = 0, len(data)
+    while start < end and _is_space(data[start]):
+        start += 1
+    while end > start and _is_space(data[end - 1]):
+        end -= 1
+
+    encoded_len = end - start
+    if encoded_len == 0:
         return None, "Empty audio input"
 
+    if encoded_len % 4:
+        return None, "Invalid base64 encoding"
+
+    padding = 0
+    while padding < 2 and _is_pad(data[end - 1 - padding]):
+        padding += 1
+
+    decoded_len = encoded_len // 4 * 3 - padding
+    if decoded_len > max_bytes:
+        return None, "Audio input exceeds maximum allowed size"
+
+    out = bytearray(decoded_len)
+    view = memoryview(out)
+    pos = 0
+
     try:
-        audio_bytes = base64.b64decode(audio_base64, validate=True)
-    except Exception:
+        for offset in range(start, end, DECODE_CHUNK_SIZE):
+            stop = min(offset + DECODE_CHUNK_SIZE, end)
+            decoded = binascii.a2b_base64(data[offset:stop], strict_mode=True)
+
+            # Padding is only legal in the final chunk
+            if stop < end and len(decoded) != (stop - offset) // 4 * 3:
+                return None, "Invalid base64 encoding"
+
+            if pos + len(decoded) > decoded_len:
+                return None, "Invalid base64 encoding"
+
+            view[pos:pos + len(decoded)] = decoded
+            pos += len(decoded)
+    except (binascii.Error, BufferError, ValueError):
         return None, "Invalid base64 encoding"
+    finally:
+        view.release()
 
-    if len(audio_bytes) < 1024:
-        return None, "Decoded audio data too small to be valid"
+    if pos != decoded_len:
+        return None, "Invalid base64 encoding"
+
+    return out, None
+
+
+def _remaining_size(stream: BinaryIO) -> Optional[int]:
+    try:
+        if not stream.seekable():
+            return None
+        current = stream.tell()
+        size = stream.seek(0, 2)
+        stream.seek(current)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return max(0, size - current)
+
+
+def _decode_stream(
+    stream: BinaryIO,
+    max_bytes: int
+) -> Tuple[Optional[bytearray], Optional[str]]:
+    remaining = _remaining_size(stream)
+    if remaining is not None:
+        # Whitespace and padding only shrink the output, so this is an upper bound
+        if remaining // 4 * 3 - 2 > max_bytes:
+            return None, "Audio input exceeds maximum allowed size"
+        out = bytearray(min(remaining // 4 * 3, max_bytes))
+    else:
+        out = bytearray()
+
+    pos = 0
+    carry = b""
+    started = False
+
+    while True:
+        chunk = stream.read(DECODE_CHUNK_SIZE)
+        if isinstance(chunk, str):
+            try:
+                chunk = chunk.encode("ascii")
+            except UnicodeEncodeError:
+                return None, "Invalid base64 encoding"
+
+        eof = not chunk
+        if not started:
+            chunk = chunk.lstrip(_ASCII_WHITESPACE)
+            started = bool(chunk)
+
+        data = carry + chunk if carry else chunk
+
+        if eof:
+            data = data.rstrip(_ASCII_WHITESPACE)
+            if len(data) % 4:
+                return None, "Invalid base64 encoding"
+            usable = len(data)
+        else:
+            # Hold back the last quantum: it may carry the final padding
+            stripped_len = len(data.rstrip(_ASCII_WHITESPACE))
+            usable = max(0, (stripped_len // 4 - 1) * 4)
+
+        segment, carry = data[:usable], data[usable:]
+
+        if segment:
+            try:
+                decoded = binascii.a2b_base64(segment, strict_mode=True)
+            except (binascii.Error, ValueError):
+                return None, "Invalid base64 encoding"
+
+            if not eof and len(decoded) != usable // 4 * 3:
+                return None, "Invalid base64 encoding"
+
+            if pos + len(decoded) > max_bytes:
+                return None, "Audio input exceeds maximum allowed size"
+
+            out[pos:pos + len(decoded)] = decoded
+            pos += len(decoded)
+
+        if eof:
+            break
+
+    if pos == 0 and not started:
+        return None, "Empty audio input"
 
-    return audio_bytes, None
+    del out[pos:]
+    return out, None
@@ -0,0 +1,225 @@
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from sai_audio.normalize import TARGET_SAMPLE_RATE
+
+FEATURE_KINDS = ("linear", "log_mel", "lfcc")
+
+# Floor applied before taking logs, as in librosa.power_to_db
+_AMIN_POWER = 1e-10
+
+
+class FeatureConfig(NamedTuple):
+    """
+    STFT and filterbank settings. Hashable, so every derived window and
+    filterbank is built once per configuration.
+    """
+    sample_rate: int = TARGET_SAMPLE_RATE
+    n_fft: int = 512
+    win_length: int = 400        # 25 ms at 16 kHz
+    hop_length: int = 160        # 10 ms at 16 kHz
+    center: bool = True          # zero-pad n_fft // 2 on both sides
+    n_mels: int = 80
+    n_linear_filters: int = 20
+    n_lfcc: int = 20
+    fmin: float = 0.0
+    fmax: Optional[float] = None  # None means sample_rate / 2
+
+    @property
+    def n_bins(self) -> int:
+        return self.n_fft // 2 + 1
+
+    @property
+    def upper_hz(self) -> float:
+        return self.fmax if self.fmax is not None else self.sample_rate / 2
+
+
+DEFAULT_FEATURE_CONFIG = FeatureConfig()
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=16)
+def get_window(n_fft: int, win_length: int) -> np.ndarray:
+    """
+    Periodic Hann window of `win_length`, zero-padded to n_fft and
+    centered (librosa's default STFT window). Cached and read-only.
+    """
+    n = np.arange(win_length)
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * n / win_length)
+    padded = np.zeros(n_fft, dtype=np.float32)
+    start = (n_fft - win_length) // 2
+    padded[start:start + win_length] = window
+    return _read_only(padded)
+
+
+def _hz_to_mel(hz: np.ndarray) -> np.ndarray:
+    # Slaney scale: linear below 1 kHz, logarithmic above
+    hz = np.asarray(hz, dtype=np.float64)
+    log_mel = 15.0 + np.log(np.maximum(hz, 1000.0) / 1000.0) / (np.log(6.4) / 27.0)
+    return np.where(hz >= 1000.0, log_mel, hz / (200.0 / 3))
+
+
+def _mel_to_hz(mel: np.ndarray) -> np.ndarray:
+    mel = np.asarray(mel, dtype=np.float64)
+    log_hz = 1000.0 * np.exp((np.log(6.4) / 27.0) * (mel - 15.0))
+    return np.where(mel >= 15.0, log_hz, mel * (200.0 / 3))
+
+
+def _triangular_filters(edges_hz: np.ndarray, sample_rate: int, n_fft: int) -> np.ndarray:
+    fft_freqs = np.linspace(0, sample_rate / 2, n_fft // 2 + 1)
+    widths = np.diff(edges_hz)
+    ramps = edges_hz[:, None] - fft_freqs[None, :]
+
+    lower = -ramps[:-2] / widths[:-1, None]
+    upper = ramps[2:] / widths[1:, None]
+    return np.maximum(0.0, np.minimum(lower, upper))
+
+
+@lru_cache(maxsize=16)
+def get_mel_filterbank(
+    sample_rate: int,
+    n_fft: int,
+    n_mels: int,
+    fmin: float,
+    fmax: float
+) -> np.ndarray:
+    """
+    (n_mels, n_fft // 2 + 1) Slaney-normalized mel filterbank, matching
+    librosa.filters.mel defaults. Cached and read-only.
+    """
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(fmin), _hz_to_mel(fmax), n_mels + 2))
+    weights = _triangular_filters(edges, sample_rate, n_fft)
+    weights *= (2.0 / (edges[2:] - edges[:-2]))[:, None]
+    return _read_only(weights.astype(np.float32))
+
+
+@lru_cache(maxsize=16)
+def get_linear_filterbank(
+    sample_rate: int,
+    n_fft: int,
+    n_filters: int,
+    fmin: float,
+    fmax: float
+) -> np.ndarray:
+    """
+    (n_filters, n_fft // 2 + 1) triangular filters evenly spaced in Hz,
+    the front end of LFCC. Cached and read-only.
+    """
+    edges = np.linspace(fmin, fmax, n_filters + 2)
+    return _read_only(_triangular_filters(edges, sample_rate, n_fft).astype(np.float32))
+
+
+@lru_cache(maxsize=16)
+def get_dct_matrix(n_filters: int, n_coeffs: int) -> np.ndarray:
+    """
+    (n_filters, n_coeffs) orthonormal DCT-II basis, so that
+    `log_energies @ basis` gives cepstral coefficients.
+    """
+    n = np.arange(n_filters)[:, None]
+    k = np.arange(n_coeffs)[None, :]
+    basis = np.cos(np.pi / n_filters * (n + 0.5) * k) * np.sqrt(2.0 / n_filters)
+    basis[:, 0] /= np.sqrt(2.0)
+    return _read_only(basis.astype(np.float32))
+
+
+def num_frames(n_samples: int, config: FeatureConfig = DEFAULT_FEATURE_CONFIG) -> int:
+    """
+    STFT frames produced for an n-sample signal; use it to find the valid
+    frames of each clip in a padded batch.
+    """
+    if config.center:
+        n_samples += 2 * (config.n_fft // 2)
+    return max(0, 1 + (n_samples - config.n_fft) // config.hop_length)
+
+
+def frame_signal(
+    waveforms: np.ndarray,
+    config: FeatureConfig = DEFAULT_FEATURE_CONFIG
+) -> np.ndarray:
+    """
+    Frame a (..., samples) signal or padded batch into a
+    (..., n_frames, n_fft) strided view (a copy only when centering pads).
+    """
+    waveforms = np.asarray(waveforms, dtype=np.float32)
+    if config.center:
+        pad = [(0, 0)] * (waveforms.ndim - 1) + [(config.n_fft // 2, config.n_fft // 2)]
+        waveforms = np.pad(waveforms, pad)
+
+    if waveforms.shape[-1] < config.n_fft:
+        return np.zeros(waveforms.shape[:-1] + (0, config.n_fft), dtype=np.float32)
+
+    frames = np.lib.stride_tricks.sliding_window_view(waveforms, config.n_fft, axis=-1)
+    return frames[..., ::config.hop_length, :]
+
+
+def power_spectrogram(
+    frames: np.ndarray,
+    config: FeatureConfig = DEFAULT_FEATURE_CONFIG
+) -> np.ndarray:
+    """
+    |STFT|^2 of (..., n_frames, n_fft) frames, as float32
+    (..., n_frames, n_fft // 2 + 1).
+    """
+    spectrum = np.fft.rfft(frames * get_window(config.n_fft, config.win_length), axis=-1)
+    power = np.square(spectrum.real, dtype=np.float32)
+    power += np.square(spectrum.imag, dtype=np.float32)
+    return power
+
+
+def compute_features(
+    audio: np.ndarray,
+    config: FeatureConfig = DEFAULT_FEATURE_CONFIG,
+    kinds: Sequence[str] = FEATURE_KINDS,
+    framed: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Spectral features from one shared STFT.
+
+    `audio` is a mono 16 kHz waveform, a padded (batch, samples) array
+    from sai_audio.batching.pad_batch, or, with framed=True, frames that
+    are already (..., n_frames, n_fft).
+
+    Returns float32 arrays laid out (..., n_frames, n_features):
+        linear   power spectrogram, n_fft // 2 + 1 bins
+        log_mel  mel power in dB, n_mels bands
+        lfcc     DCT of the dB linear-filterbank energies, n_lfcc coefficients
+    """
+    unknown = set(kinds) - set(FEATURE_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown feature kinds: {sorted(unknown)}")
+
+    frames = audio if framed else frame_signal(audio, config)
+    power = power_spectrogram(frames, config)
+
+    features = {}
+    if "linear" in kinds:
+        features["linear"] = power
+
+    if "log_mel" in kinds:
+        mel_fb = get_mel_filterbank(
+            config.sample_rate, config.n_fft, config.n_mels, config.fmin, config.upper_hz
+        )
+        features["log_mel"] = _power_to_db(power @ mel_fb.T)
+
+    if "lfcc" in kinds:
+        linear_fb = get_linear_filterbank(
+            config.sample_rate, config.n_fft, config.n_linear_filters,
+            config.fmin, config.upper_hz
+        )
+        log_energies = _power_to_db(power @ linear_fb.T)
+        features["lfcc"] = log_energies @ get_dct_matrix(config.n_linear_filters, config.n_lfcc)
+
+    return features
+
+
+def _power_to_db(power: np.ndarray) -> np.ndarray:
+    db = np.maximum(power, np.float32(_AMIN_POWER))
+    np.log10(db, out=db)
+    db *= np.float32(10.0)
+    return db
@@ -1,23 +1,277 @@
 import io
+import struct
 import numpy as np
 import soundfile as sf
-from typing import Optional, Tuple
+from typing import BinaryIO, NamedTuple, Optional, Tuple, Union
 
-def load_audio_bytes(audio_bytes: bytes) -> Tuple[Optional[np.ndarray], Optional[int], Optional[str]]:
+from sai_audio.validate import MAX_DURATION_SEC
+
+MAX_SAMPLE_RATE = 192000
+
+# Extra audio decoded past MAX_DURATION_SEC so that trimming leading
+# silence still leaves a full-length clip.
+TRIM_MARGIN_SEC = 2.0
+DEFAULT_READ_LIMIT_SEC = MAX_DURATION_SEC + TRIM_MARGIN_SEC
+
+# Leading bytes of an upload that probe_audio_header needs to see
+HEADER_PROBE_BYTES = 64 * 1024
+
+# Frames decoded per block when downmixing on read; the interleaved
+# scratch block stays cache-sized whatever the clip length.
+DOWNMIX_BLOCK_FRAMES = 16 * 1024
+
+AudioBuffer = Union[bytes, bytearray, memoryview]
+
+
+class AudioInfo(NamedTuple):
+    frames: int             # 0 when the container does not record it
+    samplerate: int
+    channels: int
+
+    @property
+    def duration_sec(self) -> float:
+        return self.frames / self.samplerate
+
+
+class _BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable file over a bytes-like object.
+
+    io.BytesIO copies anything that is not an immutable bytes object; this
+    reader serves soundfile's readinto() calls straight from the caller's
+    buffer instead.
+    """
+
+    def __init__(self, buffer: AudioBuffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        if n <= 0:
+            return 0
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = max(0, pos)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def probe_audio_bytes(audio_bytes: AudioBuffer) -> Tuple[Optional[AudioInfo], Optional[str]]:
+    """
+    Read only the container header of in-memory audio.
+
+    Returns:
+        audio_info, error_message
+    """
+    with _BufferReader(audio_bytes) as reader:
+        return probe_audio_file(reader)
+
+
+def probe_audio_file(audio_file: BinaryIO) -> Tuple[Optional[AudioInfo], Optional[str]]:
+    """
+    Read only the container header of a seekable binary file object.
+    The file position is restored afterwards.
+
+    Returns:
+        audio_info, error_message
+    """
+    try:
+        start = audio_file.tell()
+        with sf.SoundFile(audio_file) as f:
+            info = AudioInfo(f.frames, f.samplerate, f.channels)
+        audio_file.seek(start)
+    except Exception:
+        return None, "Unsupported or corrupted audio format"
+
+    err = check_audio_info(info)
+    if err is not None:
+        return None, err
+
+    return info, None
+
+
+def probe_audio_header(head: AudioBuffer) -> Tuple[Optional[AudioInfo], Optional[str]]:
+    """
+    Probe the first bytes of a file that is still being received
+    (ideally HEADER_PROBE_BYTES of it), to reject it before the rest
+    arrives.
+
+    `frames` is the length the header declares where the container records
+    it (WAV data chunk, FLAC STREAMINFO); otherwise it only counts the
+    frames within `head`, a lower bound.
+
+    Returns:
+        audio_info, error_message
+    """
+    info, err = probe_audio_bytes(head)
+    if err is not None:
+        return None, err
+
+    declared = _declared_wav_frames(head)
+    if declared is not None and declared > info.frames:
+        info = info._replace(frames=declared)
+    return info, None
+
+
+def _declared_wav_frames(head: AudioBuffer) -> Optional[int]:
+    # Frames in the RIFF/WAVE data chunk as declared by its size field.
+    # Streaming writers leave the size at 0 or 0xFFFFFFFF: unknown.
+    view = memoryview(head).cast("B")
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        return None
+
+    block_align = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = view[pos:pos + 4].tobytes()
+        (size,) = struct.unpack_from("<I", view, pos + 4)
+        if chunk_id == b"fmt " and pos + 22 <= len(view):
+            (block_align,) = struct.unpack_from("<H", view, pos + 20)
+        elif chunk_id == b"data":
+            if not block_align or size in (0, 0xFFFFFFFF):
+                return None
+            return size // block_align
+        pos += 8 + size + (size & 1)
+
+    return None
+
+
+def check_audio_info(info: AudioInfo) -> Optional[str]:
+    """
+    Reject headers describing audio the pipeline cannot use. Any number
+    of channels is accepted (they are downmixed), and so is an unknown
+    frame count (the audio is then decoded up to the read limit).
+    """
+    if info.channels < 1:
+        return "Invalid channel count"
+
+    if not 0 < info.samplerate <= MAX_SAMPLE_RATE:
+        return "Unsupported sample rate"
+
+    return None
+
+
+def load_audio_bytes(
+    audio_bytes: AudioBuffer,
+    max_duration_sec: Optional[float] = DEFAULT_READ_LIMIT_SEC,
+    mono: bool = False
+) -> Tuple[Optional[np.ndarray], Optional[int], Optional[str]]:
     """
     STEP 2: Decode audio bytes into waveform + sample rate.
 
+    Accepts bytes, bytearray or memoryview; the buffer is read in place.
+    Only the first `max_duration_sec` seconds are decoded (None for all).
+    With mono=True, multi-channel audio is downmixed while it is decoded
+    (see load_audio_file).
+
+    Returns:
+        waveform (np.float32), sample_rate (int), error_message (str)
+    """
+    with _BufferReader(audio_bytes) as reader:
+        return load_audio_file(reader, max_duration_sec, mono)
+
+
+def load_audio_file(
+    audio_file: BinaryIO,
+    max_duration_sec: Optional[float] = DEFAULT_READ_LIMIT_SEC,
+    mono: bool = False
+) -> Tuple[Optional[np.ndarray], Optional[int], Optional[str]]:
+    """
+    STEP 2 (file variant): Decode a seekable binary file object, such as the
+    spooled file behind a FastAPI UploadFile, into waveform + sample rate.
+
+    The header is checked before any samples are decoded, and only the
+    first `max_duration_sec` seconds are read (None for all).
+
+    The waveform is (frames,) for mono files and (frames, channels)
+    otherwise. With mono=True it is always (frames,): channels are
+    averaged block by block into one preallocated buffer, so the full
+    multi-channel signal never exists in memory.
+
     Returns:
         waveform (np.float32), sample_rate (int), error_message (str)
     """
     try:
-        with sf.SoundFile(io.BytesIO(audio_bytes)) as f:
-            waveform = f.read(dtype="float32")
+        with sf.SoundFile(audio_file) as f:
+            info = AudioInfo(f.frames, f.samplerate, f.channels)
+            err = check_audio_info(info)
+            if err is not None:
+                return None, None, err
+
+            frames = frames_to_read(info, max_duration_sec)
+            if frames is None:
+                # Unknown length and no limit: decode to the end
+                waveform = f.read(dtype="float32")
+                if mono and waveform.ndim == 2:
+                    waveform = waveform.mean(axis=1, dtype=np.float32)
+            elif mono and info.channels > 1:
+                waveform = _read_downmixed(f, frames)
+            else:
+                waveform = f.read(frames, dtype="float32")
             sample_rate = f.samplerate
     except Exception:
         return None, None, "Unsupported or corrupted audio format"
 
-    if waveform.ndim > 2:
-        return None, None, "Unsupported multi-channel audio"
+    if len(waveform) == 0:
+        return None, None, "Empty audio stream"
 
     return waveform, sample_rate, None
+
+
+def frames_to_read(info: AudioInfo, max_duration_sec: Optional[float]) -> Optional[int]:
+    """
+    Frames to decode: the file's length capped at `max_duration_sec`, the
+    cap alone when the length is unknown, or None (to the end) for an
+    unknown length without a cap.
+    """
+    limit = None if max_duration_sec is None else int(max_duration_sec * info.samplerate)
+    if info.frames <= 0:
+        return limit
+    return info.frames if limit is None else min(info.frames, limit)
+
+
+def _read_downmixed(f: sf.SoundFile, frames: int) -> np.ndarray:
+    mono = np.empty(frames, dtype=np.float32)
+    block = np.empty((min(frames, DOWNMIX_BLOCK_FRAMES), f.channels), dtype=np.float32)
+
+    filled = 0
+    while filled < frames:
+        n = min(len(block), frames - filled)
+        n_read = len(f.read(n, dtype="float32", always_2d=True, out=block[:n]))
+        if n_read == 0:
+            break
+        # Column adds, then one divide: the same float32 result as
+        # np.mean(axis=1), which is slow over a 2-wide strided axis
+        out = mono[filled:filled + n_read]
+        np.copyto(out, block[:n_read, 0])
+        for ch in range(1, f.channels):
+            out += block[:n_read, ch]
+        out /= np.float32(f.channels)
+        filled += n_read
+
+    return mono[:filled]
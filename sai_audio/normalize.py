@@ -1,17 +1,24 @@
 import numpy as np
-import librosa
 from typing import Tuple
 
+from sai_audio.resample import DEFAULT_RESAMPLE_QUALITY, resample
+
 TARGET_SAMPLE_RATE = 16000
 
 def normalize_audio(
     waveform: np.ndarray,
-    sample_rate: int
+    sample_rate: int,
+    quality: str = DEFAULT_RESAMPLE_QUALITY
 ) -> Tuple[np.ndarray, int]:
     """
     STEP 3:
     - Convert to mono if needed
-    - Resample to 16 kHz
+    - Resample to 16 kHz (see sai_audio.resample for quality tiers)
+
+    2-D input is (frames, channels), soundfile's layout. Float32 mono
+    input at 16 kHz is returned as is, without a copy; decode with
+    load_audio_bytes(..., mono=True) to get there without ever holding
+    the multi-channel signal.
 
     Returns:
         normalized_waveform (np.float32)
@@ -20,21 +27,18 @@ def normalize_audio(
 
     # 1. Convert to mono
     if waveform.ndim == 2:
-        # shape: (samples, channels) or (channels, samples)
-        if waveform.shape[0] < waveform.shape[1]:
-            waveform = np.mean(waveform, axis=0)
-        else:
-            waveform = np.mean(waveform, axis=1)
+        waveform = np.mean(waveform, axis=1)
 
-    # 2. Ensure float32
-    waveform = waveform.astype(np.float32)
+    # 2. Ensure float32 (no copy when it already is)
+    waveform = np.asarray(waveform, dtype=np.float32)
 
     # 3. Resample if needed
     if sample_rate != TARGET_SAMPLE_RATE:
-        waveform = librosa.resample(
+        waveform = resample(
             waveform,
             orig_sr=sample_rate,
-            target_sr=TARGET_SAMPLE_RATE
+            target_sr=TARGET_SAMPLE_RATE,
+            quality=quality
         )
 
     return waveform, TARGET_SAMPLE_RATE
@@ -1,55 +1,222 @@
-from typing import Dict, Any
+import io
+import time
+from typing import Dict, Any, BinaryIO, Iterable, List, Optional, Sequence, Union
 
-from sai_audio.decode import decode_base64_audio
-from sai_audio.load_audio import load_audio_bytes
-from sai_audio.normalize import normalize_audio
+import numpy as np
+import soundfile as sf
+
+from sai_audio.batching import bucket_waveforms
+from sai_audio.decode import (
+    Base64Input,
+    MAX_AUDIO_BYTES,
+    MIN_AUDIO_BYTES,
+    decode_base64_audio,
+)
+from sai_audio.load_audio import AudioBuffer, load_audio_bytes, load_audio_file
+from sai_audio.normalize import TARGET_SAMPLE_RATE, normalize_audio
 from sai_audio.validate import trim_and_validate
 
+# Rates primed by warmup(): browser MediaRecorder output dominates traffic
+WARMUP_SAMPLE_RATES = (48000, 44100)
+
 
-def process_audio_base64(audio_base64: str) -> Dict[str, Any]:
+def process_audio_base64(audio_base64: Base64Input) -> Dict[str, Any]:
     """
     Full Sai audio preprocessing pipeline.
 
-    Returns a dict safe for backend consumption.
+    Returns a dict safe for backend consumption. Every result, valid or
+    not, carries "timings": milliseconds spent in each stage that ran
+    ("decode", "load", "normalize", "trim").
     """
+    timings: Dict[str, float] = {}
 
     # STEP 1: Base64 decode
+    started = time.perf_counter()
     audio_bytes, err = decode_base64_audio(audio_base64)
+    timings["decode"] = _elapsed_ms(started)
     if err is not None or audio_bytes is None:
-        return {
-            "is_valid": False,
-            "error": err,
-            "warnings": []
+        return _failure(err, timings=timings)
+
+    return _process_bytes(audio_bytes, timings)
+
+
+def process_audio_bytes(audio_bytes: AudioBuffer) -> Dict[str, Any]:
+    """
+    Preprocessing pipeline for raw (already decoded) audio bytes.
+
+    Accepts bytes, bytearray or memoryview and reads it in place.
+    Returns the same dict as process_audio_base64.
+    """
+    return _process_bytes(audio_bytes, {})
+
+
+def process_audio_file(audio_file: BinaryIO) -> Dict[str, Any]:
+    """
+    Preprocessing pipeline for a seekable binary file object, e.g.
+    `UploadFile.file`. The file is handed to soundfile directly.
+
+    Returns the same dict as process_audio_base64.
+    """
+
+    timings: Dict[str, float] = {}
+    try:
+        start = audio_file.tell()
+        size = audio_file.seek(0, 2) - start
+        audio_file.seek(start)
+    except (AttributeError, OSError, ValueError):
+        return _failure("Audio input must be a seekable binary file", timings=timings)
+
+    err = _check_size(size)
+    if err is not None:
+        return _failure(err, timings=timings)
+
+    # STEP 2: Load audio file
+    started = time.perf_counter()
+    waveform, sample_rate, err = load_audio_file(audio_file, mono=True)
+    timings["load"] = _elapsed_ms(started)
+    return _process_waveform(waveform, sample_rate, err, timings)
+
+
+def process_audio_batch(
+    inputs: Sequence[Union[Base64Input, AudioBuffer]]
+) -> Dict[str, Any]:
+    """
+    Preprocess many clips and group them into padded length buckets for
+    batched inference.
+
+    Each input may be a base64 str, raw bytes-like audio or a seekable
+    binary file. Failures stay per item and never affect other clips.
+
+    Returns:
+        {
+            "items":   one pipeline result dict per input, in input order,
+            "buckets": list of sai_audio.batching.PaddedBatch over the
+                       valid items (PaddedBatch.indices refer to "items")
         }
 
+    Valid items' "waveform" entries are views into their bucket's padded
+    array, so the batch holds each clip's samples only once.
+    """
+    items = [_process_input(audio) for audio in inputs]
+
+    valid = [i for i, item in enumerate(items) if item["is_valid"]]
+    buckets = bucket_waveforms(
+        [items[i]["waveform"] for i in valid], TARGET_SAMPLE_RATE
+    )
+
+    for batch in buckets:
+        batch.indices[:] = [valid[i] for i in batch.indices]
+        for row, index in enumerate(batch.indices):
+            items[index]["waveform"] = batch.waveforms[row, :batch.lengths[row]]
+
+    return {
+        "items": items,
+        "buckets": buckets
+    }
+
+
+def _process_input(audio: Union[Base64Input, AudioBuffer]) -> Dict[str, Any]:
+    try:
+        if isinstance(audio, str):
+            return process_audio_base64(audio)
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            return process_audio_bytes(audio)
+        if hasattr(audio, "read"):
+            return process_audio_file(audio)
+    except Exception:
+        return _failure("Unexpected error while preprocessing audio")
+
+    return _failure("Unsupported audio input type")
+
+
+def warmup(sample_rates: Iterable[int] = WARMUP_SAMPLE_RATES) -> None:
+    """
+    Run a short synthetic clip per sample rate through the full pipeline.
+
+    Call once at server startup: it pays the deferred scipy import and
+    builds the cached resampling filters, so the first real request does
+    not.
+    """
+    sample_rates = tuple(sample_rates)
+    for sample_rate in sample_rates:
+        t = np.arange(2 * sample_rate, dtype=np.float32) / sample_rate
+        tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+
+        buf = io.BytesIO()
+        sf.write(buf, tone, sample_rate, format="WAV", subtype="PCM_16")
+        process_audio_bytes(buf.getbuffer())
+
+    # 16 kHz input skips resampling but still exercises load + trim
+    if TARGET_SAMPLE_RATE not in sample_rates:
+        warmup((TARGET_SAMPLE_RATE,))
+
+
+def _process_bytes(audio_bytes: AudioBuffer, timings: Dict[str, float]) -> Dict[str, Any]:
+    err = _check_size(memoryview(audio_bytes).nbytes)
+    if err is not None:
+        return _failure(err, timings=timings)
+
     # STEP 2: Load audio bytes
-    waveform, sample_rate, err = load_audio_bytes(audio_bytes)
+    started = time.perf_counter()
+    waveform, sample_rate, err = load_audio_bytes(audio_bytes, mono=True)
+    timings["load"] = _elapsed_ms(started)
+    return _process_waveform(waveform, sample_rate, err, timings)
+
+
+def _process_waveform(
+    waveform: Optional[np.ndarray],
+    sample_rate: Optional[int],
+    err: Optional[str],
+    timings: Dict[str, float]
+) -> Dict[str, Any]:
     if err is not None or waveform is None or sample_rate is None:
-        return {
-            "is_valid": False,
-            "error": err,
-            "warnings": []
-        }
+        return _failure(err, timings=timings)
 
     # STEP 3: Normalize (mono + 16kHz)
+    started = time.perf_counter()
     waveform, sample_rate = normalize_audio(waveform, sample_rate)
+    timings["normalize"] = _elapsed_ms(started)
 
     # STEP 4: Trim silence + duration checks
+    started = time.perf_counter()
     waveform, duration_sec, is_valid, warnings = trim_and_validate(
         waveform, sample_rate
     )
+    timings["trim"] = _elapsed_ms(started)
 
     if not is_valid:
-        return {
-            "is_valid": False,
-            "error": "Invalid audio after preprocessing",
-            "warnings": warnings
-        }
+        return _failure("Invalid audio after preprocessing", warnings, timings)
 
     return {
         "is_valid": True,
         "waveform": waveform,
         "sample_rate": sample_rate,
         "duration_sec": duration_sec,
-        "warnings": warnings
+        "warnings": warnings,
+        "timings": timings
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
+
+
+def _check_size(num_bytes: int) -> Optional[str]:
+    if num_bytes < MIN_AUDIO_BYTES:
+        return "Audio data too small to be valid"
+    if num_bytes > MAX_AUDIO_BYTES:
+        return "Audio input exceeds maximum allowed size"
+    return None
+
+
+def _failure(
+    err: Optional[str],
+    warnings: Optional[List[str]] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    return {
+        "is_valid": False,
+        "error": err,
+        "warnings": warnings or [],
+        "timings": timings or {}
     }
@@ -0,0 +1,190 @@
+from functools import lru_cache
+from math import gcd
+from typing import NamedTuple
+
+import numpy as np
+
+# scipy and librosa are imported on first use: together they add about a
+# second to `import sai_audio.pipeline`, and /health does not need them.
+
+RESAMPLE_QUALITIES = ("fast", "balanced", "reference")
+DEFAULT_RESAMPLE_QUALITY = "balanced"
+
+
+class _FilterDesign(NamedTuple):
+    zero_crossings: int   # filter half-length, in zero crossings of the sinc
+    kaiser_beta: float
+    cutoff: float         # fraction of the lower rate's Nyquist frequency
+
+
+# "reference" is not designed here: it delegates to librosa.resample,
+# the behaviour normalize_audio had before this module existed.
+_DESIGNS = {
+    "fast": _FilterDesign(zero_crossings=4, kaiser_beta=5.0, cutoff=0.90),
+    "balanced": _FilterDesign(zero_crossings=10, kaiser_beta=8.0, cutoff=0.95),
+}
+
+
+class PolyphaseFilter:
+    """
+    Precomputed anti-aliasing FIR for one (orig_sr, target_sr, quality).
+
+    The taps are pre-padded so that output sample 0 lines up with input
+    sample 0, which makes applying the filter a single upfirdn call plus a
+    slice.
+    """
+
+    __slots__ = ("up", "down", "taps", "offset")
+
+    def __init__(self, up: int, down: int, design: _FilterDesign):
+        from scipy import signal
+
+        max_rate = max(up, down)
+        half_len = design.zero_crossings * max_rate
+
+        taps = signal.firwin(
+            2 * half_len + 1,
+            design.cutoff / max_rate,
+            window=("kaiser", design.kaiser_beta)
+        ) * up
+
+        pre_pad = down - half_len % down
+        self.up = up
+        self.down = down
+        self.taps = np.concatenate((np.zeros(pre_pad), taps)).astype(np.float32)
+        self.offset = (half_len + pre_pad) // down
+
+    def output_length(self, n_in: int) -> int:
+        return -(-n_in * self.up // self.down)
+
+    def apply(self, waveform: np.ndarray) -> np.ndarray:
+        from scipy import signal
+
+        n_in = len(waveform)
+        n_out = self.output_length(n_in)
+
+        # Integer decimation (up == 1, e.g. 48k -> 16k) never needs this;
+        # rational ratios occasionally need a longer zero tail.
+        taps = self.taps
+        needed = self.down * (n_out + self.offset - 1) - (n_in - 1) * self.up
+        if needed > len(taps):
+            taps = np.concatenate((taps, np.zeros(needed - len(taps), dtype=np.float32)))
+
+        resampled = signal.upfirdn(taps, waveform, self.up, self.down)
+        return resampled[self.offset:self.offset + n_out]
+
+
+@lru_cache(maxsize=32)
+def get_polyphase_filter(orig_sr: int, target_sr: int, quality: str) -> PolyphaseFilter:
+    """
+    Return the cached filter for a rate pair and quality tier.
+    """
+    g = gcd(orig_sr, target_sr)
+    return PolyphaseFilter(target_sr // g, orig_sr // g, _DESIGNS[quality])
+
+
+def resample(
+    waveform: np.ndarray,
+    orig_sr: int,
+    target_sr: int,
+    quality: str = DEFAULT_RESAMPLE_QUALITY
+) -> np.ndarray:
+    """
+    Resample a mono float32 waveform.
+
+    Quality tiers:
+        fast      - short Kaiser-windowed filter, lowest CPU cost
+        balanced  - default; within ~1e-3 of librosa in the speech band
+        reference - librosa.resample, for parity checks
+
+    Returns:
+        resampled waveform (np.float32)
+    """
+    if quality not in RESAMPLE_QUALITIES:
+        raise ValueError(f"Unknown resample quality: {quality!r}")
+
+    if orig_sr == target_sr:
+        return waveform
+
+    if quality == "reference":
+        import librosa
+        return librosa.resample(waveform, orig_sr=orig_sr, target_sr=target_sr)
+
+    return get_polyphase_filter(orig_sr, target_sr, quality).apply(waveform)
+
+
+class StreamingResampler:
+    """
+    Resample a mono float32 stream chunk by chunk.
+
+    Uses the same cached filter as resample(), carrying the input history
+    the filter still needs between calls, so concatenating every
+    process() output plus flush() reproduces resample() over the whole
+    signal. The "reference" tier has no streaming form.
+    """
+
+    def __init__(
+        self,
+        orig_sr: int,
+        target_sr: int,
+        quality: str = DEFAULT_RESAMPLE_QUALITY
+    ):
+        if quality not in _DESIGNS:
+            raise ValueError(f"Resample quality cannot be streamed: {quality!r}")
+
+        self._filter = None
+        if orig_sr != target_sr:
+            self._filter = get_polyphase_filter(orig_sr, target_sr, quality)
+
+        # Input samples from index _history_start on; the start stays a
+        # multiple of `down` so upfirdn's output phase lines up.
+        self._history = np.zeros(0, dtype=np.float32)
+        self._history_start = 0
+        self._n_in = 0
+        self._n_out = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Feed the next input samples; returns every output sample whose
+        inputs have now all arrived.
+        """
+        self._n_in += len(chunk)
+        if self._filter is None:
+            return chunk
+
+        f = self._filter
+        self._history = np.concatenate((self._history, chunk))
+        ready = (self._n_in * f.up - 1) // f.down - f.offset + 1
+        return self._emit(ready, self._history)
+
+    def flush(self) -> np.ndarray:
+        """
+        End of stream: return the remaining output, treating the input as
+        zero past its end exactly like resample() does.
+        """
+        if self._filter is None:
+            return np.zeros(0, dtype=np.float32)
+
+        f = self._filter
+        tail = np.zeros(len(f.taps) // f.up + 2, dtype=np.float32)
+        return self._emit(f.output_length(self._n_in), np.concatenate((self._history, tail)))
+
+    def _emit(self, stop: int, history: np.ndarray) -> np.ndarray:
+        from scipy import signal
+
+        f = self._filter
+        if stop <= self._n_out or not len(history):
+            return np.zeros(0, dtype=np.float32)
+
+        shift = self._history_start // f.down * f.up
+        first = self._n_out + f.offset - shift
+        resampled = signal.upfirdn(f.taps, history, f.up, f.down)
+        out = resampled[first:first + stop - self._n_out]
+        self._n_out = stop
+
+        # Drop input no future output sample reaches back to
+        needed = -(-((self._n_out + f.offset) * f.down - len(f.taps) + 1) // f.up)
+        keep_from = max(self._history_start, needed // f.down * f.down)
+        self._history = self._history[keep_from - self._history_start:]
+        self._history_start = keep_from
+        return out
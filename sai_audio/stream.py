@@ -0,0 +1,209 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sai_audio.load_audio import (
+    DEFAULT_READ_LIMIT_SEC,
+    AudioBuffer,
+    AudioInfo,
+    check_audio_info,
+)
+from sai_audio.normalize import TARGET_SAMPLE_RATE
+from sai_audio.resample import DEFAULT_RESAMPLE_QUALITY, StreamingResampler
+from sai_audio.validate import TRIM_HOP_LENGTH, silence_bounds, validate_duration
+
+# Live streams are mono or stereo at 8 kHz or more, whatever a file
+# upload may use
+STREAM_MAX_CHANNELS = 2
+STREAM_MIN_SAMPLE_RATE = 8000
+
+# Little-endian interleaved PCM, as produced by an AudioWorklet
+# (Float32Array) or a 16-bit encoder.
+STREAM_SAMPLE_FORMATS = {
+    "s16": np.dtype("<i2"),
+    "f32": np.dtype("<f4"),
+}
+
+
+class AudioStream:
+    """
+    Incremental version of the preprocessing pipeline for raw PCM frames
+    arriving over time (e.g. from a WebSocket).
+
+    Each push() downmixes to mono, resamples to 16 kHz with carried
+    filter state and updates per-hop energies, so result() only has to
+    locate the speech bounds and apply the duration rules; it can be
+    called after any push to get a provisional result.
+
+    Memory is fixed: the 16 kHz buffer holds `max_duration_sec` seconds and
+    later audio is dropped (see `is_full`), like the file loaders only
+    decoding the first DEFAULT_READ_LIMIT_SEC seconds.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int,
+        sample_format: str,
+        quality: str = DEFAULT_RESAMPLE_QUALITY,
+        max_duration_sec: float = DEFAULT_READ_LIMIT_SEC
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._dtype = STREAM_SAMPLE_FORMATS[sample_format]
+        self._frame_bytes = channels * self._dtype.itemsize
+        self._carry = b""
+        self._resampler = StreamingResampler(sample_rate, TARGET_SAMPLE_RATE, quality)
+        self._finished = False
+
+        capacity = int(max_duration_sec * TARGET_SAMPLE_RATE)
+        self._buffer = np.zeros(capacity, dtype=np.float32)
+        self._length = 0
+        self._hop_energy = np.zeros(capacity // TRIM_HOP_LENGTH + 1, dtype=np.float64)
+        self._full_hops = 0
+
+    @property
+    def duration_sec(self) -> float:
+        """Seconds of 16 kHz audio buffered so far (before trimming)."""
+        return self._length / TARGET_SAMPLE_RATE
+
+    @property
+    def is_full(self) -> bool:
+        return self._length == len(self._buffer)
+
+    def push(self, data: AudioBuffer) -> Optional[str]:
+        """
+        Append interleaved PCM bytes. Frames may be split across pushes.
+
+        Returns:
+            error_message or None
+        """
+        if self._finished:
+            return "Audio stream already finished"
+        if self.is_full:
+            return None
+
+        view = memoryview(data).cast("B")
+        if self._carry:
+            view = memoryview(self._carry + view.tobytes())
+
+        usable = len(view) - len(view) % self._frame_bytes
+        self._carry = view[usable:].tobytes()
+        if usable == 0:
+            return None
+
+        samples = np.frombuffer(view[:usable], dtype=self._dtype)
+        if self._dtype.kind == "i":
+            samples = np.multiply(samples, 1.0 / 32768.0, dtype=np.float32)
+        else:
+            samples = samples.astype(np.float32)
+
+        if not np.isfinite(samples).all():
+            return "Audio stream contains invalid samples"
+
+        self._append(self._resampler.process(self._downmix(samples)))
+        return None
+
+    def finish(self) -> None:
+        """
+        End of stream: emit the resampler's tail. Further pushes fail.
+        """
+        if not self._finished:
+            self._finished = True
+            self._carry = b""
+            self._append(self._resampler.flush())
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Pipeline result for the audio received so far, in the same shape as
+        sai_audio.pipeline.process_audio_bytes. "waveform" is a view into
+        the stream's buffer and changes as audio arrives.
+
+        Also reports "speech_end_sec" and "trailing_silence_sec" so callers
+        can tell when the speaker has stopped. "timings" is always empty:
+        the stages run incrementally as chunks are pushed.
+        """
+        n = self._length
+        energies = self._hop_energy[:self._full_hops + 1]
+        tail = self._buffer[self._full_hops * TRIM_HOP_LENGTH:n]
+        energies[-1] = np.dot(tail, tail)
+
+        start, end = silence_bounds(energies, n) if n else (0, 0)
+        if end == start:
+            return _failure("Invalid audio after preprocessing", ["silence_only_audio"])
+
+        waveform, duration_sec, is_valid, warnings = validate_duration(
+            self._buffer[start:end], TARGET_SAMPLE_RATE
+        )
+        if not is_valid:
+            return _failure("Invalid audio after preprocessing", warnings)
+
+        return {
+            "is_valid": True,
+            "waveform": waveform,
+            "sample_rate": TARGET_SAMPLE_RATE,
+            "duration_sec": duration_sec,
+            "warnings": warnings,
+            "timings": {},
+            "speech_end_sec": end / TARGET_SAMPLE_RATE,
+            "trailing_silence_sec": (n - end) / TARGET_SAMPLE_RATE
+        }
+
+    def _downmix(self, samples: np.ndarray) -> np.ndarray:
+        if self.channels == 1:
+            return samples
+        return samples.reshape(-1, self.channels).mean(axis=1)
+
+    def _append(self, resampled: np.ndarray) -> None:
+        n = min(len(resampled), len(self._buffer) - self._length)
+        if n <= 0:
+            return
+
+        start = self._length
+        self._buffer[start:start + n] = resampled[:n]
+        self._length += n
+
+        # Energies of the hops completed by this append
+        full_hops = self._length // TRIM_HOP_LENGTH
+        if full_hops > self._full_hops:
+            hops = self._buffer[self._full_hops * TRIM_HOP_LENGTH:full_hops * TRIM_HOP_LENGTH]
+            hops = hops.reshape(-1, TRIM_HOP_LENGTH)
+            self._hop_energy[self._full_hops:full_hops] = np.einsum("ij,ij->i", hops, hops)
+            self._full_hops = full_hops
+
+
+def open_audio_stream(
+    sample_rate: int,
+    channels: int = 1,
+    sample_format: str = "s16",
+    quality: str = DEFAULT_RESAMPLE_QUALITY
+) -> Tuple[Optional[AudioStream], Optional[str]]:
+    """
+    Validate client-declared stream parameters and create an AudioStream.
+
+    Returns:
+        (stream, error_message)
+    """
+    if sample_format not in STREAM_SAMPLE_FORMATS:
+        return None, "Unsupported sample format"
+
+    if channels > STREAM_MAX_CHANNELS:
+        return None, "Unsupported multi-channel audio"
+    if sample_rate < STREAM_MIN_SAMPLE_RATE:
+        return None, "Unsupported sample rate"
+
+    # frames=0: the length of a live stream is not known up front
+    err = check_audio_info(AudioInfo(frames=0, samplerate=sample_rate, channels=channels))
+    if err is not None:
+        return None, err
+
+    return AudioStream(sample_rate, channels, sample_format, quality), None
+
+
+def _failure(err: Optional[str], warnings: Optional[List[str]] = None) -> Dict[str, Any]:
+    return {
+        "is_valid": False,
+        "error": err,
+        "warnings": warnings or [],
+        "timings": {}
+    }
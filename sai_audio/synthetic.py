@@ -0,0 +1,106 @@
+import io
+import zlib
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+SYNTHETIC_KINDS = ("speech", "padded", "noise")
+
+# Syllable rate and pitch range of the speech-like source
+_SYLLABLE_HZ = 4.0
+_PITCH_HZ = (110.0, 190.0)
+_HARMONICS = 12
+
+# Share of a "padded" clip that is digital silence, split across both ends
+PADDED_SILENCE_SHARE = 0.5
+
+NOISE_DBFS = -30.0
+
+
+def synthetic_waveform(
+    sample_rate: int,
+    duration_sec: float,
+    channels: int = 1,
+    kind: str = "speech",
+    seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Deterministic test audio as float32 (frames, channels):
+        speech   voiced harmonic source with a gliding pitch and syllable-rate
+                 envelope over a faint noise floor
+        padded   speech in the middle, digital silence on both ends
+        noise    white noise at NOISE_DBFS, no speech at all
+
+    The same arguments always give the same samples; `seed` defaults to
+    one derived from the other arguments.
+    """
+    if kind not in SYNTHETIC_KINDS:
+        raise ValueError(f"Unknown synthetic audio kind: {kind!r}")
+    if sample_rate <= 0 or channels <= 0 or duration_sec <= 0:
+        raise ValueError("sample_rate, channels and duration_sec must be positive")
+
+    if seed is None:
+        seed = zlib.crc32(f"{kind}:{sample_rate}:{channels}:{duration_sec}".encode())
+    rng = np.random.default_rng(seed)
+
+    frames = int(round(duration_sec * sample_rate))
+    out = np.zeros((frames, channels), dtype=np.float32)
+
+    if kind == "noise":
+        scale = np.float32(10 ** (NOISE_DBFS / 20) * np.sqrt(3.0))
+        for ch in range(channels):
+            out[:, ch] = rng.uniform(-1.0, 1.0, frames).astype(np.float32) * scale
+        return out
+
+    start, end = 0, frames
+    if kind == "padded":
+        pad = int(frames * PADDED_SILENCE_SHARE / 2)
+        start, end = pad, frames - pad
+
+    voice = _speech_like(end - start, sample_rate, rng)
+    for ch in range(channels):
+        # Later channels: quieter, with their own noise floor
+        gain = np.float32(1.0 - 0.15 * ch)
+        floor = rng.normal(0.0, 0.002, end - start).astype(np.float32)
+        out[start:end, ch] = voice * gain + floor
+    return out
+
+
+def synthetic_wav_bytes(
+    sample_rate: int,
+    duration_sec: float,
+    channels: int = 1,
+    kind: str = "speech",
+    seed: Optional[int] = None,
+    subtype: str = "PCM_16"
+) -> bytes:
+    """
+    synthetic_waveform() encoded as a WAV file.
+    """
+    waveform = synthetic_waveform(sample_rate, duration_sec, channels, kind, seed)
+    buf = io.BytesIO()
+    sf.write(buf, waveform, sample_rate, format="WAV", subtype=subtype)
+    return buf.getvalue()
+
+
+def _speech_like(frames: int, sample_rate: int, rng: np.random.Generator) -> np.ndarray:
+    t = np.arange(frames, dtype=np.float64) / sample_rate
+
+    # Slow random pitch contour, integrated into a phase
+    knots = max(2, int(t[-1] * _SYLLABLE_HZ) + 2) if frames else 2
+    contour = rng.uniform(*_PITCH_HZ, knots)
+    pitch = np.interp(t, np.linspace(0.0, t[-1] if frames else 0.0, knots), contour)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+
+    nyquist = sample_rate / 2
+    voice = np.zeros(frames, dtype=np.float64)
+    for k in range(1, _HARMONICS + 1):
+        # Harmonics above Nyquist would alias at low sample rates
+        voiced = k * pitch < nyquist
+        voice += np.where(voiced, np.sin(k * phase), 0.0) / k
+
+    # Syllables: raised-cosine bursts with short gaps between them
+    envelope = np.clip(np.sin(np.pi * _SYLLABLE_HZ * t) ** 2 * 1.4 - 0.2, 0.0, 1.0)
+    voice *= envelope * (0.3 / np.max(np.abs(voice), initial=1e-9))
+    return voice.astype(np.float32)
@@ -0,0 +1,74 @@
+import base64
+import io
+
+from sai_audio.decode import decode_base64_audio
+
+
+def io_stream(text):
+    return io.BytesIO(text.encode())
+
+
+def test_decode_accepts_bytes_memoryview_and_files():
+    payload = bytes(range(256)) * 40
+    encoded = base64.b64encode(payload)
+
+    for source in (
+        encoded.decode(),
+        encoded,
+        memoryview(encoded),
+        io.BytesIO(encoded),
+        "  \n" + encoded.decode() + "\r\n",
+    ):
+        audio_bytes, err = decode_base64_audio(source)
+        assert err is None
+        assert audio_bytes.readonly and audio_bytes == payload
+
+
+def test_decode_rejects_oversized_input_before_decoding():
+    encoded = "A" * 4096
+    audio_bytes, err = decode_base64_audio(encoded, max_bytes=1024)
+    assert audio_bytes is None
+    assert err == "Audio input exceeds maximum allowed size"
+
+    audio_bytes, err = decode_base64_audio(io_stream(encoded), max_bytes=1024)
+    assert audio_bytes is None
+    assert err == "Audio input exceeds maximum allowed size"
+
+
+def test_decode_rejects_oversized_seekable_stream_without_reading(monkeypatch):
+    import sai_audio.decode as decode_module
+
+    def no_decoding(*args, **kwargs):
+        raise AssertionError("decoded an oversized stream")
+
+    monkeypatch.setattr(decode_module.binascii, "a2b_base64", no_decoding)
+    stream = io_stream("A" * (3 * 1024 * 1024))
+    audio_bytes, err = decode_base64_audio(stream, max_bytes=1024 * 1024)
+    assert audio_bytes is None
+    assert err == "Audio input exceeds maximum allowed size"
+    assert stream.tell() == 0
+
+
+def test_decode_rejects_malformed_input_across_chunks(monkeypatch):
+    import sai_audio.decode as decode_module
+
+    monkeypatch.setattr(decode_module, "DECODE_CHUNK_SIZE", 8)
+    payload = base64.b64encode(b"\x01" * 2048).decode()
+
+    for bad in (
+        payload[:16] + "QQ==" + payload[20:],
+        payload[:16] + " " + payload[17:],
+        payload[:-1],
+    ):
+        audio_bytes, err = decode_base64_audio(bad)
+        assert err == "Invalid base64 encoding"
+        audio_bytes, err = decode_base64_audio(io_stream(bad))
+        assert err == "Invalid base64 encoding"
+
+
+def test_decode_rejects_non_contiguous_buffers():
+    encoded = base64.b64encode(b"\x02" * 2048)
+    for strided in (memoryview(encoded)[::2], memoryview(encoded * 2).cast("B")[::2]):
+        audio_bytes, err = decode_base64_audio(strided)
+        assert audio_bytes is None
+        assert err == "Invalid base64 encoding"
@@ -0,0 +1,62 @@
+import numpy as np
+
+from sai_audio.batching import pad_batch
+from sai_audio.features import (
+    DEFAULT_FEATURE_CONFIG,
+    compute_features,
+    frame_signal,
+    get_mel_filterbank,
+    num_frames,
+)
+
+
+def speech_like(seconds, seed):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * 16000)) / 16000
+    tone = 0.3 * np.sin(2 * np.pi * 180 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return (tone + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def test_matches_librosa():
+    import librosa
+
+    cfg = DEFAULT_FEATURE_CONFIG
+    y = speech_like(2.0, 0)
+    features = compute_features(y)
+
+    stft = librosa.stft(y, n_fft=cfg.n_fft, hop_length=cfg.hop_length, win_length=cfg.win_length)
+    power = np.abs(stft) ** 2
+    np.testing.assert_allclose(features["linear"].T, power, rtol=1e-3, atol=1e-4)
+
+    mel = librosa.feature.melspectrogram(
+        S=power, sr=cfg.sample_rate, n_mels=cfg.n_mels, fmin=cfg.fmin, fmax=cfg.upper_hz
+    )
+    expected = librosa.power_to_db(mel, top_db=None)
+    np.testing.assert_allclose(features["log_mel"].T, expected, atol=1e-2)
+
+    assert all(f.dtype == np.float32 for f in features.values())
+    assert features["lfcc"].shape == (num_frames(len(y)), cfg.n_lfcc)
+
+
+def test_batch_matches_single_clips():
+    clips = [speech_like(1.5, 1), speech_like(2.2, 2)]
+    padded, lengths, _ = pad_batch(clips)
+
+    batch = compute_features(padded)
+    for i, clip in enumerate(clips):
+        single = compute_features(clip)
+        # Frames near the end of a shorter clip see padding zeros either way
+        valid = num_frames(lengths[i]) - DEFAULT_FEATURE_CONFIG.n_fft // DEFAULT_FEATURE_CONFIG.hop_length
+        for kind, values in single.items():
+            np.testing.assert_allclose(batch[kind][i, :valid], values[:valid], rtol=1e-4, atol=1e-4)
+
+    framed = compute_features(frame_signal(padded), framed=True, kinds=("log_mel",))
+    np.testing.assert_array_equal(framed["log_mel"], batch["log_mel"])
+
+
+def test_filterbanks_are_cached_and_read_only():
+    cfg = DEFAULT_FEATURE_CONFIG
+    args = (cfg.sample_rate, cfg.n_fft, cfg.n_mels, cfg.fmin, cfg.upper_hz)
+    fb = get_mel_filterbank(*args)
+    assert get_mel_filterbank(*args) is fb
+    assert not fb.flags.writeable
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+# Budget for a cold `import sai_audio.pipeline` (numpy + soundfile today).
+# Autoscaled pods must answer /health quickly, so heavy dependencies have
+# to stay deferred until warmup() or the first request.
+IMPORT_BUDGET_SEC = 0.5
+DEFERRED_MODULES = ("scipy", "librosa", "numba", "audioread")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import sai_audio.pipeline
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+
+def measure_import():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(modules=DEFERRED_MODULES)],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    return float(out[-2]), [m for m in out[-1].split(",") if m]
+
+
+def test_pipeline_import_defers_heavy_dependencies():
+    _, loaded = measure_import()
+    assert loaded == []
+
+
+def test_pipeline_import_within_budget():
+    # Best of three to ride out a noisy machine
+    elapsed = min(measure_import()[0] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SEC, f"import took {elapsed:.3f}s"
+
+
+def test_warmup_primes_resampling_filters():
+    from sai_audio.pipeline import warmup
+    from sai_audio.resample import get_polyphase_filter
+
+    get_polyphase_filter.cache_clear()
+    warmup()
+    assert get_polyphase_filter.cache_info().currsize == 2
@@ -1,17 +1,120 @@
 import base64
+
+import numpy as np
+import pytest
+
 from sai_audio.decode import decode_base64_audio
-from sai_audio.load_audio import load_audio_bytes
+from sai_audio.load_audio import (
+    DOWNMIX_BLOCK_FRAMES,
+    AudioInfo,
+    check_audio_info,
+    frames_to_read,
+    load_audio_bytes,
+)
+from sai_audio.normalize import normalize_audio
+from sai_audio.synthetic import synthetic_waveform, synthetic_wav_bytes
+
+
+@pytest.mark.parametrize("sample_rate,channels", [(8000, 1), (16000, 1), (44100, 2), (48000, 2)])
+def test_base64_wav_round_trip(sample_rate, channels):
+    wav = synthetic_wav_bytes(sample_rate, 1.5, channels)
+    audio_b64 = base64.b64encode(wav).decode()
+
+    audio_bytes, err = decode_base64_audio(audio_b64)
+    assert err is None and bytes(audio_bytes) == wav
+
+    waveform, sr, err = load_audio_bytes(audio_bytes)
+    assert err is None
+    assert sr == sample_rate
+    assert waveform.dtype == np.float32
+    expected = (int(1.5 * sample_rate),) if channels == 1 else (int(1.5 * sample_rate), channels)
+    assert waveform.shape == expected
+
+
+def test_load_matches_generated_samples():
+    wav = synthetic_wav_bytes(16000, 1.0, kind="padded")
+    waveform, _, err = load_audio_bytes(wav)
+    assert err is None
+
+    source = synthetic_waveform(16000, 1.0, kind="padded")[:, 0]
+    assert np.max(np.abs(waveform - source)) < 1e-4
+    # Silence padding survives the 16-bit round trip exactly
+    assert not waveform[:4000].any() and not waveform[-4000:].any()
+
+
+def test_synthetic_audio_is_deterministic():
+    a = synthetic_waveform(22050, 2.0, 2, "speech")
+    b = synthetic_waveform(22050, 2.0, 2, "speech")
+    assert np.array_equal(a, b)
+    assert not np.array_equal(a, synthetic_waveform(22050, 2.0, 2, "speech", seed=1))
+
+    noise = synthetic_waveform(8000, 1.0, kind="noise")
+    rms_dbfs = 20 * np.log10(np.sqrt(np.mean(noise.astype(np.float64) ** 2)))
+    assert abs(rms_dbfs + 30.0) < 0.5
+
+
+@pytest.mark.parametrize("duration_sec", [0.01, 2.5])
+def test_mono_load_downmixes_on_read(duration_sec):
+    wav = synthetic_wav_bytes(48000, duration_sec, 2, "noise")
+    stereo, _, _ = load_audio_bytes(wav)
+    mono, sr, err = load_audio_bytes(wav, mono=True)
+
+    assert err is None and sr == 48000
+    assert mono.shape == (len(stereo),) and mono.dtype == np.float32
+    # Bit-identical to averaging the fully decoded channels, across blocks
+    assert len(stereo) > DOWNMIX_BLOCK_FRAMES or duration_sec < 1
+    assert np.array_equal(mono, np.mean(stereo, axis=1))
+
+    limited, _, _ = load_audio_bytes(wav, max_duration_sec=0.005, mono=True)
+    assert np.array_equal(limited, mono[:240])
+
+
+def test_normalize_is_zero_copy_for_16k_mono():
+    waveform, sr, _ = load_audio_bytes(synthetic_wav_bytes(16000, 1.0), mono=True)
+    normalized, normalized_sr = normalize_audio(waveform, sr)
+    assert normalized is waveform and normalized_sr == 16000
+
+
+def test_normalize_downmixes_frames_by_channels():
+    # Fewer frames than channels used to be averaged along the wrong axis
+    short = np.array([[0.2, 0.4]], dtype=np.float32)
+    normalized, _ = normalize_audio(short, 16000)
+    assert normalized.shape == (1,) and np.isclose(normalized[0], 0.3)
+
+
+def test_any_channel_count_and_low_rates_are_accepted():
+    wav = synthetic_wav_bytes(16000, 1.0, 6, "noise")
+    surround, _, err = load_audio_bytes(wav)
+    assert err is None and surround.shape == (16000, 6)
+
+    mono, _, err = load_audio_bytes(wav, mono=True)
+    assert err is None
+    np.testing.assert_allclose(mono, surround.mean(axis=1), atol=1e-6)
+
+    narrowband, sr, err = load_audio_bytes(synthetic_wav_bytes(4000, 1.0))
+    assert err is None and sr == 4000
+
+
+def test_zero_channel_header_is_rejected():
+    assert check_audio_info(AudioInfo(16000, 16000, 0)) == "Invalid channel count"
+
+    # libsndfile refuses a WAV whose fmt chunk declares 0 channels
+    wav = bytearray(synthetic_wav_bytes(16000, 1.0))
+    fmt = wav.index(b"fmt ")
+    wav[fmt + 10:fmt + 12] = (0).to_bytes(2, "little")
+    waveform, _, err = load_audio_bytes(bytes(wav))
+    assert waveform is None
+    assert err == "Unsupported or corrupted audio format"
 
-with open("sample.wav", "rb") as f:
-    audio_b64 = base64.b64encode(f.read()).decode()
 
-audio_bytes, err = decode_base64_audio(audio_b64)
-if err is not None or audio_bytes is None:
-    raise RuntimeError(f"Decode failed: {err}")
+def test_unknown_length_reads_up_to_the_limit():
+    assert frames_to_read(AudioInfo(48000, 16000, 1), 2.0) == 32000
+    assert frames_to_read(AudioInfo(48000, 16000, 1), None) == 48000
+    assert frames_to_read(AudioInfo(0, 16000, 1), 2.0) == 32000
+    assert frames_to_read(AudioInfo(0, 16000, 1), None) is None
 
-waveform, sr, err = load_audio_bytes(audio_bytes)
-if err is not None or waveform is None or sr is None:
-    raise RuntimeError(f"Load failed: {err}")
 
-print("Waveform shape:", waveform.shape)
-print("Sample rate:", sr)
+def test_load_rejects_garbage():
+    waveform, sr, err = load_audio_bytes(b"\x00" * 4096)
+    assert waveform is None and sr is None
+    assert err == "Unsupported or corrupted audio format"
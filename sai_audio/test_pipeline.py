@@ -0,0 +1,160 @@
+import base64
+import io
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+from sai_audio.pipeline import (
+    process_audio_base64,
+    process_audio_bytes,
+    process_audio_file,
+)
+
+
+def make_wav(duration_sec=3.0, sample_rate=16000, channels=1):
+    t = np.arange(int(duration_sec * sample_rate)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t).astype(np.float32)
+    if channels > 1:
+        tone = np.stack([tone] * channels, axis=1)
+    buf = io.BytesIO()
+    sf.write(buf, tone, sample_rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def test_binary_entry_points_match_base64_path():
+    wav = make_wav(channels=2, sample_rate=48000)
+    expected = process_audio_base64(base64.b64encode(wav).decode())
+    assert expected["is_valid"]
+
+    with tempfile.SpooledTemporaryFile() as spooled:
+        spooled.write(wav)
+        spooled.seek(0)
+        from_file = process_audio_file(spooled)
+
+    for result in (
+        process_audio_bytes(wav),
+        process_audio_bytes(bytearray(wav)),
+        process_audio_bytes(memoryview(wav)),
+        from_file,
+    ):
+        assert result.keys() == expected.keys()
+        assert result["sample_rate"] == expected["sample_rate"]
+        assert result["duration_sec"] == expected["duration_sec"]
+        np.testing.assert_array_equal(result["waveform"], expected["waveform"])
+
+
+def test_binary_entry_points_reject_bad_input():
+    result = process_audio_bytes(b"\x00" * 16)
+    assert result == {
+        "is_valid": False,
+        "error": "Audio data too small to be valid",
+        "warnings": [],
+        "timings": {},
+    }
+
+    result = process_audio_file(io.BytesIO(b"\x00" * 4096))
+    assert not result["is_valid"]
+    assert result["error"] == "Unsupported or corrupted audio format"
+
+
+def test_results_report_stage_timings():
+    wav = make_wav(sample_rate=48000)
+
+    result = process_audio_base64(base64.b64encode(wav).decode())
+    assert list(result["timings"]) == ["decode", "load", "normalize", "trim"]
+    assert all(ms >= 0.0 for ms in result["timings"].values())
+
+    result = process_audio_bytes(make_wav(duration_sec=0.5))
+    assert not result["is_valid"]
+    assert list(result["timings"]) == ["load", "normalize", "trim"]
+
+
+def test_probe_reads_header_only():
+    from sai_audio.load_audio import probe_audio_bytes, probe_audio_file
+
+    wav = make_wav(duration_sec=4.0, sample_rate=44100, channels=2)
+    info, err = probe_audio_bytes(wav)
+    assert err is None
+    assert (info.frames, info.samplerate, info.channels) == (4 * 44100, 44100, 2)
+
+    f = io.BytesIO(wav)
+    f.seek(0)
+    info, err = probe_audio_file(f)
+    assert err is None and f.tell() == 0
+
+    # Any channel count is accepted and downmixed
+    info, err = probe_audio_bytes(make_wav(channels=4))
+    assert err is None and info.channels == 4
+
+
+def test_header_probe_reports_declared_length_from_a_prefix():
+    from sai_audio.load_audio import HEADER_PROBE_BYTES, probe_audio_header
+
+    wav = make_wav(duration_sec=60.0, sample_rate=48000)
+    info, err = probe_audio_header(wav[:HEADER_PROBE_BYTES])
+    assert err is None
+    assert info.duration_sec == 60.0
+
+    buf = io.BytesIO()
+    sf.write(buf, np.zeros(16000 * 30, dtype=np.float32), 16000, format="FLAC")
+    info, err = probe_audio_header(buf.getvalue()[:4096])
+    assert err is None and info.duration_sec == 30.0
+
+    # Streaming WAV writers leave the data size unset: frames in the prefix
+    streamed = bytearray(wav)
+    data_at = streamed.index(b"data")
+    streamed[data_at + 4:data_at + 8] = b"\xff\xff\xff\xff"
+    info, err = probe_audio_header(bytes(streamed[:HEADER_PROBE_BYTES]))
+    assert err is None and info.duration_sec < 1.0
+
+    info, err = probe_audio_header(b"<html>" + b"\x00" * 4096)
+    assert info is None
+    assert err == "Unsupported or corrupted audio format"
+
+
+def test_long_input_decodes_only_the_needed_prefix():
+    from sai_audio.load_audio import DEFAULT_READ_LIMIT_SEC, load_audio_bytes
+
+    wav = make_wav(duration_sec=60.0)
+    waveform, sample_rate, err = load_audio_bytes(wav)
+    assert err is None
+    assert len(waveform) == int(DEFAULT_READ_LIMIT_SEC * sample_rate)
+
+    result = process_audio_bytes(wav)
+    assert result["is_valid"]
+    assert result["duration_sec"] == 10.0
+    assert "audio_trimmed_to_max_duration" in result["warnings"]
+
+
+def test_batch_buckets_valid_clips_and_isolates_errors():
+    from sai_audio.pipeline import process_audio_batch
+
+    inputs = [
+        make_wav(duration_sec=3.0, sample_rate=44100),
+        b"\x00" * 16,
+        base64.b64encode(make_wav(duration_sec=1.5)).decode(),
+        "not base64!",
+        io.BytesIO(make_wav(duration_sec=3.5, channels=2)),
+    ]
+    result = process_audio_batch(inputs)
+    items = result["items"]
+
+    assert [item["is_valid"] for item in items] == [True, False, True, False, True]
+    assert items[1]["error"] == "Audio data too small to be valid"
+    assert items[3]["error"] == "Invalid base64 encoding"
+
+    shapes = {tuple(batch.indices): batch.waveforms.shape for batch in result["buckets"]}
+    assert shapes == {(2,): (1, 2 * 16000), (0, 4): (2, 4 * 16000)}
+
+    for batch in result["buckets"]:
+        assert batch.waveforms.dtype == np.float32
+        assert batch.waveforms.flags.c_contiguous
+        assert batch.mask.sum(axis=1).tolist() == batch.lengths.tolist()
+        for row, index in enumerate(batch.indices):
+            assert len(items[index]["waveform"]) == batch.lengths[row]
+            assert np.shares_memory(items[index]["waveform"], batch.waveforms)
+            assert not batch.waveforms[row, batch.lengths[row]:].any()
+
+    single = process_audio_bytes(inputs[0])
+    np.testing.assert_array_equal(items[0]["waveform"], single["waveform"])
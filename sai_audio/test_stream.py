@@ -0,0 +1,78 @@
+import numpy as np
+
+from sai_audio.pipeline import process_audio_bytes
+from sai_audio.resample import StreamingResampler, resample
+from sai_audio.stream import open_audio_stream
+from sai_audio.test_pipeline import make_wav
+
+
+def chunked(data, rng, max_size):
+    i = 0
+    while i < len(data):
+        n = int(rng.integers(1, max_size))
+        yield data[i:i + n]
+        i += n
+
+
+def test_streaming_resampler_matches_batch():
+    rng = np.random.default_rng(3)
+    for sample_rate in (48000, 44100, 8000, 16000):
+        x = (0.1 * rng.standard_normal(2 * sample_rate)).astype(np.float32)
+        for quality in ("fast", "balanced"):
+            resampler = StreamingResampler(sample_rate, 16000, quality)
+            parts = [resampler.process(chunk) for chunk in chunked(x, rng, 4000)]
+            parts.append(resampler.flush())
+
+            np.testing.assert_array_equal(
+                np.concatenate(parts), resample(x, sample_rate, 16000, quality)
+            )
+
+
+def test_stream_matches_file_pipeline():
+    rng = np.random.default_rng(5)
+    for sample_rate, channels in ((48000, 2), (44100, 1), (16000, 1)):
+        wav = make_wav(duration_sec=3.0, sample_rate=sample_rate, channels=channels)
+        expected = process_audio_bytes(wav)
+
+        stream, err = open_audio_stream(sample_rate, channels, "s16")
+        assert err is None
+
+        # 44-byte canonical WAV header, then interleaved PCM_16; odd chunk
+        # sizes split frames across pushes
+        for chunk in chunked(wav[44:], rng, 5001):
+            assert stream.push(chunk) is None
+        stream.finish()
+
+        result = stream.result()
+        assert result["is_valid"]
+        assert expected.keys() <= result.keys()
+        assert result["duration_sec"] == expected["duration_sec"]
+        assert result["warnings"] == expected["warnings"]
+        np.testing.assert_allclose(result["waveform"], expected["waveform"], atol=1e-6)
+
+
+def test_stream_reports_silence_and_bad_parameters():
+    assert open_audio_stream(16000, 3) == (None, "Unsupported multi-channel audio")
+    assert open_audio_stream(16000, 0) == (None, "Invalid channel count")
+    assert open_audio_stream(4000) == (None, "Unsupported sample rate")
+    assert open_audio_stream(16000, 1, "mp3") == (None, "Unsupported sample format")
+
+    stream, _ = open_audio_stream(16000, 1, "f32")
+    stream.push(np.zeros(16000, dtype="<f4").tobytes())
+    assert stream.result() == {
+        "is_valid": False,
+        "error": "Invalid audio after preprocessing",
+        "warnings": ["silence_only_audio"],
+        "timings": {},
+    }
+
+    tone = 0.3 * np.sin(2 * np.pi * 220 * np.arange(32000) / 16000)
+    stream.push(tone.astype("<f4").tobytes())
+    stream.push(np.zeros(8000, dtype="<f4").tobytes())
+
+    result = stream.result()
+    assert result["is_valid"]
+    assert abs(result["trailing_silence_sec"] - 0.5) < 0.1
+
+    stream.finish()
+    assert stream.push(b"\x00\x00\x00\x00") == "Audio stream already finished"
@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+from sai_audio.validate import TRIM_HOP_LENGTH, trim_and_validate, trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def padded_clips():
+    rng = np.random.default_rng(0)
+    t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = 0.4 * np.sin(2 * np.pi * 180 * t)
+    bursts = tone * (np.sin(2 * np.pi * 1.5 * t) > 0)
+
+    yield np.concatenate([np.zeros(8000), tone, np.zeros(12345)])
+    yield np.concatenate([1e-4 * rng.standard_normal(20000), bursts, 1e-4 * rng.standard_normal(777)])
+    yield 0.1 * rng.standard_normal(5 * SAMPLE_RATE)
+    yield np.concatenate([np.zeros(300), [0.9], np.zeros(40000)])
+    yield tone[:1000]
+
+
+def test_trim_matches_librosa_within_one_frame():
+    import librosa
+
+    for clip in padded_clips():
+        clip = clip.astype(np.float32)
+        expected, (ref_start, ref_end) = librosa.effects.trim(clip, top_db=25)
+        trimmed, (start, end) = trim_silence(clip)
+
+        assert abs(start - ref_start) <= TRIM_HOP_LENGTH
+        assert abs(end - ref_end) <= TRIM_HOP_LENGTH
+        assert np.shares_memory(trimmed, clip)
+
+
+def test_trim_silence_only():
+    trimmed, bounds = trim_silence(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert trimmed.size == 0 and bounds == (0, 0)
+
+    _, _, is_valid, warnings = trim_and_validate(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    assert not is_valid
+    assert warnings == ["silence_only_audio"]
+
+
+if __name__ == "__main__":
+    import librosa
+
+    rng = np.random.default_rng(1)
+    for seconds in (2, 10, 60):
+        speech = 0.3 * rng.standard_normal(seconds * SAMPLE_RATE)
+        clip = np.concatenate([np.zeros(SAMPLE_RATE), speech, np.zeros(SAMPLE_RATE)]).astype(np.float32)
+        librosa.effects.trim(clip, top_db=25)
+
+        timings = {}
+        for name, fn in (
+            ("librosa", lambda: librosa.effects.trim(clip, top_db=25)),
+            ("trim_silence", lambda: trim_silence(clip)),
+        ):
+            start = time.perf_counter()
+            for _ in range(20):
+                fn()
+            timings[name] = (time.perf_counter() - start) / 20 * 1000
+        print(f"{seconds + 2:>3} s clip: " + ", ".join(
+            f"{name} {ms:.2f} ms" for name, ms in timings.items()
+        ))
@@ -0,0 +1,48 @@
+import io
+
+import numpy as np
+import soundfile as sf
+
+from sai_audio.windows import WINDOW_HOP_SEC, WINDOW_SEC, open_audio_windows
+
+
+def make_long_wav(sections, sample_rate=44100, channels=2):
+    """sections: list of (seconds, is_tone)"""
+    buf = io.BytesIO()
+    with sf.SoundFile(buf, "w", sample_rate, channels, format="WAV", subtype="PCM_16") as f:
+        for seconds, is_tone in sections:
+            t = np.arange(int(seconds * sample_rate)) / sample_rate
+            x = 0.3 * np.sin(2 * np.pi * 220 * t) if is_tone else np.zeros_like(t)
+            f.write(np.stack([x] * channels, axis=1))
+    buf.seek(0)
+    return buf
+
+
+def test_windows_cover_recording_and_mark_silence():
+    audio = make_long_wav([(10, True), (10, False), (11, True)])
+    reader, err = open_audio_windows(audio)
+    assert err is None
+
+    windows = [(w.start_sec, w.end_sec, w.is_valid) for w in reader]
+    starts = [start for start, _, _ in windows]
+    assert starts == [i * WINDOW_HOP_SEC for i in range(len(windows))]
+    assert windows[0][1] == WINDOW_SEC
+    assert abs(windows[-1][1] - 31.0) < 0.01
+
+    valid = {start: is_valid for start, _, is_valid in windows}
+    assert valid[0.0] and valid[26.0]
+    assert not valid[12.0] and not valid[14.0]
+
+
+def test_short_recording_yields_one_partial_window():
+    reader, err = open_audio_windows(make_long_wav([(1.5, True)], channels=1))
+    windows = list(reader)
+    assert len(windows) == 1
+    assert abs(windows[0].end_sec - 1.5) < 0.01
+    assert windows[0].is_valid
+
+
+def test_max_duration_truncates():
+    reader, _ = open_audio_windows(make_long_wav([(12, True)]), max_duration_sec=6)
+    assert reader.truncated
+    assert max(w.end_sec for w in reader) <= 6.0
@@ -1,11 +1,100 @@
 import numpy as np
-import librosa
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 
 MIN_DURATION_SEC = 1.0
 WARN_DURATION_SEC = 2.0
 MAX_DURATION_SEC = 10.0
 
+# Silence trimming, with librosa.effects.trim's framing defaults
+TRIM_TOP_DB = 25
+TRIM_FRAME_LENGTH = 2048
+TRIM_HOP_LENGTH = 512
+_AMIN_POWER = 1e-10
+
+
+def trim_silence(
+    waveform: np.ndarray,
+    top_db: float = TRIM_TOP_DB,
+    frame_length: int = TRIM_FRAME_LENGTH,
+    hop_length: int = TRIM_HOP_LENGTH
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Trim leading/trailing frames quieter than `top_db` below the loudest
+    frame. Drop-in for librosa.effects.trim on mono input (centered,
+    zero-padded frames), matching its boundaries to within one hop.
+
+    The signal is viewed as a (n_blocks, hop_length) strided array, so
+    one pass yields per-hop energies; each frame's energy is then a sum
+    of frame_length // hop_length neighbouring blocks.
+
+    Returns:
+        trimmed waveform (a view of the input), (start, end) sample indices
+    """
+    if frame_length % hop_length or (frame_length // 2) % hop_length:
+        raise ValueError("frame_length and frame_length // 2 must be multiples of hop_length")
+
+    n = len(waveform)
+    if n == 0:
+        return waveform[:0], (0, 0)
+
+    start, end = silence_bounds(
+        hop_energies(waveform, hop_length), n, top_db, frame_length, hop_length
+    )
+    return waveform[start:end], (start, end)
+
+
+def hop_energies(waveform: np.ndarray, hop_length: int = TRIM_HOP_LENGTH) -> np.ndarray:
+    """
+    Sum of squares of every full hop of `waveform`, plus one entry for
+    the (possibly empty) partial hop at the end.
+    """
+    n_full = len(waveform) // hop_length
+    energy = np.empty(n_full + 1, dtype=np.float64)
+
+    full = waveform[:n_full * hop_length].reshape(n_full, hop_length)
+    energy[:n_full] = np.einsum("ij,ij->i", full, full)
+    tail = waveform[n_full * hop_length:]
+    energy[n_full] = np.dot(tail, tail)
+    return energy
+
+
+def silence_bounds(
+    energies: np.ndarray,
+    n: int,
+    top_db: float = TRIM_TOP_DB,
+    frame_length: int = TRIM_FRAME_LENGTH,
+    hop_length: int = TRIM_HOP_LENGTH
+) -> Tuple[int, int]:
+    """
+    (start, end) sample indices of the non-silent part of an n-sample
+    signal, from its hop_energies(). Streams keep the per-hop energies up
+    to date as audio arrives and call this instead of trim_silence.
+    """
+    pad = frame_length // 2
+    n_frames = 1 + (n + 2 * pad - frame_length) // hop_length
+    blocks_per_frame = frame_length // hop_length
+    pad_blocks = pad // hop_length
+
+    # Per-hop energies of the zero-padded signal
+    block_energy = np.zeros(2 * pad_blocks + len(energies), dtype=np.float64)
+    block_energy[pad_blocks:pad_blocks + len(energies)] = energies
+
+    csum = np.concatenate(([0.0], np.cumsum(block_energy)))
+    energy = csum[blocks_per_frame:blocks_per_frame + n_frames] - csum[:n_frames]
+    energy /= frame_length
+
+    threshold = max(_AMIN_POWER, energy.max()) * 10.0 ** (-top_db / 10.0)
+    loud = energy > threshold
+    if not loud.any():
+        return 0, 0
+
+    # argmax on a boolean array stops at the first True from each end
+    first = int(np.argmax(loud))
+    last = n_frames - 1 - int(np.argmax(loud[::-1]))
+
+    return first * hop_length, min(n, (last + 1) * hop_length)
+
+
 def trim_and_validate(
     waveform: np.ndarray,
     sample_rate: int
@@ -22,17 +111,25 @@ def trim_and_validate(
         warnings
     """
 
-    warnings: List[str] = []
-
     # 1. Trim silence (conservative)
-    trimmed, _ = librosa.effects.trim(
-        waveform,
-        top_db=25
-    )
+    trimmed, _ = trim_silence(waveform)
 
     if trimmed.size == 0:
         return waveform, 0.0, False, ["silence_only_audio"]
 
+    return validate_duration(trimmed, sample_rate)
+
+
+def validate_duration(
+    trimmed: np.ndarray,
+    sample_rate: int
+) -> Tuple[np.ndarray, float, bool, List[str]]:
+    """
+    Duration rules for already-trimmed audio; same return values as
+    trim_and_validate.
+    """
+
+    warnings: List[str] = []
     duration_sec = len(trimmed) / sample_rate
 
     # 2. Duration checks
@@ -0,0 +1,139 @@
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from sai_audio.load_audio import AudioInfo, frames_to_read, probe_audio_file
+from sai_audio.normalize import TARGET_SAMPLE_RATE
+from sai_audio.resample import DEFAULT_RESAMPLE_QUALITY, StreamingResampler
+from sai_audio.validate import MIN_DURATION_SEC, hop_energies, silence_bounds
+
+# Overlapping analysis windows for recordings longer than MAX_DURATION_SEC
+WINDOW_SEC = 4.0
+WINDOW_HOP_SEC = 2.0
+
+# Seconds decoded per soundfile block; with the window buffer this is
+# all the audio held in memory at any time.
+READ_BLOCK_SEC = 1.0
+
+LONG_AUDIO_MAX_SEC = 30 * 60.0
+
+# Windows whose speech part is quieter than this carry no usable signal
+SILENT_WINDOW_DBFS = -50.0
+
+
+class AudioWindow(NamedTuple):
+    start_sec: float
+    end_sec: float
+    waveform: np.ndarray   # 16 kHz mono speech part; reused after the next window
+    speech_sec: float
+
+    @property
+    def is_valid(self) -> bool:
+        return self.speech_sec >= MIN_DURATION_SEC
+
+
+class AudioWindowReader:
+    """
+    Iterate over overlapping 16 kHz mono windows of a long recording.
+
+    The file is decoded block by block (soundfile.blocks), downmixed and
+    resampled with carried filter state, so memory stays at one block
+    plus one window whatever the file length. Each window is trimmed to
+    its speech part like the clip pipeline does.
+    """
+
+    def __init__(
+        self,
+        audio_file: BinaryIO,
+        info: AudioInfo,
+        window_sec: float = WINDOW_SEC,
+        hop_sec: float = WINDOW_HOP_SEC,
+        max_duration_sec: float = LONG_AUDIO_MAX_SEC,
+        quality: str = DEFAULT_RESAMPLE_QUALITY
+    ):
+        if not 0 < hop_sec <= window_sec:
+            raise ValueError("Window hop must be positive and no longer than the window")
+
+        self.info = info
+        self.truncated = info.duration_sec > max_duration_sec
+        self._file = audio_file
+        self._file_start = audio_file.tell()
+        self._frames = frames_to_read(info, max_duration_sec)
+        self._window = int(window_sec * TARGET_SAMPLE_RATE)
+        self._hop = int(hop_sec * TARGET_SAMPLE_RATE)
+        self._quality = quality
+
+    def __iter__(self) -> Iterator[AudioWindow]:
+        resampler = StreamingResampler(self.info.samplerate, TARGET_SAMPLE_RATE, self._quality)
+        buffer = np.zeros(self._window, dtype=np.float32)
+        fill = 0
+        emitted = 0
+        blocksize = max(1, int(READ_BLOCK_SEC * self.info.samplerate))
+
+        self._file.seek(self._file_start)
+        with sf.SoundFile(self._file) as f:
+            blocks = f.blocks(
+                blocksize=blocksize, frames=self._frames, dtype="float32", always_2d=True
+            )
+            for block in blocks:
+                mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1)
+                chunk = resampler.process(mono)
+                while len(chunk):
+                    n = min(len(chunk), self._window - fill)
+                    buffer[fill:fill + n] = chunk[:n]
+                    fill += n
+                    chunk = chunk[n:]
+
+                    if fill == self._window:
+                        yield self._make_window(buffer, emitted, fill)
+                        emitted += 1
+                        overlap = self._window - self._hop
+                        buffer[:overlap] = buffer[self._hop:]
+                        fill = overlap
+
+        # Resampler tail, then one last partial window for audio no full
+        # window has covered yet
+        tail = resampler.flush()
+        n = min(len(tail), self._window - fill)
+        buffer[fill:fill + n] = tail[:n]
+        fill += n
+
+        if fill > self._window - self._hop or (emitted == 0 and fill > 0):
+            yield self._make_window(buffer, emitted, fill)
+
+    def _make_window(self, buffer: np.ndarray, index: int, length: int) -> AudioWindow:
+        start_sec = index * self._hop / TARGET_SAMPLE_RATE
+        waveform = buffer[:length]
+
+        start, end = silence_bounds(hop_energies(waveform), length)
+        speech = waveform[start:end]
+        if speech.size and 10 * np.log10(np.mean(speech ** 2) + 1e-20) < SILENT_WINDOW_DBFS:
+            speech = speech[:0]
+
+        return AudioWindow(
+            start_sec=start_sec,
+            end_sec=start_sec + length / TARGET_SAMPLE_RATE,
+            waveform=speech,
+            speech_sec=len(speech) / TARGET_SAMPLE_RATE
+        )
+
+
+def open_audio_windows(
+    audio_file: BinaryIO,
+    window_sec: float = WINDOW_SEC,
+    hop_sec: float = WINDOW_HOP_SEC,
+    max_duration_sec: float = LONG_AUDIO_MAX_SEC
+) -> Tuple[Optional[AudioWindowReader], Optional[str]]:
+    """
+    Check the header of a seekable binary file and return a window reader
+    over it. Only the first `max_duration_sec` seconds are read.
+
+    Returns:
+        (reader, error_message)
+    """
+    info, err = probe_audio_file(audio_file)
+    if err is not None:
+        return None, err
+
+    return AudioWindowReader(audio_file, info, window_sec, hop_sec, max_duration_sec), None